@@ -0,0 +1,125 @@
+"""
+Async oxu endpoint-lərinin (core.async_views) sync DRF view-ları ilə müqayisəsi.
+
+Eyni data eyni ASGI tətbiqinə müxtəlif paralellik səviyyələrində göndərilir: /sync/... yolları
+köhnə DRF viewset-lərinə, /api/... yolları async view-lara gedir. Sync view-lar ASGI altında
+bir ümumi thread-də növbə ilə icra olunur, async view-lar isə gözləmə vaxtını paylaşır.
+--latency hər SQL-ə süni gecikmə əlavə edir (şəbəkə üzərindən Postgres-i təqlid edir):
+
+    cd backend
+    python benchmarks/async_views.py --scale 0.3 --latency 2 --concurrency 1,8,32
+"""
+import argparse
+import asyncio
+import time
+
+from common import benchmark_database, seed_dataset
+
+from asgiref.sync import sync_to_async
+from channels.testing import HttpCommunicator
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+from django.urls import include, path
+from rest_framework_simplejwt.tokens import AccessToken
+from chat.views import ChatGroupViewSet
+from notifications.views import NotificationViewSet
+from users.views.tracking import LiveMapViewSet
+from core.instrumentation import percentile
+
+urlpatterns = [
+    path('sync/notifications/unread_count/', NotificationViewSet.as_view({'get': 'unread_count'})),
+    path('sync/chat/groups/', ChatGroupViewSet.as_view({'get': 'list'})),
+    path('sync/live-map/', LiveMapViewSet.as_view({'get': 'list'})),
+    path('', include('core.urls')),
+]
+
+ENDPOINTS = [
+    ('unread-count', '/sync/notifications/unread_count/', '/api/notifications/unread_count/'),
+    ('chat-groups', '/sync/chat/groups/', '/api/chat/groups/'),
+    ('live-map', '/sync/live-map/', '/api/live-map/'),
+    ('dashboard-stats', None, '/api/dashboard/stats/'),
+]
+
+
+class Latency:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        connection_created.connect(self.install, weak=False)
+
+    def install(self, sender, connection, **kwargs):
+        # Eyni thread-in bağlantı obyekti yenidən qoşulanda təkrar əlavə olunmasın
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def __call__(self, execute, sql, params, many, context):
+        time.sleep(self.seconds)
+        return execute(sql, params, many, context)
+
+
+async def get(application, path, token):
+    headers = [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())]
+    communicator = HttpCommunicator(application, 'GET', path, headers=headers)
+    response = await communicator.get_response(timeout=60)
+    await communicator.wait()
+    if response['status'] != 200:
+        raise AssertionError(f'{path}: {response["status"]} {response["body"][:200]!r}')
+
+
+async def measure(application, path, token, concurrency, requests):
+    remaining = iter(range(requests))
+    timings = []
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            await get(application, path, token)
+            timings.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return len(timings) / elapsed, percentile(timings, 0.50), percentile(timings, 0.99)
+
+
+async def run(application, token, levels, requests):
+    try:
+        for name, sync_path, async_path in ENDPOINTS:
+            for concurrency in levels:
+                row = f'{name:16} {concurrency:5}'
+                for path in (sync_path, async_path):
+                    if path is None:
+                        row += f' {"-":>9} {"-":>9} {"-":>9}'
+                        continue
+                    await get(application, path, token)  # warmup
+                    throughput, p50, p99 = await measure(application, path, token, concurrency, requests)
+                    row += f' {throughput:9.1f} {p50:9.2f} {p99:9.2f}'
+                print(row)
+    finally:
+        await sync_to_async(connections.close_all)()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=0.3, help='data həcmi əmsalı')
+    parser.add_argument('--requests', type=int, default=64, help='endpoint və paralellik başına sorğu')
+    parser.add_argument('--concurrency', default='1,8,32', help='vergüllə ayrılmış paralellik səviyyələri')
+    parser.add_argument('--latency', type=float, default=0.0, help='SQL başına süni gecikmə, ms')
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    with benchmark_database(), override_settings(ROOT_URLCONF=__name__):
+        from core.asgi import application
+
+        data = seed_dataset(args.scale)
+        token = str(AccessToken.for_user(data['admin']))
+        if args.latency:
+            Latency(args.latency / 1000)
+        print(f'db: {connection.vendor}, latency: {args.latency} ms/query\n')
+        print(f'{"":22} {"sync":^29} {"async":^29}')
+        print(f'{"endpoint":16} {"conc":>5}' + f' {"req/s":>9} {"p50 ms":>9} {"p99 ms":>9}' * 2)
+        asyncio.run(run(application, token, levels, args.requests))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark skriptləri üçün ümumi hissə: Django-nun qurulması, müvəqqəti test bazası və test datası.
+
+Skriptlər backend qovluğundan işə salınır (python benchmarks/<ad>.py); baza parametrləri
+DJANGO_SETTINGS_MODULE-dan götürülür, test bazası yaradılır və sonda silinir.
+"""
+import os
+import sys
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment
+
+
+@contextmanager
+def benchmark_database():
+    """Müvəqqəti test bazası + yaddaşdaxili channel layer və keş."""
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        with override_settings(
+            CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+            CACHES={
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'responses': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'responses'},
+            },
+        ):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed(task_count):
+    """Tapşırıqlar (servis dəyərləri ilə), məhsullar, bildirişlər və xəritə üçün mövqelər yaradır."""
+    from users.models import Region, Group, User, UserLocation
+    from tasks.models import Customer, Service, Column, Task, TaskService, TaskServiceValue
+    from warehouse.models import Product, Warehouse
+    from notifications.models import Notification
+
+    region = Region.objects.create(name='Bakı')
+    group = Group.objects.create(name='Qrup 1', region=region)
+    user = User.objects.create_user('benchmark', password='benchmark', group=group, is_staff=True)
+    Warehouse.objects.create(name='Mərkəzi anbar', region=region, coordinates={'lat': 40.4, 'lng': 49.8})
+    service = Service.objects.create(name='İnternet')
+    columns = [
+        Column.objects.create(service=service, name=f'Sahə {i}', key=f'field_{i}', field_type='integer', order=i)
+        for i in range(5)
+    ]
+    for i in range(task_count):
+        customer = Customer.objects.create(
+            full_name=f'Müştəri {i}', region=region, phone_number=f'+99450{i:07d}',
+            address=f'Ünvan {i}', address_coordinates={'lat': 40.4, 'lng': 49.8},
+        )
+        task = Task.objects.create(
+            title=f'Tapşırıq {i}', customer=customer, group=group, assigned_to=user,
+            status=Task.Status.IN_PROGRESS if i % 3 == 0 else Task.Status.TODO,
+        )
+        task_service = TaskService.objects.create(task=task, service=service)
+        TaskServiceValue.objects.bulk_create(
+            TaskServiceValue(task_service=task_service, column=column, number_value=i) for column in columns
+        )
+    Product.objects.bulk_create(Product(name=f'Məhsul {i}', price=i) for i in range(task_count))
+    Notification.objects.bulk_create(Notification(title=f'Bildiriş {i}') for i in range(50))
+    for i in range(20):
+        member = User.objects.create_user(f'field-{i}', password='benchmark', group=group)
+        UserLocation.objects.create(user=member, latitude=40.4, longitude=49.8, is_online=True)
+    return user
+
+
+def seed_dataset(scale=1.0):
+    """
+    Yük testi üçün real ölçülü data: yüzlərlə istifadəçi, minlərlə müştəri/tapşırıq/məhsul/hərəkət
+    və böyük chat qrupu. Hamısı bulk_create ilə yazılır (siqnallar işləmir, keş boşdur).
+    Yaradılan obyektlərin id-ləri lüğət kimi qaytarılır.
+    """
+    from django.contrib.auth.hashers import make_password
+    from users.models import Region, Group, User, UserLocation
+    from tasks.models import Customer, Task, TaskType
+    from warehouse.models import Product, Warehouse, WarehouseInventory, StockMovement
+    from notifications.models import Notification
+    from chat.models import ChatGroup, GroupMembership, Message
+
+    def scaled(count):
+        return max(1, int(count * scale))
+
+    password = make_password('benchmark')
+    regions = Region.objects.bulk_create(Region(name=f'Region {i}') for i in range(5))
+    groups = Group.objects.bulk_create(Group(name=f'Qrup {i}', region=regions[i % 5]) for i in range(10))
+    admin = User.objects.create_user('benchmark', password='benchmark', group=groups[0], is_staff=True, is_superuser=True)
+    users = User.objects.bulk_create(
+        User(username=f'user-{i}', password=password, first_name=f'Ad {i}', last_name=f'Soyad {i}', group=groups[i % 10])
+        for i in range(scaled(300))
+    )
+    UserLocation.objects.bulk_create(
+        UserLocation(user=user, latitude=40.4 + i / 1000, longitude=49.8, is_online=i % 2 == 0)
+        for i, user in enumerate(users)
+    )
+
+    task_types = TaskType.objects.bulk_create(TaskType(name=f'Növ {i}', color=f'#00000{i}') for i in range(5))
+    customers = Customer.objects.bulk_create(
+        Customer(
+            full_name=f'Müştəri {i}', region=regions[i % 5], phone_number=f'+99450{i:07d}',
+            address=f'Ünvan {i}', address_coordinates={'lat': 40.4, 'lng': 49.8},
+        )
+        for i in range(scaled(3000))
+    )
+    statuses = Task.Status.values
+    Task.objects.bulk_create(
+        Task(
+            title=f'Tapşırıq {i}', customer=customers[i % len(customers)], group=groups[i % 10],
+            assigned_to=users[i % len(users)], task_type=task_types[i % 5], status=statuses[i % len(statuses)],
+        )
+        for i in range(scaled(6000))
+    )
+
+    warehouses = Warehouse.objects.bulk_create(
+        Warehouse(name=f'Anbar {i}', region=regions[i], coordinates={'lat': 40.4, 'lng': 49.8}) for i in range(3)
+    )
+    products = Product.objects.bulk_create(
+        Product(name=f'Məhsul {i}', price=i, min_quantity=5, total_stock=300) for i in range(scaled(1000))
+    )
+    WarehouseInventory.objects.bulk_create(
+        WarehouseInventory(warehouse=warehouse, product=product, quantity=100)
+        for warehouse in warehouses for product in products
+    )
+    StockMovement.objects.bulk_create(
+        (
+            StockMovement(
+                warehouse=warehouses[i % 3], product=products[i % len(products)],
+                movement_type=StockMovement.Type.IN if i % 2 == 0 else StockMovement.Type.OUT,
+                quantity_old=100, quantity_new=101 if i % 2 == 0 else 99, delta=1 if i % 2 == 0 else -1, created_by=admin,
+            )
+            for i in range(scaled(20000))
+        ),
+        batch_size=2000,
+    )
+
+    Notification.objects.bulk_create(Notification(title=f'Bildiriş {i}') for i in range(scaled(500)))
+    chat_group = ChatGroup.objects.create(name='Ümumi qrup', owner=admin)
+    GroupMembership.objects.bulk_create(
+        GroupMembership(group=chat_group, user=user) for user in [admin, *users]
+    )
+    Message.objects.bulk_create(
+        (Message(group=chat_group, sender=users[i % len(users)], content=f'Mesaj {i}') for i in range(scaled(5000))),
+        batch_size=2000,
+    )
+    return {
+        'admin': admin,
+        'users': users,
+        'warehouses': [warehouse.pk for warehouse in warehouses],
+        'products': [product.pk for product in products],
+        'chat_group': chat_group.pk,
+    }
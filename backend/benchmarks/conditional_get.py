@@ -0,0 +1,64 @@
+"""
+Şərti GET-in qənaətini ölçür: eyni siyahı həm tam cavabla (200), həm də If-None-Match ilə (304)
+sorğulanır, sorğu başına vaxt və SQL sayı müqayisə olunur.
+
+Müvəqqəti test bazası yaradılır və sonda silinir:
+
+    cd backend
+    python benchmarks/conditional_get.py --tasks 200 --rounds 50
+"""
+import argparse
+import statistics
+import time
+
+from common import benchmark_database, seed
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+ENDPOINTS = [
+    '/api/tasks/tasks/',
+    '/api/tasks/customers/',
+    '/api/warehouse/products/',
+    '/api/notifications/',
+    '/api/chat/groups/',
+]
+
+
+def measure(client, path, rounds, headers=None):
+    timings = []
+    queries = 0
+    status_code = None
+    for _ in range(rounds):
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = client.get(path, **(headers or {}))
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = len(ctx.captured_queries)
+        status_code = response.status_code
+    return response, status_code, statistics.median(timings), queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        client = APIClient()
+        client.force_authenticate(seed(args.tasks))
+
+        print(f'{"endpoint":32} {"200 ms":>8} {"sql":>4} {"304 ms":>8} {"sql":>4} {"saved":>7}')
+        for path in ENDPOINTS:
+            response, _, full_ms, full_queries = measure(client, path, args.rounds)
+            headers = {'HTTP_IF_NONE_MATCH': response['ETag']}
+            _, status_code, cond_ms, cond_queries = measure(client, path, args.rounds, headers)
+            assert status_code == 304, f'{path}: expected 304, got {status_code}'
+            saved = (1 - cond_ms / full_ms) * 100 if full_ms else 0
+            print(f'{path:32} {full_ms:8.2f} {full_queries:4} {cond_ms:8.2f} {cond_queries:4} {saved:6.1f}%')
+
+
+if __name__ == '__main__':
+    main()
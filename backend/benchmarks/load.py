@@ -0,0 +1,274 @@
+"""
+REST və WebSocket əsas yollarına yük testi.
+
+Real ölçülü data (common.seed_dataset) yaradılır, sorğular core.asgi.application-a prosesin
+daxilində ASGI ilə göndərilir (JWT, middleware və consumer-lər daxil), channel layer yaddaşdaxilidir.
+Hər ssenari üçün ötürmə qabiliyyəti (op/s), p50/p99 gecikmə və əməliyyat başına SQL sayı
+çıxarılır. Nəticə baseline kimi saxlanıla və sonrakı işlə müqayisə oluna bilər:
+
+    cd backend
+    python benchmarks/load.py --save-baseline
+    python benchmarks/load.py --compare            # reqressiya varsa exit code 1
+    python benchmarks/load.py --only task-list,chat-fanout --ops 100 --concurrency 8
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+
+from common import benchmark_database, seed_dataset
+
+from asgiref.sync import sync_to_async
+from channels.testing import HttpCommunicator, WebsocketCommunicator
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from rest_framework_simplejwt.tokens import AccessToken
+from core.instrumentation import percentile
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+HOST_HEADERS = [(b'host', b'testserver'), (b'origin', b'http://testserver')]
+
+
+class QueryCounter:
+    """Bütün thread-lərin bağlantılarında icra olunan SQL sayı."""
+
+    def __init__(self):
+        self.count = 0
+        connection_created.connect(self.install, weak=False)
+
+    def install(self, sender, connection, **kwargs):
+        # Eyni thread-in bağlantı obyekti yenidən qoşulanda təkrar əlavə olunmasın
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Client:
+    def __init__(self, application, user):
+        self.application = application
+        self.token = str(AccessToken.for_user(user))
+
+    async def request(self, method, path, body=None):
+        headers = [*HOST_HEADERS, (b'authorization', f'Bearer {self.token}'.encode())]
+        if body is not None:
+            body = json.dumps(body).encode()
+            headers += [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+        communicator = HttpCommunicator(self.application, method, path, body=body or b'', headers=headers)
+        response = await communicator.get_response(timeout=30)
+        await communicator.wait()  # handler-in disconnect gözləyən task-ı da bitsin
+        if response['status'] >= 400:
+            raise AssertionError(f'{method} {path}: {response["status"]} {response["body"][:200]!r}')
+        return response
+
+    async def websocket(self, path):
+        separator = '&' if '?' in path else '?'
+        communicator = WebsocketCommunicator(
+            self.application, f'{path}{separator}token={self.token}', headers=HOST_HEADERS,
+        )
+        connected, _ = await communicator.connect(timeout=10)
+        if not connected:
+            raise AssertionError(f'{path}: websocket rejected')
+        return communicator
+
+
+def http_scenario(method, path, body=None):
+    async def setup(context):
+        client = Client(context['application'], context['data']['admin'])
+        counter = itertools.count()
+
+        async def op():
+            payload = body(context['data'], next(counter)) if callable(body) else body
+            await client.request(method, path, payload)
+        return op, None
+    return setup
+
+
+def adjust_body(data, index):
+    return {
+        'warehouse_id': data['warehouses'][index % len(data['warehouses'])],
+        'product_id': data['products'][index % len(data['products'])],
+        'quantity': 1,
+        'movement_type': 'in',
+        'reference_no': f'BENCH-{index}',
+    }
+
+
+def fanout_scenario(path, message):
+    """Bir göndərən, `listeners` dinləyici: əməliyyat hamı mesajı alanda bitir."""
+    async def setup(context):
+        users = [context['data']['admin'], *context['data']['users'][:context['listeners']]]
+        sockets = [await Client(context['application'], user).websocket(path(context['data'])) for user in users]
+        counter = itertools.count()
+
+        async def op():
+            await sockets[0].send_json_to(message(next(counter)))
+            await asyncio.gather(*(socket.receive_json_from(timeout=10) for socket in sockets))
+
+        async def teardown():
+            for socket in sockets:
+                await socket.disconnect()
+        return op, teardown
+    return setup
+
+
+SCENARIOS = {
+    'task-list': (http_scenario('GET', '/api/tasks/tasks/'), True),
+    'task-search': (http_scenario('GET', '/api/tasks/tasks/?search=M%C3%BC%C5%9Ft%C9%99ri%2012'), True),
+    'user-performance': (http_scenario('GET', '/api/performance/user-stats/'), True),
+    'dashboard-stats': (http_scenario('GET', '/api/dashboard/stats/'), True),
+    'adjust-stock': (http_scenario('POST', '/api/warehouse/movements/adjust/', adjust_body), True),
+    'chat-fanout': (fanout_scenario(
+        lambda data: f"/ws/chat/groups/{data['chat_group']}/",
+        lambda index: {'message': f'Yük testi {index}'},
+    ), False),
+    'location-ping': (fanout_scenario(
+        lambda data: '/ws/tracking/',
+        lambda index: {'type': 'location_update', 'latitude': 40.4 + index / 10000, 'longitude': 49.8},
+    ), False),
+}
+
+
+async def run_scenario(name, context, ops, concurrency, warmup):
+    setup, concurrent = SCENARIOS[name]
+    op, teardown = await setup(context)
+    for _ in range(warmup):
+        await op()
+
+    # Fanout ssenarilərində paralellik artıq dinləyicilərin sayındadır
+    workers = concurrency if concurrent else 1
+    remaining = itertools.count()
+    timings = []
+
+    async def worker():
+        while next(remaining) < ops:
+            started = time.perf_counter()
+            await op()
+            timings.append((time.perf_counter() - started) * 1000)
+
+    queries_before = context['queries'].count
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - started
+    queries = context['queries'].count - queries_before
+
+    if teardown:
+        await teardown()
+    return {
+        'ops': len(timings),
+        'throughput': round(len(timings) / elapsed, 1),
+        'p50_ms': percentile(timings, 0.50),
+        'p99_ms': percentile(timings, 0.99),
+        'queries_per_op': round(queries / len(timings), 1),
+    }
+
+
+async def run(names, context, args):
+    results = {}
+    try:
+        for name in names:
+            results[name] = await run_scenario(name, context, args.ops, args.concurrency, args.warmup)
+            print_row(name, results[name])
+    finally:
+        # Sync view-ların thread-indəki bağlantı bağlanmalıdır, əks halda test bazası silinmir
+        await sync_to_async(connections.close_all)()
+    return results
+
+
+def print_row(name, result):
+    print(
+        f"{name:18} {result['ops']:6} {result['throughput']:9.1f} {result['p50_ms']:9.2f} "
+        f"{result['p99_ms']:9.2f} {result['queries_per_op']:7.1f}"
+    )
+
+
+def compare(results, baseline, tolerance):
+    """Baseline-dan pis nəticələrin siyahısı: gecikmə/ötürmə tolerance-dan çox, SQL sayı istənilən artım."""
+    regressions = []
+    print(f'\n{"scenario":18} {"op/s":>16} {"p50 ms":>18} {"p99 ms":>18} {"sql/op":>14}')
+    for name, result in results.items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            print(f'{name:18} (baseline yoxdur)')
+            continue
+
+        def delta(key):
+            return (result[key] - base[key]) / base[key] * 100 if base[key] else 0.0
+
+        print(
+            f"{name:18} {result['throughput']:8.1f} {delta('throughput'):+6.1f}% "
+            f"{result['p50_ms']:9.2f} {delta('p50_ms'):+6.1f}% {result['p99_ms']:9.2f} {delta('p99_ms'):+6.1f}% "
+            f"{result['queries_per_op']:6.1f} ({base['queries_per_op']:.1f})"
+        )
+        if delta('throughput') < -tolerance:
+            regressions.append(f'{name}: throughput {delta("throughput"):+.1f}%')
+        for key in ('p50_ms', 'p99_ms'):
+            if delta(key) > tolerance:
+                regressions.append(f'{name}: {key} {delta(key):+.1f}%')
+        if result['queries_per_op'] > base['queries_per_op']:
+            regressions.append(f"{name}: queries/op {base['queries_per_op']} -> {result['queries_per_op']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1.0, help='data həcmi əmsalı')
+    parser.add_argument('--ops', type=int, default=50, help='ssenari başına əməliyyat')
+    parser.add_argument('--concurrency', type=int, default=4, help='HTTP ssenariləri üçün paralel klientlər')
+    parser.add_argument('--listeners', type=int, default=50, help='fanout ssenarilərində websocket sayı')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--only', help='vergüllə ayrılmış ssenarilər: ' + ','.join(SCENARIOS))
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, metavar='PATH')
+    parser.add_argument('--tolerance', type=float, default=20.0, help='icazə verilən pisləşmə, %%')
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f'naməlum ssenari: {", ".join(sorted(unknown))}')
+
+    with benchmark_database():
+        from core.asgi import application
+
+        started = time.perf_counter()
+        data = seed_dataset(args.scale)
+        print(f'seed: {time.perf_counter() - started:.1f}s, db: {connection.vendor}\n')
+
+        context = {'application': application, 'data': data, 'listeners': args.listeners, 'queries': QueryCounter()}
+        print(f'{"scenario":18} {"ops":>6} {"op/s":>9} {"p50 ms":>9} {"p99 ms":>9} {"sql/op":>7}')
+        results = asyncio.run(run(names, context, args))
+
+    meta = {
+        'db': connection.vendor,
+        'python': platform.python_version(),
+        'scale': args.scale,
+        'ops': args.ops,
+        'concurrency': args.concurrency,
+        'listeners': args.listeners,
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as fp:
+            json.dump({'meta': meta, 'scenarios': results}, fp, indent=2, ensure_ascii=False)
+        print(f'\nbaseline saxlanıldı: {args.save_baseline}')
+
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+        if baseline.get('meta', {}) != meta:
+            print(f"\nxəbərdarlıq: baseline fərqli parametrlərlə ölçülüb: {baseline.get('meta')}")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print('\nreqressiya:\n  ' + '\n  '.join(regressions))
+            sys.exit(1)
+        print('\nreqressiya yoxdur')
+
+
+if __name__ == '__main__':
+    main()
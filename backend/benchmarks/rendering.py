@@ -0,0 +1,64 @@
+"""
+JSON render və sıxılma xərcini ölçür: DRF-in JSONRenderer-i ilə FastJSONRenderer (orjson),
+eləcə də gzip/brotli sıxılmasının ölçü və CPU xərci endpoint-lər üzrə müqayisə olunur.
+
+    cd backend
+    python benchmarks/rendering.py --tasks 200 --rounds 50
+"""
+import argparse
+import time
+
+from common import benchmark_database, seed
+
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.middleware import brotli
+from core.renderers import FastJSONRenderer
+
+ENDPOINTS = [
+    '/api/tasks/tasks/?page_size=100',
+    '/api/warehouse/products/?page_size=100',
+    '/api/live-map/',
+]
+
+
+def cpu_ms(func, rounds):
+    """Bir çağırışın orta CPU vaxtı (ms)."""
+    started = time.process_time()
+    for _ in range(rounds):
+        func()
+    return (time.process_time() - started) * 1000 / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        client = APIClient()
+        client.force_authenticate(seed(args.tasks))
+
+        print(f'{"endpoint":42} {"drf ms":>7} {"orjson ms":>9} {"bytes":>8} {"gzip":>7} {"gz ms":>6} {"br":>7} {"br ms":>6}')
+        for path in ENDPOINTS:
+            data = client.get(path).data
+            drf_ms = cpu_ms(lambda: JSONRenderer().render(data), args.rounds)
+            fast_ms = cpu_ms(lambda: FastJSONRenderer().render(data), args.rounds)
+
+            body = FastJSONRenderer().render(data)
+            assert body == JSONRenderer().render(data), f'{path}: renderers disagree'
+            gzip_size = len(compress_string(body))
+            gzip_ms = cpu_ms(lambda: compress_string(body), args.rounds)
+            if brotli is not None:
+                br_size = len(brotli.compress(body, quality=5))
+                br_ms = cpu_ms(lambda: brotli.compress(body, quality=5), args.rounds)
+                br = f'{br_size:7} {br_ms:6.2f}'
+            else:
+                br = f'{"-":>7} {"-":>6}'
+            print(f'{path:42} {drf_ms:7.2f} {fast_ms:9.2f} {len(body):8} {gzip_size:7} {gzip_ms:6.2f} {br}')
+
+
+if __name__ == '__main__':
+    main()
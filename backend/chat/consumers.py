@@ -1,8 +1,9 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from core.instrumentation import InstrumentedConsumerMixin
 
-class ChatConsumer(AsyncWebsocketConsumer):
+class ChatConsumer(InstrumentedConsumerMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.group_id = self.scope['url_route']['kwargs']['group_id']
         self.room_group_name = f'chat_{self.group_id}'
@@ -83,7 +84,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
 
 
-class LocationConsumer(AsyncWebsocketConsumer):
+class LocationConsumer(InstrumentedConsumerMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.user = self.scope['user']
         if self.user.is_anonymous:
@@ -33,9 +33,11 @@ class Message(models.Model):
     sender = models.ForeignKey(User, on_delete=models.PROTECT, related_name="sent_messages")
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['created_at']
+        indexes = [models.Index(fields=['updated_at', 'id'])]
 
     def __str__(self):
         return f"{self.sender}: {self.content[:20]}"
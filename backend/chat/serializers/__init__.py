@@ -27,7 +27,8 @@ class ChatGroupListSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'owner', 'image', 'last_message', 'unread_count', 'created_at']
 
     def get_last_message(self, obj):
-        last_msg = obj.messages.last()
+        # combine_chat_groups() son mesajı əvvəlcədən yükləyir
+        last_msg = obj.last_message_obj if hasattr(obj, 'last_message_obj') else obj.messages.last()
         if last_msg:
             return {
                 'content': last_msg.content,
@@ -37,6 +38,8 @@ class ChatGroupListSerializer(serializers.ModelSerializer):
         return None
 
     def get_unread_count(self, obj):
+        if hasattr(obj, 'unread_messages'):
+            return obj.unread_messages
         user = self.context['request'].user
         # Logic: Messages in group NOT in MessageReadStatus for this user
         # This can be expensive. Optimized viewset query preference.
@@ -1,30 +1,26 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from outbox.services import publish_many
 from .models import Message, GroupMembership
 
 @receiver(post_save, sender=Message)
 def message_post_save(sender, instance, created, **kwargs):
-    if created:
-        channel_layer = get_channel_layer()
-        group = instance.group
-        sender_user = instance.sender
+    """Göndərəndən başqa qrup üzvlərinə bildiriş kanalı ilə xəbər - outbox vasitəsilə."""
+    if not created:
+        return
 
-        # Notify all members of the group except the sender
-        members = GroupMembership.objects.filter(group=group).exclude(user=sender_user)
-        
-        for membership in members:
-            user_id = membership.user.id
-            async_to_sync(channel_layer.group_send)(
-                f'user_notifications_{user_id}',
-                {
-                    'type': 'notification_message', # Reusing the handler in NotificationConsumer
-                    'chat_notification': { # Special payload for chat
-                        'group_id': group.id,
-                        'message_content': instance.content,
-                        'sender_name': sender_user.get_full_name(),
-                        'created_at': instance.created_at.isoformat(),
-                    }
-                }
-            )
+    member_ids = GroupMembership.objects.filter(group_id=instance.group_id).exclude(
+        user_id=instance.sender_id
+    ).values_list('user_id', flat=True)
+    publish_many(
+        (f'user_notifications_{user_id}' for user_id in member_ids),
+        {
+            'type': 'notification_message',  # NotificationConsumer-in handler-i
+            'chat_notification': {
+                'group_id': instance.group_id,
+                'message_content': instance.content,
+                'sender_name': instance.sender.get_full_name(),
+                'created_at': instance.created_at.isoformat(),
+            },
+        },
+    )
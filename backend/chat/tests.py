@@ -1,3 +1,47 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
+from users.models import User
+from .models import ChatGroup, GroupMembership, Message, MessageReadStatus
+from .views import chat_group_list
 
-# Create your tests here.
+
+class ChatGroupListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("owner", password="x")
+        cls.member = User.objects.create_user("member", password="x")
+        cls.outsider = User.objects.create_user("outsider", password="x")
+
+        cls.quiet = ChatGroup.objects.create(name="Quiet", owner=cls.owner)
+        cls.busy = ChatGroup.objects.create(name="Busy", owner=cls.owner)
+        ChatGroup.objects.create(name="Other", owner=cls.outsider)
+        for group in (cls.quiet, cls.busy):
+            GroupMembership.objects.create(group=group, user=cls.owner)
+        GroupMembership.objects.create(group=cls.busy, user=cls.member)
+
+        first = Message.objects.create(group=cls.busy, sender=cls.owner, content="first")
+        Message.objects.create(group=cls.busy, sender=cls.member, content="second")
+        cls.last = Message.objects.create(group=cls.busy, sender=cls.member, content="third")
+        MessageReadStatus.objects.create(message=first, user=cls.owner, read_at=first.created_at)
+
+    def test_unread_counts_and_last_message(self):
+        with self.assertNumQueries(3):
+            groups = {group.name: group for group in chat_group_list(self.owner)}
+
+        self.assertEqual(set(groups), {"Quiet", "Busy"})
+        self.assertEqual(groups["Busy"].unread_messages, 2)
+        self.assertEqual(groups["Busy"].last_message_obj, self.last)
+        self.assertEqual(groups["Quiet"].unread_messages, 0)
+        self.assertIsNone(groups["Quiet"].last_message_obj)
+
+    def test_member_sees_only_own_groups(self):
+        groups = chat_group_list(self.member)
+
+        self.assertEqual([group.name for group in groups], ["Busy"])
+        self.assertEqual(groups[0].unread_messages, 3)
+
+    def test_anonymous_request_gets_authenticate_header(self):
+        response = APIClient().get("/api/chat/groups/")
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], 'Bearer realm="api"')
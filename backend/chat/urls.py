@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ChatGroupViewSet, MessageViewSet
+from .views import ChatGroupViewSet, ChatGroupListView, MessageViewSet
 
 router = DefaultRouter()
 router.register(r'groups', ChatGroupViewSet, basename='chatgroup')
 router.register(r'messages', MessageViewSet, basename='message')
 
 urlpatterns = [
+    path('groups/', ChatGroupListView.as_view(), name='chatgroup-list-async'),
     path('', include(router.urls)),
 ]
@@ -9,11 +9,57 @@ from .serializers import (
     MessageSerializer, UserSimpleSerializer
 )
 from django.contrib.auth import get_user_model
+from core.async_views import AsyncReadView, gather_queries
+from core.conditional import ConditionalGetMixin, mark_changed
 
 User = get_user_model()
 
-class ChatGroupViewSet(viewsets.ModelViewSet):
+def _user_groups(user):
+    return ChatGroup.objects.filter(Q(memberships__user=user) | Q(owner=user)).distinct()
+
+
+def chat_group_queries(user):
+    """
+    Qrup siyahısı üçün bir-birindən asılı olmayan 3 sorğu: qruplar, oxunmamış saylar və son
+    mesajlar. Async view onları paralel (gather_queries), sync view ardıcıl icra edir.
+    """
+    group_ids = _user_groups(user).values('pk')
+
+    def groups():
+        return list(_user_groups(user).select_related('owner').order_by('-created_at'))
+
+    def unread_counts():
+        return dict(
+            Message.objects.filter(group__in=group_ids).exclude(read_statuses__user=user)
+            .order_by().values('group').annotate(count=Count('id')).values_list('group', 'count')
+        )
+
+    def last_messages():
+        latest = Message.objects.filter(group=OuterRef('group')).order_by('-created_at', '-id').values('id')[:1]
+        return {
+            message.group_id: message
+            for message in Message.objects.filter(group__in=group_ids, id=Subquery(latest)).select_related('sender')
+        }
+
+    return groups, unread_counts, last_messages
+
+
+def combine_chat_groups(groups, unread_counts, last_messages):
+    """chat_group_queries nəticələrini ChatGroupListSerializer-in gözlədiyi atributlarla birləşdirir."""
+    for group in groups:
+        group.unread_messages = unread_counts.get(group.pk, 0)
+        group.last_message_obj = last_messages.get(group.pk)
+    return groups
+
+
+def chat_group_list(user):
+    """İstifadəçinin qrupları son mesaj və oxunmamış say ilə - 3 sorğu."""
+    return combine_chat_groups(*(query() for query in chat_group_queries(user)))
+
+
+class ChatGroupViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    conditional_models = ('chat.ChatGroup', 'chat.GroupMembership', 'chat.Message', 'chat.MessageReadStatus', 'users.User')
 
     def get_queryset(self):
         user = self.request.user
@@ -33,6 +79,10 @@ class ChatGroupViewSet(viewsets.ModelViewSet):
             return ChatGroupDetailSerializer
         return ChatGroupListSerializer
 
+    def list(self, request, *args, **kwargs):
+        groups = chat_group_list(request.user)
+        return Response(self.get_serializer(groups, many=True).data)
+
     def perform_create(self, serializer):
         group = serializer.save(owner=self.request.user)
         # Add owner as member automatically
@@ -71,6 +121,17 @@ class ChatGroupViewSet(viewsets.ModelViewSet):
         return Response({'detail': 'Member removed.'})
 
 
+class ChatGroupListView(AsyncReadView):
+    """Qrup siyahısının async variantı; POST (qrup yaratmaq) ChatGroupViewSet-ə ötürülür."""
+    conditional_models = ChatGroupViewSet.conditional_models
+    fallback = ChatGroupViewSet.as_view({'post': 'create'})
+
+    async def get_data(self, request):
+        user = request.user
+        groups = combine_chat_groups(*await gather_queries(*chat_group_queries(user)))
+        return ChatGroupListSerializer(groups, many=True, context={'request': request}).data
+
+
 from rest_framework.pagination import PageNumberPagination
 
 class MessagePagination(PageNumberPagination):
@@ -78,10 +139,11 @@ class MessagePagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
-class MessageViewSet(viewsets.ModelViewSet):
+class MessageViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = MessagePagination
+    conditional_models = ('chat.Message', 'chat.GroupMembership', 'users.User')
 
     def get_queryset(self):
         group_id = self.request.query_params.get('group')
@@ -129,5 +191,6 @@ class MessageViewSet(viewsets.ModelViewSet):
             new_statuses.append(MessageReadStatus(message=msg, user=request.user, read_at=now))
         
         MessageReadStatus.objects.bulk_create(new_statuses, ignore_conflicts=True)
+        mark_changed(MessageReadStatus)
         
         return Response({'detail': 'Messages marked as read.'})
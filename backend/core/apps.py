@@ -0,0 +1,25 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        from . import checks  # noqa: F401 - yoxlamaları qeydiyyatdan keçirir
+        from . import instrumentation  # noqa: F401 - DB sorğu ölçümünü qoşur
+        from .conditional import track_changes
+        track_changes()
+
+        if settings.PRODUCTION:
+            self.check_startup()
+
+    def check_startup(self):
+        """İstehsalda hot path-a zərər verən və ya təhlükəli parametrlər qalıbsa proses açılmır."""
+        from django.core.checks import ERROR, Tags, run_checks
+        messages = run_checks(tags=['performance', Tags.security], include_deployment_checks=True)
+        errors = [message for message in messages if message.level >= ERROR]
+        if errors:
+            raise ImproperlyConfigured('\n'.join(str(error) for error in errors))
@@ -0,0 +1,128 @@
+"""
+Yüksək paralellikli oxu endpoint-ləri üçün native async view-lar.
+
+DRF view-ları ASGI altında thread-ə keçidlə işləyir və eyni vaxtda icra sayı thread pool ilə
+məhdudlaşır. AsyncReadView yalnız GET-i async icra edir:
+
+- JWT başlığı DRF-siz yoxlanılır (simplejwt), istifadəçi async ORM ilə oxunur; 401 cavabı
+  DRF-dəki kimi WWW-Authenticate başlığı ilə qaytarılır;
+- conditional_models verilibsə ETag/304 ConditionalGetMixin ilə eyni qaydada işləyir;
+- cavab FastJSONRenderer ilə yazılır;
+- get_data-dan qalxan BadRequest {'error': ...} ilə 400 cavabına çevrilir;
+- digər metodlar (POST və s.) `fallback` sync view-a ötürülür.
+
+Django-nun async ORM metodları sorğuları bir ümumi thread-də ardıcıl icra edir. Ona görə
+müstəqil sorğular gather_queries ilə thread_sensitive=False thread-lərdə (hər biri öz
+bağlantısı ilə) paralel işlədilir.
+"""
+import asyncio
+import hashlib
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.exceptions import BadRequest
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.utils.cache import parse_etags
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .conditional import change_tokens
+from .renderers import FastJSONRenderer
+
+jwt_authentication = JWTAuthentication()
+
+
+def _in_thread(func):
+    def run():
+        try:
+            return func()
+        finally:
+            # Pool-dan götürülmüş və ya köhnəlmiş bağlantı sorğu sonunda olduğu kimi qaytarılır
+            close_old_connections()
+    return sync_to_async(run, thread_sensitive=False)
+
+
+async def gather_queries(*funcs):
+    """Arqumentsiz sync funksiyaları (ORM sorğuları) ayrı thread-lərdə paralel icra edir."""
+    return await asyncio.gather(*(_in_thread(func)() for func in funcs))
+
+
+async def authenticate(request):
+    header = jwt_authentication.get_header(request)
+    raw_token = jwt_authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        token = jwt_authentication.get_validated_token(raw_token)
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    except (InvalidToken, TokenError, KeyError):
+        return None
+    return await get_user_model().objects.filter(
+        **{jwt_settings.USER_ID_FIELD: user_id}, is_active=True
+    ).afirst()
+
+
+class AsyncReadView(View):
+    fallback = None
+    conditional_models = ()
+    renderer = FastJSONRenderer()
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # DRF view-ları kimi: JWT klientləri CSRF tokeni göndərmir
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD'):
+            return await self.get(request, *args, **kwargs)
+        fallback = type(self).fallback  # sinif atributu - instance metoduna çevrilməsin
+        if fallback is not None:
+            return await sync_to_async(fallback)(request, *args, **kwargs)
+        return self.http_method_not_allowed(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        request.user = await authenticate(request)
+        if request.user is None:
+            response = self.json({'detail': 'Authentication credentials were not provided.'}, status=401)
+            # DRF NotAuthenticated cavabı kimi
+            response['WWW-Authenticate'] = jwt_authentication.authenticate_header(request)
+            return response
+
+        etag = await self.get_etag(request)
+        if etag:
+            client_etags = {value.removeprefix('W/') for value in parse_etags(request.headers.get('If-None-Match', ''))}
+            if etag in client_etags or '*' in client_etags:
+                response = HttpResponse(status=304)
+                response['ETag'] = etag
+                return response
+
+        try:
+            response = self.json(await self.get_data(request, *args, **kwargs))
+        except BadRequest as exc:
+            return self.json({'error': str(exc)}, status=400)
+        if etag:
+            response['ETag'] = etag
+        return response
+
+    async def get_data(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    async def get_etag(self, request):
+        if not self.conditional_models:
+            return None
+        tokens = await sync_to_async(change_tokens, thread_sensitive=False)(self.conditional_models)
+        parts = [
+            type(self).__module__,
+            type(self).__qualname__,
+            request.get_full_path(),
+            str(request.user.pk),
+            *tokens,
+        ]
+        digest = hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+        return f'"{digest}"'
+
+    def json(self, data, status=200):
+        return HttpResponse(self.renderer.render(data), content_type='application/json', status=status)
@@ -0,0 +1,117 @@
+"""
+DRF view-ları üçün server tərəfli cavab keşi.
+
+Açar: view + tam yol (sorğu parametrləri daxil) + istifadəçi sahəsi + asılı modellərin dəyişiklik
+tokenləri (core.conditional). Model yazılışı tokeni dəyişdiyi üçün köhnə yazılar dərhal əlçatmaz
+olur və TTL ilə silinir - ayrıca silmə əməliyyatı lazım deyil.
+
+Backend CACHES[RESPONSE_CACHE_ALIAS] ilə seçilir (locmem və ya Redis).
+"""
+import hashlib
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+from .conditional import change_tokens
+
+STATS_KEY = 'response-cache-stats:{view}:{result}'
+
+# Keşlənən view-ların adları (statistika üçün)
+_cached_views = set()
+
+
+def response_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _count(view, result):
+    cache = response_cache()
+    key = STATS_KEY.format(view=view, result=result)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Açar arada silinibsə (eviction) statistika itə bilər, cavab itmir
+        pass
+
+
+def response_cache_stats():
+    """{view: {'hits', 'misses', 'hit_ratio'}} - bütün proseslər üzrə cəmi."""
+    cache = response_cache()
+    keys = {
+        (view, result): STATS_KEY.format(view=view, result=result)
+        for view in _cached_views for result in ('hit', 'miss')
+    }
+    values = cache.get_many(keys.values())
+    stats = {}
+    for view in sorted(_cached_views):
+        hits = values.get(keys[(view, 'hit')], 0)
+        misses = values.get(keys[(view, 'miss')], 0)
+        total = hits + misses
+        stats[view] = {'hits': hits, 'misses': misses, 'hit_ratio': round(hits / total, 3) if total else None}
+    return stats
+
+
+class CacheHit(APIException):
+    status_code = status.HTTP_200_OK
+
+    def __init__(self, data):
+        self.data = data
+
+
+class CachedResponseMixin:
+    """
+    cache_models - cavabın asılı olduğu modellər; cache_scope - 'user' (hər istifadəçiyə ayrı)
+    və ya 'global' (cavab istifadəçidən asılı deyil). İcazələr keşə baxmadan əvvəl yoxlanılır.
+    ConditionalGetMixin ilə birlikdə ondan əvvəl yazılmalıdır ki, 304 keşdən də əvvəl yoxlansın.
+    """
+    cache_models = ()
+    cache_actions = ('list', 'retrieve')
+    cache_scope = 'user'
+    cache_timeout = 10 * 60
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.cache_models:
+            _cached_views.add(cls.__name__)
+
+    def get_cache_key(self, request):
+        scope = 'global' if self.cache_scope == 'global' else str(request.user.pk)
+        parts = [
+            type(self).__module__,
+            type(self).__qualname__,
+            request.get_full_path(),
+            scope,
+            request.accepted_media_type or '',
+            *change_tokens(self.cache_models),
+        ]
+        digest = hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+        return f'response:{digest}'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.response_cache_key = None
+        if request.method not in ('GET', 'HEAD') or not self.cache_models or self.action not in self.cache_actions:
+            return
+
+        key = self.get_cache_key(request)
+        data = response_cache().get(key)
+        if data is not None:
+            _count(type(self).__name__, 'hit')
+            raise CacheHit(data)
+        _count(type(self).__name__, 'miss')
+        self.response_cache_key = key
+
+    def handle_exception(self, exc):
+        if isinstance(exc, CacheHit):
+            return Response(exc.data, headers={'X-Cache': 'HIT'})
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, 'response_cache_key', None)
+        if key and response.status_code == status.HTTP_200_OK and not response.streaming:
+            response_cache().set(key, response.data, self.cache_timeout)
+            response['X-Cache'] = 'MISS'
+        return response
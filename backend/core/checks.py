@@ -0,0 +1,97 @@
+"""
+İstehsal profili üçün yoxlamalar (`manage.py check --tag performance`, `manage.py check --deploy`).
+
+DJANGO_ENV=production olduqda CoreConfig.ready bu yoxlamaları start zamanı işə salır və
+səhv tapılarsa proses açılmır - gunicorn/daphne `manage.py check` çağırmır.
+"""
+import importlib.util
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def _template_loaders_cached():
+    for template in settings.TEMPLATES:
+        loaders = template.get('OPTIONS', {}).get('loaders')
+        if template.get('APP_DIRS') or not loaders:
+            # Django DEBUG=False-da cached loader-i özü qoşur
+            continue
+        if not any(isinstance(loader, (list, tuple)) and loader[0].endswith('cached.Loader') for loader in loaders):
+            return False
+    return True
+
+
+@register('performance')
+def check_pool_dependencies(app_configs, **kwargs):
+    errors = []
+    if getattr(settings, 'DB_POOL', False) and importlib.util.find_spec('psycopg_pool') is None:
+        errors.append(Error(
+            'DB_POOL is enabled but psycopg_pool is not installed.',
+            hint='Install psycopg[pool] or unset DB_POOL.',
+            id='core.E004',
+        ))
+    return errors
+
+
+@register(Tags.security, deploy=True)
+def check_secret_key(app_configs, **kwargs):
+    if not getattr(settings, 'PRODUCTION', False):
+        return []
+    if not settings.SECRET_KEY or settings.SECRET_KEY.startswith('django-insecure-'):
+        return [Error(
+            'SECRET_KEY is missing or uses the development default in production.',
+            hint='Set DJANGO_SECRET_KEY to a long random value; sessions and JWT tokens are signed with it.',
+            id='core.E005',
+        )]
+    return []
+
+
+@register('performance')
+def check_production_settings(app_configs, **kwargs):
+    if not getattr(settings, 'PRODUCTION', False):
+        return []
+
+    errors = []
+    if settings.DEBUG:
+        errors.append(Error(
+            'DEBUG is on in production.',
+            hint='Every SQL query is kept in connection.queries and worker memory grows steadily. Set DEBUG=false.',
+            id='core.E001',
+        ))
+
+    for alias in ('default', getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')):
+        backend = settings.CACHES.get(alias, {}).get('BACKEND')
+        if backend in PER_PROCESS_CACHES:
+            errors.append(Error(
+                f"CACHES['{alias}'] uses a per-process backend ({backend}).",
+                hint='Change tokens and the schema version must be shared between workers. Set SHARED_CACHE=true.',
+                id='core.E002',
+            ))
+
+    layer = settings.CHANNEL_LAYERS.get('default', {}).get('BACKEND', '')
+    if layer.endswith('InMemoryChannelLayer'):
+        errors.append(Error(
+            'The in-memory channel layer cannot deliver messages between processes.',
+            hint='Use channels_redis.core.RedisChannelLayer.',
+            id='core.E003',
+        ))
+
+    database = settings.DATABASES['default']
+    if not database.get('OPTIONS', {}).get('pool') and not database.get('CONN_MAX_AGE'):
+        errors.append(Warning(
+            'Database connections are neither pooled nor persistent.',
+            hint='Set DB_POOL=true or DB_CONN_MAX_AGE > 0.',
+            id='core.W001',
+        ))
+
+    if not _template_loaders_cached():
+        errors.append(Warning(
+            'Template loaders are not cached.',
+            hint="Wrap the loaders in 'django.template.loaders.cached.Loader'.",
+            id='core.W002',
+        ))
+    return errors
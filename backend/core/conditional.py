@@ -0,0 +1,133 @@
+"""
+Şərti GET (ETag / If-None-Match) dəstəyi.
+
+Hər model üçün paylaşılan keşdə dəyişiklik tokeni saxlanılır və yazılış commit olunduqda
+yenilənir. ETag cavab seriyalaşdırılmadan hesablanır: view-un asılı olduğu modellərin
+tokenləri + sorğu yolu/parametrləri + istifadəçi. Token sorğudan əvvəl oxunduğu üçün
+paralel yazılış ən pisi halda növbəti sorğuda əlavə bir 200 verir, köhnə data qaytarmır.
+"""
+import hashlib
+import uuid
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+CHANGE_KEY = 'changes:{label}'
+
+# Bu tətbiqlərin bütün modelləri (m2m cədvəlləri daxil) izlənilir
+TRACKED_APPS = ('users', 'warehouse', 'tasks', 'notifications', 'chat', 'documents')
+
+
+def _label(model):
+    if isinstance(model, str):
+        return model.lower()
+    return model._meta.label_lower
+
+
+def change_tokens(models):
+    """Modellərin cari dəyişiklik tokenləri (verilən sıra ilə), bir keş sorğusu ilə."""
+    keys = [CHANGE_KEY.format(label=_label(model)) for model in models]
+    tokens = cache.get_many(keys)
+    missing = [key for key in keys if key not in tokens]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, None)
+        tokens.update(cache.get_many(missing))
+    return [tokens.get(key, '') for key in keys]
+
+
+def _bump(labels):
+    cache.set_many({CHANGE_KEY.format(label=label): uuid.uuid4().hex for label in labels}, None)
+
+
+def mark_changed(*models):
+    """
+    Modelləri dəyişmiş kimi qeyd edir (commit-dən sonra).
+    Siqnal göndərməyən yazılışlar (bulk_create, update(), raw SQL) bunu özü çağırmalıdır.
+    """
+    labels = {_label(model) for model in models}
+    transaction.on_commit(lambda: _bump(labels))
+
+
+def _model_changed(sender, **kwargs):
+    mark_changed(sender)
+
+
+def _relation_changed(sender, action, **kwargs):
+    if not action.startswith('post_'):
+        return
+    # sender - ara cədvəldir; sahəni saxlayan modelin siyahıları da ondan asılıdır
+    owner = sender._meta.auto_created
+    if owner:
+        mark_changed(sender, owner)
+    else:
+        mark_changed(sender)
+
+
+def track_changes():
+    """İzlənən tətbiqlərin modellərinə siqnal qəbulediciləri bağlayır (CoreConfig.ready)."""
+    for model in apps.get_models():
+        if model._meta.app_label not in TRACKED_APPS:
+            continue
+        uid = f'conditional:{model._meta.label_lower}'
+        post_save.connect(_model_changed, sender=model, dispatch_uid=f'{uid}:save')
+        post_delete.connect(_model_changed, sender=model, dispatch_uid=f'{uid}:delete')
+    m2m_changed.connect(_relation_changed, dispatch_uid='conditional:m2m')
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+
+class ConditionalGetMixin:
+    """
+    DRF view-ları üçün şərti GET.
+
+    conditional_models - cavabın asılı olduğu modellər (serializer-in oxuduğu əlaqəli modellər daxil).
+    If-None-Match uyğun gəlsə, queryset və seriyalaşdırma işləmədən 304 qaytarılır.
+    """
+    conditional_models = ()
+    conditional_actions = ('list', 'retrieve')
+
+    def get_etag(self, request):
+        if not self.conditional_models or self.action not in self.conditional_actions:
+            return None
+        parts = [
+            type(self).__module__,
+            type(self).__qualname__,
+            request.get_full_path(),
+            str(request.user.pk),
+            request.accepted_media_type or '',
+            *change_tokens(self.conditional_models),
+        ]
+        digest = hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+        return f'"{digest}"'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+        self.etag = self.get_etag(request)
+        if self.etag:
+            # Sıxılmış cavabların ETag-i zəif (W/) olur - If-None-Match zəif müqayisə edir
+            client_etags = {etag.removeprefix('W/') for etag in parse_etags(request.headers.get('If-None-Match', ''))}
+            if self.etag in client_etags or '*' in client_etags:
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': self.etag})
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, 'etag', None)
+        if etag and response.status_code == status.HTTP_200_OK and not response.has_header('ETag'):
+            response['ETag'] = etag
+        return response
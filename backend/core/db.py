@@ -0,0 +1,32 @@
+"""Verilənlər bazası bağlantı pool-unun statistikası."""
+from django.conf import settings
+from django.db import connections
+
+
+def pool_stats():
+    """
+    Hər DB alias üçün bu prosesin pool göstəriciləri (psycopg_pool get_stats()).
+    requests_wait_ms - bağlantı gözləməyə sərf olunan ümumi vaxt, requests_queued - növbəyə düşən sorğular.
+    """
+    stats = {}
+    for alias in connections:
+        connection = connections[alias]
+        pool = getattr(connection, 'pool', None)
+        if pool is None:
+            stats[alias] = {
+                'pooled': False,
+                'conn_max_age': connection.settings_dict.get('CONN_MAX_AGE'),
+            }
+            continue
+
+        data = pool.get_stats()
+        requests = data.get('requests_num', 0)
+        stats[alias] = {
+            'pooled': True,
+            'process_type': settings.DJANGO_PROCESS_TYPE,
+            'min_size': pool.min_size,
+            'max_size': pool.max_size,
+            'avg_wait_ms': round(data.get('requests_wait_ms', 0) / requests, 2) if requests else 0,
+            **data,
+        }
+    return stats
@@ -0,0 +1,135 @@
+"""
+Böyük həcmli cədvəl ixracı üçün ümumi köməkçilər.
+Sətirlər generator kimi ötürülür və cavab ExportResponse ilə hissə-hissə yazılır,
+ona görə yaddaş istifadəsi sətir sayından asılı deyil.
+
+- CSV həqiqi axındır: hər hissə oxunan kimi klientə göndərilir.
+- XLSX zip formatıdır və sonda yazılır: sətirlər əvvəlcə müvəqqəti fayla (diskə) yazılır,
+  fayl hazır olandan sonra hissə-hissə göndərilir. Yaddaş sabit qalır, amma ilk bayt bütün
+  sətirlər oxunandan sonra gedir. Vərəqin sətir limiti (1 048 576) aşıldıqda növbəti vərəq açılır.
+"""
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from tempfile import SpooledTemporaryFile
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_FORMATS = ('csv', 'xlsx')
+CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+# Excel vərəqində ən çox 1 048 576 sətir olur, biri başlıqdır
+XLSX_MAX_ROWS = 1048576 - 1
+
+
+class ExportResponse(StreamingHttpResponse):
+    """
+    Sync generatordan axın cavabı.
+
+    WSGI generatoru birbaşa iterasiya edir. ASGI altında isə Django sync iteratoru əvvəlcə
+    tam siyahıya çevirir (bütün ixrac yaddaşa yığılır) - burada hər hissə ayrıca, bu cavaba
+    məxsus tək thread-də növbə ilə oxunur. Generatorun DB bağlantısı həmin thread-də qalır
+    və sonda bağlanır.
+    """
+
+    async def __aiter__(self):
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='export') as executor:
+            def in_thread(func):
+                return sync_to_async(func, thread_sensitive=False, executor=executor)
+
+            parts = iter(self.streaming_content)
+            try:
+                while (part := await in_thread(next)(parts, None)) is not None:
+                    yield part
+            finally:
+                await in_thread(close_old_connections)()
+
+
+class Echo:
+    """csv.writer üçün yazılan sətri geri qaytaran psevdo-fayl."""
+
+    def write(self, value):
+        return value
+
+
+def iter_keyset(queryset, chunk_size=CHUNK_SIZE, key='pk'):
+    """
+    Queryset-i `key > son_dəyər` şərti ilə hissə-hissə oxuyur (OFFSET-siz keyset pagination).
+    Hər hissə ayrı, indeksdən istifadə edən sorğudur və uzun açıq kursor saxlamır.
+    values_list() üçün açar birinci sütun olmalıdır.
+    """
+    last = None
+    while True:
+        chunk = queryset.order_by(key)
+        if last is not None:
+            chunk = chunk.filter(**{f'{key}__gt': last})
+        rows = list(chunk[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]
+        if isinstance(last, dict):
+            last = last[key]
+        elif isinstance(last, tuple):
+            last = last[0]
+        else:
+            last = getattr(last, key)
+
+
+def format_cell(value):
+    # Excel vaxt qurşaqlı tarixləri qəbul etmir
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        return timezone.localtime(value).replace(tzinfo=None)
+    return value
+
+
+def csv_stream(header, rows):
+    writer = csv.writer(Echo())
+    # Excel-in UTF-8 (Azərbaycan hərfləri) üçün BOM
+    yield '\ufeff' + writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([format_cell(value) for value in row])
+
+
+def xlsx_stream(header, rows, chunk_size=64 * 1024, max_rows=XLSX_MAX_ROWS):
+    """
+    openpyxl write-only rejimi sətirləri birbaşa müvəqqəti fayla yazır (yaddaşda saxlamır),
+    hazır fayl isə hissə-hissə göndərilir. Hər vərəqdə ən çox `max_rows` sətir olur.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = None
+    count = 0
+    for row in rows:
+        if sheet is None or count == max_rows:
+            sheet = workbook.create_sheet()
+            sheet.append(list(header))
+            count = 0
+        sheet.append([format_cell(value) for value in row])
+        count += 1
+    if sheet is None:
+        workbook.create_sheet().append(list(header))
+
+    with SpooledTemporaryFile(max_size=8 * 1024 * 1024) as buffer:
+        workbook.save(buffer)
+        buffer.seek(0)
+        while True:
+            data = buffer.read(chunk_size)
+            if not data:
+                break
+            yield data
+
+
+def export_response(header, rows, filename, file_format='csv'):
+    """`rows` sətir ardıcıllığından (list/tuple) ibarət iterable-dır."""
+    if file_format == 'xlsx':
+        response = ExportResponse(xlsx_stream(header, rows), content_type=XLSX_CONTENT_TYPE)
+    else:
+        file_format = 'csv'
+        response = ExportResponse(csv_stream(header, rows), content_type='text/csv; charset=utf-8')
+
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+    return response
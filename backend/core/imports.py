@@ -0,0 +1,57 @@
+"""
+CSV/XLSX fayllarının axınla oxunması.
+Sətirlər başlıq adları ilə lüğət kimi, fayl tam yaddaşa yüklənmədən qaytarılır.
+Oxunmayan fayl (UTF-8 olmayan CSV, zədəli və ya XLSX olmayan fayl) ImportFileError qaldırır -
+bu, faylın ortasında da baş verə bilər.
+"""
+import csv
+import io
+import zipfile
+
+IMPORT_FORMATS = ('csv', 'xlsx')
+
+
+class ImportFileError(ValueError):
+    """Fayl bütövlükdə oxunmur (sətir səhvi deyil)."""
+
+
+def normalize_header(value):
+    return str(value or '').strip().lower().replace(' ', '_')
+
+
+def iter_csv_rows(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    reader = csv.reader(text)
+    try:
+        header = [normalize_header(value) for value in next(reader, [])]
+        for row in reader:
+            yield dict(zip(header, row))
+    except UnicodeDecodeError:
+        raise ImportFileError('CSV file must be UTF-8 encoded')
+    except csv.Error as exc:
+        raise ImportFileError(f'Invalid CSV file: {exc}')
+
+
+def iter_xlsx_rows(fileobj):
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    # read_only rejimi sətirləri paylaşılan XML-dən ardıcıl oxuyur
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, InvalidFileException, KeyError):
+        raise ImportFileError('Invalid XLSX file')
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [normalize_header(value) for value in next(rows, ())]
+        for row in rows:
+            yield {key: ('' if value is None else value) for key, value in zip(header, row)}
+    finally:
+        workbook.close()
+
+
+def iter_table_rows(fileobj, filename):
+    """Fayl adının uzantısına görə CSV və ya XLSX oxuyucusunu seçir."""
+    if filename.lower().endswith('.xlsx'):
+        return iter_xlsx_rows(fileobj)
+    return iter_csv_rows(fileobj)
@@ -0,0 +1,259 @@
+"""
+Endpoint-lər üzrə sorğu sayı, DB vaxtı, render vaxtı və ümumi gecikmənin ölçülməsi.
+
+- Hər yeni DB bağlantısına (connection_created) execute wrapper qoşulur; o, yalnız
+  contextvar-da aktiv Collector olduqda ölçür, əks halda birbaşa sorğunu icra edir.
+- InstrumentationMiddleware HTTP sorğuları, InstrumentedConsumerMixin isə Channels
+  consumer-lərinin hər mesajını ölçür. database_sync_to_async çağırışları contextvar-ı
+  thread-ə daşıdığı üçün onların sorğuları da sayılır.
+- Nəticələr prosesin yaddaşında saxlanılır: endpoint başına son METRICS_WINDOW ölçüm
+  (p50/p95/p99 üçün) və mənbə sətri ilə birlikdə ən yavaş METRICS_SLOW_QUERIES SQL.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils.functional import LazyObject, empty
+
+_collector = ContextVar('instrumentation_collector', default=None)
+
+PROJECT_DIR = str(settings.BASE_DIR)
+# Bütün sorğuları sarıyan middleware/mixin faylları mənbə kimi göstərilmir
+WRAPPER_FILES = {
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in ('instrumentation.py', 'middleware.py', 'conditional.py', 'cache.py')
+}
+
+
+class Collector:
+    """Bir HTTP sorğusu və ya consumer mesajı üçün yığılan göstəricilər."""
+
+    def __init__(self, label=None, request=None):
+        self.label = label
+        self.request = request
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.started = time.perf_counter()
+
+    @property
+    def endpoint(self):
+        if self.label is None and self.request is not None:
+            match = getattr(self.request, 'resolver_match', None)
+            if match is None:
+                return f'{self.request.method} <unresolved>'
+            return f'{self.request.method} {match.view_name or match.route}'
+        return self.label
+
+    def elapsed(self):
+        return (time.perf_counter() - self.started) * 1000
+
+
+def stack_origin():
+    """Sorğunu göndərən layihə kodunun ən yaxın sətri (site-packages və sarğılar nəzərə alınmır)."""
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if filename in WRAPPER_FILES or not filename.startswith(PROJECT_DIR) or 'site-packages' in filename:
+            continue
+        return f'{os.path.relpath(filename, PROJECT_DIR)}:{frame.lineno} in {frame.name}'
+    return None
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return round(ordered[index], 2)
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.window = getattr(settings, 'METRICS_WINDOW', 500)
+        self.slow_limit = getattr(settings, 'METRICS_SLOW_QUERIES', 20)
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.endpoints = {}
+            self.slow_queries = []  # min-heap: (ms, seq, query)
+            self.sequence = itertools.count()
+
+    def observe(self, collector):
+        sample = (collector.elapsed(), collector.db_time, collector.render_time, collector.queries)
+        with self.lock:
+            samples = self.endpoints.get(collector.endpoint)
+            if samples is None:
+                samples = self.endpoints[collector.endpoint] = deque(maxlen=self.window)
+            samples.append(sample)
+        return sample
+
+    def observe_query(self, collector, sql, duration):
+        if self.slow_limit <= 0:
+            return
+        # Stack yalnız sorğu top siyahıya düşəndə çıxarılır - adi sorğulara əlavə xərc yoxdur.
+        # Heap başqa thread-lərdə dəyişir, ona görə yoxlama kilid altında aparılır
+        with self.lock:
+            if len(self.slow_queries) >= self.slow_limit and duration <= self.slow_queries[0][0]:
+                return
+        entry = {
+            'duration_ms': round(duration, 2),
+            'sql': sql[:2000],
+            'endpoint': collector.endpoint,
+            'origin': stack_origin(),
+        }
+        with self.lock:
+            item = (duration, next(self.sequence), entry)
+            if len(self.slow_queries) < self.slow_limit:
+                heapq.heappush(self.slow_queries, item)
+            elif duration > self.slow_queries[0][0]:
+                heapq.heapreplace(self.slow_queries, item)
+
+    def snapshot(self):
+        with self.lock:
+            endpoints = {key: list(samples) for key, samples in self.endpoints.items()}
+            slow_queries = sorted(self.slow_queries, reverse=True)
+
+        rows = []
+        for key, samples in endpoints.items():
+            totals = [sample[0] for sample in samples]
+            queries = [sample[3] for sample in samples]
+            rows.append({
+                'endpoint': key,
+                'count': len(samples),
+                'p50_ms': percentile(totals, 0.50),
+                'p95_ms': percentile(totals, 0.95),
+                'p99_ms': percentile(totals, 0.99),
+                'avg_db_ms': round(sum(sample[1] for sample in samples) / len(samples), 2),
+                'avg_render_ms': round(sum(sample[2] for sample in samples) / len(samples), 2),
+                'avg_queries': round(sum(queries) / len(queries), 1),
+                'max_queries': max(queries),
+            })
+        rows.sort(key=lambda row: row['p95_ms'], reverse=True)
+        return {
+            'pid': os.getpid(),
+            'endpoints': rows,
+            'slow_queries': [item[2] for item in slow_queries],
+        }
+
+
+metrics = Metrics()
+
+
+def record_query(execute, sql, params, many, context):
+    collector = _collector.get()
+    if collector is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = (time.perf_counter() - started) * 1000
+        collector.queries += 1
+        collector.db_time += duration
+        metrics.observe_query(collector, sql, duration)
+
+
+@receiver(connection_created)
+def install_query_wrapper(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def render_timer():
+    """Renderer-də JSON-a çevrilmə vaxtını aktiv collector-a yazır."""
+    collector = _collector.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if collector is not None:
+            collector.render_time += (time.perf_counter() - started) * 1000
+
+
+def server_timing(total, db, render, queries):
+    return (
+        f'db;dur={db:.1f};desc="{queries} queries", '
+        f'render;dur={render:.1f}, '
+        f'app;dur={max(total - db - render, 0):.1f}, '
+        f'total;dur={total:.1f}'
+    )
+
+
+def _authenticated_staff(request):
+    """
+    Sorğu zamanı artıq müəyyən olunmuş istifadəçi staff-dırsa True (DRF/JWT və async view-lar
+    request.user-i təyin edir). Hesablanmamış lazy istifadəçi üçün əlavə DB sorğusu edilmir.
+    """
+    user = request.__dict__.get('user')
+    if isinstance(user, LazyObject) and user._wrapped is empty:
+        return False
+    return bool(getattr(user, 'is_staff', False))
+
+
+class InstrumentationMiddleware:
+    """
+    Sorğunu ölçür və Server-Timing başlığını əlavə edir. Siyahıda birinci olmalıdır.
+    Başlıq DB vaxtını və sorğu sayını açır: SERVER_TIMING söndürülübsə (istehsal default-u)
+    yalnız staff istifadəçilərə göndərilir, ölçümlər isə hər halda /api/metrics/-ə yazılır.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        collector = Collector(request=request)
+        token = _collector.set(collector)
+        try:
+            response = self.get_response(request)
+        finally:
+            _collector.reset(token)
+        return self.finish(response, collector)
+
+    async def __acall__(self, request):
+        collector = Collector(request=request)
+        token = _collector.set(collector)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _collector.reset(token)
+        return self.finish(response, collector)
+
+    def finish(self, response, collector):
+        total, db, render, queries = metrics.observe(collector)
+        if getattr(settings, 'SERVER_TIMING', settings.DEBUG) or _authenticated_staff(collector.request):
+            response['Server-Timing'] = server_timing(total, db, render, queries)
+        return response
+
+
+class InstrumentedConsumerMixin:
+    """Channels consumer-inin hər mesajını (connect, receive, group mesajları) ayrıca ölçür."""
+
+    async def dispatch(self, message):
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', True):
+            return await super().dispatch(message)
+        collector = Collector(label=f"ws {type(self).__name__}.{message['type']}")
+        token = _collector.set(collector)
+        try:
+            await super().dispatch(message)
+        finally:
+            _collector.reset(token)
+            metrics.observe(collector)
@@ -0,0 +1,87 @@
+"""
+Cavabların gzip/brotli ilə sıxılması.
+
+Accept-Encoding üzrə seçim edilir (br > gzip), COMPRESSION_MIN_SIZE baytdan kiçik və ya
+artıq sıxılmış (şəkil, xlsx, apk) cavablara toxunulmur. gzip hissəsi Django-nun
+GZipMiddleware-i ilə eynidir (BREACH-ə qarşı təsadüfi doldurma daxil); brotli paketi
+quraşdırılmayıbsa yalnız gzip istifadə olunur. Stream cavablar yalnız gzip ilə sıxılır.
+
+BREACH: sıxılmış cavabın ölçüsü gövdədəki sirri (token) hərf-hərf açmağa imkan verir - bunun
+üçün hücumçu qurbanın brauzerindən autentifikasiyalı sorğu göndərə bilməlidir.
+- Gövdəsində token olan cavablar (COMPRESSION_EXCLUDE_PATHS, default: JWT token endpoint-ləri)
+  ümumiyyətlə sıxılmır.
+- Brauzerin özü göndərdiyi session cookie ilə gələn sorğular (admin, browsable API) brotli ilə
+  yox, təsadüfi doldurmalı gzip ilə sıxılır.
+- Authorization başlığı (JWT) ilə gələn API sorğularını başqa saytdan göndərmək mümkün deyil,
+  onlar brotli ilə sıxılır.
+"""
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml')
+
+
+def accepted_encodings(header):
+    """Accept-Encoding başlığından q > 0 olan kodlaşdırmalar."""
+    encodings = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            encodings.add(coding.strip().lower())
+    return encodings
+
+
+def cookie_authenticated(request):
+    """Sorğu brauzerin avtomatik göndərdiyi session cookie ilə autentifikasiya olunur."""
+    return settings.SESSION_COOKIE_NAME in request.COOKIES and 'Authorization' not in request.headers
+
+
+class CompressionMiddleware(GZipMiddleware):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.brotli_quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+        self.exclude_paths = tuple(getattr(settings, 'COMPRESSION_EXCLUDE_PATHS', ()))
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        if self.exclude_paths and request.path.startswith(self.exclude_paths):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        encodings = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        use_brotli = brotli is not None and 'br' in encodings and not response.streaming
+        if use_brotli and not cookie_authenticated(request):
+            patch_vary_headers(response, ('Accept-Encoding',))
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+            etag = response.get('ETag')
+            if etag and etag.startswith('"'):
+                response.headers['ETag'] = 'W/' + etag
+            response.headers['Content-Encoding'] = 'br'
+            return response
+
+        if 'gzip' not in encodings:
+            patch_vary_headers(response, ('Accept-Encoding',))
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,35 @@
+"""
+orjson əsaslı JSON renderer.
+
+Nəticə DRF-in JSONRenderer-i ilə eynidir: Decimal/UUID/lazy string və s. DRF-in JSONEncoder-i
+ilə çevrilir, UTC vaxtlar 'Z' ilə yazılır. orjson quraşdırılmayıbsa və ya girinti istənibsə
+(browsable API) standart renderer işləyir. Render vaxtı Server-Timing-ə (render) yazılır.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .instrumentation import render_timer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    encoder_default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with render_timer():
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data,
+            default=self.encoder_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
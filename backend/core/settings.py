@@ -16,15 +16,26 @@ import os
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-# Quick-start development settings - unsuitable for production
-# See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+# Profil: DJANGO_ENV=production olduqda default dəyərlər istehsal üçün seçilir və
+# core/checks.py-dakı yoxlamalar start zamanı səhv konfiqurasiyada prosesi dayandırır.
+DJANGO_ENV = os.environ.get('DJANGO_ENV', 'development')
+PRODUCTION = DJANGO_ENV == 'production'
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-8m#6w%im$(e!8$($0x7ofn3$)u22yog+yxxygsts(d=yb@l^gy'
+# Default açar yalnız development üçündür - istehsalda core.E005 prosesi dayandırır.
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-8m#6w%im$(e!8$($0x7ofn3$)u22yog+yxxygsts(d=yb@l^gy')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# DEBUG açıq olduqda Django hər SQL sorğusunu connection.queries-də saxlayır - uzunömürlü
+# daphne worker-lərində yaddaş durmadan artır.
+DEBUG = env_bool('DEBUG', not PRODUCTION)
 
 ALLOWED_HOSTS = ['*']
 
@@ -44,6 +55,7 @@ INSTALLED_APPS = [
     'corsheaders',
     'drf_spectacular',
     'channels',
+    'core',
     'users',
     'warehouse',
     'tasks',
@@ -52,28 +64,33 @@ INSTALLED_APPS = [
     'dashboard',
     'performance',
     'documents',
+    'sync',
+    'jobs',
+    'outbox',
 ]
 
 ASGI_APPLICATION = 'core.asgi.application'
 
-# if DEBUG:
-#     CHANNEL_LAYERS = {
-#         "default": {
-#             "BACKEND": "channels.layers.InMemoryChannelLayer",
-#         },
-#     }
-# else:
+REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
+REDIS_PORT = int(os.environ.get('REDIS_PORT', 6380))
+
+# capacity - kanal başına növbədə saxlanılan mesaj sayı (channels_redis default 100),
+# expiry - oxunmamış mesajın saxlanma müddəti (saniyə)
 CHANNEL_LAYERS = {
-        "default": {
-            "BACKEND": "channels_redis.core.RedisChannelLayer",
-            "CONFIG": {
-                "hosts": [("localhost", 6380)],
+    "default": {
+        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "CONFIG": {
+            "hosts": [(REDIS_HOST, REDIS_PORT)],
+            "capacity": int(os.environ.get('CHANNEL_LAYER_CAPACITY', 1000)),
+            "expiry": int(os.environ.get('CHANNEL_LAYER_EXPIRY', 30)),
+            "group_expiry": int(os.environ.get('CHANNEL_LAYER_GROUP_EXPIRY', 86400)),
         },
     },
 }
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -83,19 +100,34 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# core.instrumentation: Server-Timing başlığı və /api/metrics/ (prosesin yaddaşında saxlanılır)
+INSTRUMENTATION_ENABLED = env_bool('INSTRUMENTATION_ENABLED', True)
+METRICS_WINDOW = int(os.environ.get('METRICS_WINDOW', 500))
+METRICS_SLOW_QUERIES = int(os.environ.get('METRICS_SLOW_QUERIES', 20))
+# Server-Timing hamıya göndərilsin? Söndürülübsə yalnız staff istifadəçilər görür
+SERVER_TIMING = env_bool('SERVER_TIMING', DEBUG)
+if INSTRUMENTATION_ENABLED:
+    MIDDLEWARE.insert(0, 'core.instrumentation.InstrumentationMiddleware')
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Şablonlar bir dəfə kompilyasiya olunur (admin, browsable API)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -106,25 +138,73 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-# if DEBUG:
-#     DATABASES = {
-#         'default': {
-#             'ENGINE': 'django.db.backends.sqlite3',
-#             'NAME': BASE_DIR / 'db.sqlite3',
-#         }
-#     }
-# else:
 DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.postgresql',
-            'NAME': 'postgres',        # DB adı
-            'USER': 'postgres',        # istifadəçi
-            'PASSWORD': 'postgres',    # şifrə
-            'HOST': 'localhost',       # ← dəyişdi
-            'PORT': 5432,
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('DB_NAME', 'postgres'),
+        'USER': os.environ.get('DB_USER', 'postgres'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', 'postgres'),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': int(os.environ.get('DB_PORT', 5432)),
+    }
+}
+
+# Bağlantı pool-u
+# DJANGO_PROCESS_TYPE: http (gunicorn), ws (daphne) və ya worker (run_jobs) - default pool ölçüləri proses tipinə görə seçilir.
+# DB_POOL=true olduqda psycopg 3 pool-u (psycopg[pool]) istifadə olunur; əks halda bağlantılar
+# hər sorğudan sonra bağlanmır, DB_CONN_MAX_AGE saniyə ərzində yenidən istifadə olunur.
+DJANGO_PROCESS_TYPE = os.environ.get('DJANGO_PROCESS_TYPE', 'http')
+DB_POOL = env_bool('DB_POOL')
+DB_POOL_SIZES = {
+    'http': (1, 4),   # sync gunicorn worker-i bir thread-dir
+    'ws': (2, 16),    # daphne: HTTP + consumer-lərin database_sync_to_async çağırışları
+    'worker': (1, 2),  # run_jobs: işlər ardıcıl icra olunur
+}
+_pool_min_size, _pool_max_size = DB_POOL_SIZES.get(DJANGO_PROCESS_TYPE, (1, 4))
+
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+if DB_POOL:
+    DATABASES['default']['CONN_MAX_AGE'] = 0  # pool persistent bağlantılarla birlikdə işləmir
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', _pool_min_size)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', _pool_max_size)),
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        },
     }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+
+
+# Cache
+# 'default' - dəyişiklik tokenləri (core.conditional), sxem versiyası və s. Bütün proseslər eyni
+# keşi görməlidir, ona görə istehsalda Redis (SHARED_CACHE) tələb olunur.
+# 'responses' - core.cache cavab keşi; RESPONSE_CACHE_REDIS_URL ilə ayrıca Redis bazası seçilə bilər.
+
+SHARED_CACHE = env_bool('SHARED_CACHE', PRODUCTION)
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', f'redis://{REDIS_HOST}:{REDIS_PORT}/1')
+RESPONSE_CACHE_REDIS_URL = os.environ.get(
+    'RESPONSE_CACHE_REDIS_URL', f'redis://{REDIS_HOST}:{REDIS_PORT}/2' if SHARED_CACHE else None
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_REDIS_URL,
+    } if SHARED_CACHE else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': RESPONSE_CACHE_REDIS_URL,
+    } if RESPONSE_CACHE_REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+    },
 }
 
+RESPONSE_CACHE_ALIAS = 'responses'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -186,8 +266,27 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ) if DEBUG else (
+        'core.renderers.FastJSONRenderer',
+    ),
 }
 
+# core.middleware.CompressionMiddleware
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_BROTLI_QUALITY = 5
+# Gövdəsində sirr (JWT) olan cavablar sıxılmır - BREACH
+COMPRESSION_EXCLUDE_PATHS = ('/api/token/',)
+
+# jobs: bildiriş yaradılması, stok çıxılması və s. fon işləri (manage.py run_jobs).
+# JOBS_ALWAYS_EAGER=true olduqda işlər commit-dən sonra elə sorğunun prosesində icra olunur.
+JOBS_ALWAYS_EAGER = env_bool('JOBS_ALWAYS_EAGER')
+JOBS_RETRY_DELAY = 5          # saniyə, hər cəhddə 2 dəfə artır
+JOBS_LOCK_TIMEOUT = 300       # bu müddətdən çox RUNNING qalan iş yenidən növbəyə düşür
+JOBS_RETENTION = 24 * 3600    # tamamlanmış işlər nə qədər saxlanılır
+
 from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
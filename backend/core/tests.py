@@ -0,0 +1,337 @@
+import datetime
+import gzip
+import io
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest import skipUnless
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from users.models import Region, User
+from warehouse.models import Warehouse
+from .checks import check_secret_key
+from .cache import response_cache, response_cache_stats
+from .conditional import change_tokens, mark_changed
+from .instrumentation import Collector, InstrumentationMiddleware, Metrics
+from .middleware import CompressionMiddleware, brotli
+from .renderers import FastJSONRenderer
+from .export import ExportResponse, export_response, xlsx_stream
+
+
+class ExportStreamingTest(SimpleTestCase):
+    """İxrac cavabı sətirləri hissə-hissə oxumalıdır - həm WSGI, həm ASGI altında."""
+
+    def rows(self, count, produced):
+        for i in range(count):
+            produced.append(threading.current_thread())
+            yield [i, f'sətir {i}']
+
+    def test_csv_export_is_streaming(self):
+        response = export_response(['ID', 'Ad'], self.rows(3, []), 'test')
+
+        self.assertIsInstance(response, ExportResponse)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="test.csv"')
+
+    def test_asgi_iteration_pulls_rows_incrementally(self):
+        produced = []
+        response = export_response(['ID', 'Ad'], self.rows(1000, produced), 'test')
+
+        async def consume():
+            seen = []
+            async for part in response:
+                # Klient hər hissəni alanda generator ondan çox irəli getməməlidir
+                seen.append((part, len(produced)))
+            return seen
+
+        seen = async_to_sync(consume)()
+
+        self.assertEqual(len(seen), 1001)  # başlıq + hər sətir ayrıca hissə
+        self.assertTrue(seen[0][0].startswith('\ufeffID,Ad'.encode()))
+        for index, (_, count) in enumerate(seen):
+            self.assertEqual(count, index)
+        # Generator event loop-da deyil, cavabın tək ayrıca thread-ində işləyir
+        self.assertEqual(len(set(produced)), 1)
+        self.assertIsNot(produced[0], threading.main_thread())
+
+    def test_wsgi_iteration_is_lazy(self):
+        produced = []
+        response = export_response(['ID', 'Ad'], self.rows(100, produced), 'test')
+
+        parts = iter(response)
+        next(parts)
+        next(parts)
+        self.assertEqual(len(produced), 1)
+        self.assertEqual(len(list(parts)), 99)
+
+    def test_xlsx_splits_sheets_at_row_limit(self):
+        from openpyxl import load_workbook
+
+        body = b''.join(xlsx_stream(['ID', 'Ad'], ([i, str(i)] for i in range(5)), max_rows=2))
+        workbook = load_workbook(io.BytesIO(body), read_only=True)
+
+        sheets = [list(sheet.values) for sheet in workbook.worksheets]
+        self.assertEqual([len(rows) for rows in sheets], [3, 3, 2])
+        self.assertTrue(all(rows[0] == ('ID', 'Ad') for rows in sheets))
+        self.assertEqual([row[0] for rows in sheets for row in rows[1:]], [0, 1, 2, 3, 4])
+
+    def test_xlsx_without_rows_has_header(self):
+        from openpyxl import load_workbook
+
+        body = b''.join(xlsx_stream(['ID', 'Ad'], iter(())))
+        sheet = load_workbook(io.BytesIO(body), read_only=True).worksheets[0]
+        self.assertEqual(list(sheet.values), [('ID', 'Ad')])
+
+
+class SecretKeyCheckTest(SimpleTestCase):
+    @override_settings(PRODUCTION=True, SECRET_KEY='django-insecure-dev')
+    def test_development_key_is_fatal_in_production(self):
+        self.assertEqual([error.id for error in check_secret_key(None)], ['core.E005'])
+
+    @override_settings(PRODUCTION=True, SECRET_KEY='x' * 50)
+    def test_configured_key_passes(self):
+        self.assertEqual(check_secret_key(None), [])
+
+    @override_settings(PRODUCTION=False, SECRET_KEY='django-insecure-dev')
+    def test_development_default_is_allowed_outside_production(self):
+        self.assertEqual(check_secret_key(None), [])
+
+
+class ConditionalGetTest(TestCase):
+    url = '/api/warehouse/warehouses/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('anbardar', password='x')
+        cls.region = Region.objects.create(name='Bakı')
+        Warehouse.objects.create(name='Mərkəzi', region=cls.region)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(self.url, **headers)
+
+    def test_unchanged_data_returns_304(self):
+        etag = self.get()['ETag']
+
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.get(f'W/{etag}').status_code, 304)
+
+    def test_write_to_tracked_model_changes_etag(self):
+        etag = self.get()['ETag']
+        token = change_tokens(['warehouse.Warehouse'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Warehouse.objects.create(name='Filial', region=self.region)
+
+        self.assertNotEqual(change_tokens(['warehouse.Warehouse']), token)
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(self.get(response['ETag']).status_code, 304)
+
+    def test_write_to_dependency_changes_etag(self):
+        etag = self.get()['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Region.objects.filter(pk=self.region.pk).update(name='Gəncə')
+            mark_changed(Region)
+
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['region_name'], 'Gəncə')
+
+    def test_rolled_back_write_keeps_etag(self):
+        etag = self.get()['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError), transaction.atomic():
+                Warehouse.objects.create(name='Filial', region=self.region)
+                raise ValueError
+
+        self.assertEqual(self.get(etag).status_code, 304)
+
+
+class ResponseCacheTest(TestCase):
+    url = '/api/warehouse/warehouses/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('anbardar', password='x')
+        cls.region = Region.objects.create(name='Bakı')
+        cls.warehouse = Warehouse.objects.create(name='Mərkəzi', region=cls.region)
+
+    def setUp(self):
+        cache.clear()
+        response_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(response_cache_stats()['WarehouseViewSet'], {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_mark_changed_on_dependency_misses(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Region.objects.filter(pk=self.region.pk).update(name='Gəncə')
+            mark_changed(Region)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['region_name'], 'Gəncə')
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+    def test_signal_write_misses(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.warehouse.name = 'Yeni ad'
+            self.warehouse.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['name'], 'Yeni ad')
+
+    def test_query_string_is_part_of_key(self):
+        self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, {'page_size': 1})['X-Cache'], 'MISS')
+
+
+class ServerTimingTest(SimpleTestCase):
+    def respond(self, user=None):
+        request = RequestFactory().get('/api/tasks/')
+        if user is not None:
+            request.user = user
+        return InstrumentationMiddleware(lambda request: HttpResponse())(request)
+
+    @override_settings(SERVER_TIMING=True)
+    def test_sent_to_everyone_when_enabled(self):
+        self.assertIn('db;dur=', self.respond()['Server-Timing'])
+
+    @override_settings(SERVER_TIMING=False)
+    def test_hidden_from_regular_users(self):
+        self.assertFalse(self.respond().has_header('Server-Timing'))
+        self.assertFalse(self.respond(User(username='usta')).has_header('Server-Timing'))
+
+    @override_settings(SERVER_TIMING=False)
+    def test_sent_to_staff(self):
+        self.assertTrue(self.respond(User(username='admin', is_staff=True)).has_header('Server-Timing'))
+
+    @override_settings(SERVER_TIMING=False)
+    def test_unevaluated_session_user_is_not_loaded(self):
+        def load():
+            raise AssertionError('user must not be loaded')
+
+        self.assertFalse(self.respond(SimpleLazyObject(load)).has_header('Server-Timing'))
+        staff = SimpleLazyObject(lambda: User(username='admin', is_staff=True))
+        staff.is_staff  # sorğu zamanı artıq hesablanıb
+        self.assertTrue(self.respond(staff).has_header('Server-Timing'))
+
+
+class SlowQueryTest(SimpleTestCase):
+    def observe(self, metrics, *durations):
+        collector = Collector(label='GET test')
+        for duration in durations:
+            metrics.observe_query(collector, f'SELECT {duration}', duration)
+        return [query['duration_ms'] for query in metrics.snapshot()['slow_queries']]
+
+    @override_settings(METRICS_SLOW_QUERIES=2)
+    def test_keeps_slowest_queries(self):
+        self.assertEqual(self.observe(Metrics(), 5, 1, 9, 3, 7), [9, 7])
+
+    @override_settings(METRICS_SLOW_QUERIES=0)
+    def test_disabled_slow_query_log(self):
+        self.assertEqual(self.observe(Metrics(), 5, 1), [])
+
+    @override_settings(METRICS_SLOW_QUERIES=3)
+    def test_parallel_threads(self):
+        metrics = Metrics()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda duration: self.observe(metrics, duration), range(200)))
+        self.assertEqual(self.observe(metrics), [199, 198, 197])
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    """orjson renderer-i DRF-in JSONRenderer-i ilə bayt-bayt eyni nəticə verməlidir."""
+
+    def assertSameOutput(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_special_types(self):
+        utc = datetime.datetime(2026, 3, 1, 12, 30, 45, 123456, tzinfo=datetime.timezone.utc)
+        baku = datetime.timezone(datetime.timedelta(hours=4))
+        self.assertSameOutput({
+            'decimal': Decimal('1.10'),
+            'small_decimal': Decimal('0.001'),
+            'utc': utc,
+            'utc_whole_seconds': utc.replace(microsecond=0),
+            'offset': utc.astimezone(baku),
+            'naive': utc.replace(tzinfo=None),
+            'date': utc.date(),
+            'time': utc.time(),
+            'duration': datetime.timedelta(hours=1, seconds=3),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': _('Required'),
+            'text': 'Bakı, Gəncə',
+            'none': None,
+            'nested': [{'quantity': Decimal('2.500'), 'at': utc}],
+            1: 'int key',
+        })
+
+    def test_empty_and_list(self):
+        self.assertEqual(FastJSONRenderer().render(None), JSONRenderer().render(None))
+        self.assertSameOutput([])
+        self.assertSameOutput([Decimal('3'), _('Duplicate')])
+
+
+class CompressionMiddlewareTest(SimpleTestCase):
+    body = {'items': [{'id': i, 'name': f'Məhsul {i}'} for i in range(200)]}
+
+    def respond(self, path='/api/tasks/', encoding='gzip, br', **headers):
+        request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=encoding, **headers)
+        return CompressionMiddleware(lambda request: JsonResponse(self.body))(request)
+
+    def test_json_is_gzipped(self):
+        response = self.respond(encoding='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), JsonResponse(self.body).content)
+
+    def test_token_responses_are_not_compressed(self):
+        for path in ('/api/token/', '/api/token/refresh/'):
+            with self.subTest(path=path):
+                response = self.respond(path)
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertEqual(response.content, JsonResponse(self.body).content)
+
+    @skipUnless(brotli, 'brotli quraşdırılmayıb')
+    def test_bearer_requests_use_brotli(self):
+        response = self.respond(HTTP_AUTHORIZATION='Bearer x')
+        self.assertEqual(response['Content-Encoding'], 'br')
+
+    def test_cookie_authenticated_requests_use_padded_gzip(self):
+        request = RequestFactory().get('/api/tasks/', HTTP_ACCEPT_ENCODING='gzip, br')
+        request.COOKIES['sessionid'] = 'x'
+        response = CompressionMiddleware(lambda request: JsonResponse(self.body))(request)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
@@ -19,7 +19,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
-from .views import AppDownloadView
+from .views import AppDownloadView, CacheStatsView, DatabasePoolStatsView, MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -31,7 +31,11 @@ urlpatterns = [
     path('api/dashboard/', include('dashboard.urls')),
     path('api/performance/', include('performance.urls')),
     path('api/documents/', include('documents.urls')),
+    path('api/sync/', include('sync.urls')),
     path('api/app/download/', AppDownloadView.as_view(), name='app-download'),
+    path('api/cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
+    path('api/db/pool/stats/', DatabasePoolStatsView.as_view(), name='db-pool-stats'),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
@@ -2,7 +2,11 @@ import os
 from django.conf import settings
 from django.http import FileResponse, Http404
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from .cache import response_cache_stats
+from .db import pool_stats
+from .instrumentation import metrics
 
 
 class AppDownloadView(APIView):
@@ -41,3 +45,34 @@ class AppDownloadView(APIView):
         )
         response['Content-Type'] = 'application/vnd.android.package-archive'
         return response
+
+
+class CacheStatsView(APIView):
+    """Cavab keşinin view-lar üzrə hit/miss statistikası (yalnız admin)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(response_cache_stats())
+
+
+class DatabasePoolStatsView(APIView):
+    """Bu prosesin DB bağlantı pool-u: ölçü, boş bağlantılar, gözləmə vaxtı (yalnız admin)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(pool_stats())
+
+
+class MetricsView(APIView):
+    """
+    Bu prosesin endpoint göstəriciləri (p95-ə görə sıralanır) və ən yavaş SQL sorğuları
+    mənbə sətri ilə (yalnız admin). DELETE statistikanı sıfırlayır.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(metrics.snapshot())
+
+    def delete(self, request):
+        metrics.reset()
+        return Response(status=204)
@@ -0,0 +1,15 @@
+from jobs.registry import job
+from notifications.models import Notification
+from .models import Event
+
+
+@job()
+def notify_event_created(event_id):
+    event = Event.objects.filter(pk=event_id).first()
+    if event is None:
+        return
+    Notification.objects.create(
+        title=f"Yeni Tədbir: {event.title}",
+        message=event.description or "",
+        notification_type=Notification.NotificationType.GENERAL
+    )
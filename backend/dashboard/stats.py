@@ -0,0 +1,147 @@
+"""
+Dashboard statistikası iki sorğu ilə.
+
+- Task üzrə bir sorğu: (icraçı, tapşırıq tipi) cütləri üzrə qruplaşdırılır, statuslar və
+  is_active şərti Count(filter=...) ilə sayılır. Ümumi say, status/tip bölgüsü və ən aktiv
+  5 istifadəçi bu sətirlərdən Python-da yığılır (sətir sayı cüt sayı qədərdir, tapşırıq sayı
+  qədər deyil).
+- StockMovement üzrə bir sorğu: hər hərəkət tipi üçün şərti Count.
+- movement_series: hərəkətlərin gün/həftə/ay üzrə (TruncDay/TruncWeek/TruncMonth) tip və anbar
+  bölgüsü ilə sayı və miqdar dəyişikliyi. Aralıq created_at ilə başlayan indekslə
+  (StockMovement.Meta) seçilir. Miqdar delta-nın cəmidir; delta-sı boş köhnə sətirlər üçün
+  (backfill_movement_delta işləyənə qədər) quantity_new - quantity_old götürülür.
+
+Tarix aralığı created_at üzərində yarımaçıq intervaldır (>= başlanğıc, < son günün ertəsi),
+__date kimi sütunu funksiyaya salmır və created_at indeksindən istifadə edir.
+"""
+from datetime import datetime, time, timedelta
+from django.db.models import Count, DateField, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from tasks.models import Task
+from warehouse.models import StockMovement
+from warehouse.services import movement_delta
+
+ACTIVE_STATUSES = (Task.Status.TODO, Task.Status.IN_PROGRESS, Task.Status.ARRIVED)
+USER_FIELDS = (
+    'assigned_to__username',
+    'assigned_to__first_name',
+    'assigned_to__last_name',
+    'assigned_to__group__name',
+    'assigned_to__avatar',
+)
+TOP_USERS = 5
+DEFAULT_MOVEMENT_DAYS = 30
+
+# interval -> (Trunc funksiyası, aralıq verilmədikdə geriyə neçə gün)
+SERIES_INTERVALS = {
+    'day': (TruncDay, 30),
+    'week': (TruncWeek, 12 * 7),
+    'month': (TruncMonth, 365),
+}
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def parse_range(params):
+    """?date_from=&date_to= (YYYY-MM-DD) -> (başlanğıc, son) aware datetime, sərhədsiz tərəf None."""
+    bounds = []
+    for name in ('date_from', 'date_to'):
+        value = params.get(name)
+        if not value:
+            bounds.append(None)
+            continue
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Invalid {name}')
+        bounds.append(_start_of(day + timedelta(days=1)) if name == 'date_to' else _start_of(day))
+    return tuple(bounds)
+
+
+def _in_range(queryset, start, end):
+    if start:
+        queryset = queryset.filter(created_at__gte=start)
+    if end:
+        queryset = queryset.filter(created_at__lt=end)
+    return queryset
+
+
+def task_stats(start=None, end=None):
+    rows = _in_range(Task.objects.all(), start, end).order_by().values(
+        'assigned_to', 'task_type__name', 'task_type__color', *USER_FIELDS,
+    ).annotate(
+        count=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        **{status: Count('id', filter=Q(status=status)) for status in Task.Status.values},
+    )
+
+    by_status = dict.fromkeys(Task.Status.values, 0)
+    by_type = {}
+    by_user = {}
+    total = active = 0
+    for row in rows:
+        total += row['count']
+        active += row['active']
+        for status in Task.Status.values:
+            by_status[status] += row[status]
+
+        type_key = (row['task_type__name'], row['task_type__color'])
+        by_type[type_key] = by_type.get(type_key, 0) + row['count']
+
+        if row['assigned_to'] is None:
+            continue
+        user = by_user.setdefault(row['assigned_to'], {
+            **{field: row[field] for field in USER_FIELDS},
+            'total_tasks': 0, 'active_tasks': 0, 'done_tasks': 0,
+        })
+        user['total_tasks'] += row['count']
+        user['active_tasks'] += sum(row[status] for status in ACTIVE_STATUSES)
+        user['done_tasks'] += row[Task.Status.DONE]
+
+    top_users = sorted(by_user.items(), key=lambda item: (-item[1]['total_tasks'], item[0]))[:TOP_USERS]
+    return {
+        'total': total,
+        'active': active,
+        'by_status': [{'status': status, 'count': count} for status, count in by_status.items() if count],
+        'by_type': [
+            {'task_type__name': name, 'task_type__color': color, 'count': count}
+            for (name, color), count in by_type.items()
+        ],
+        'by_user': [user for _, user in top_users],
+    }
+
+
+def movement_stats(start=None, end=None):
+    if start is None:
+        start = timezone.now() - timedelta(days=DEFAULT_MOVEMENT_DAYS)
+    counts = _in_range(StockMovement.objects.all(), start, end).aggregate(
+        **{movement_type: Count('id', filter=Q(movement_type=movement_type))
+           for movement_type in StockMovement.Type.values}
+    )
+    return [{'movement_type': movement_type, 'count': count} for movement_type, count in counts.items() if count]
+
+
+def movement_series(interval='day', start=None, end=None, warehouse=None, movement_type=None):
+    """Dövr, hərəkət tipi və anbar üzrə [{period, movement_type, warehouse, count, quantity}]."""
+    if interval not in SERIES_INTERVALS:
+        raise ValueError('Invalid interval')
+    trunc, default_days = SERIES_INTERVALS[interval]
+    if start is None:
+        start = _start_of((end or timezone.now()).date() - timedelta(days=default_days))
+
+    queryset = _in_range(StockMovement.objects.all(), start, end)
+    if warehouse:
+        queryset = queryset.filter(warehouse_id=warehouse)
+    if movement_type:
+        queryset = queryset.filter(movement_type=movement_type)
+
+    rows = queryset.annotate(
+        period=trunc('created_at', output_field=DateField()),
+    ).order_by().values('period', 'movement_type', 'warehouse').annotate(
+        count=Count('id'),
+        quantity=Sum(movement_delta()),
+    ).order_by('period', 'movement_type', 'warehouse')
+    return list(rows)
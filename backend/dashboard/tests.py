@@ -0,0 +1,226 @@
+from datetime import date, datetime, timedelta
+from io import StringIO
+from decimal import Decimal
+from django.core.management import call_command
+from django.db.models import Count, Q
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from tasks.models import Customer, Task, TaskType
+from users.models import Group, Region, User
+from warehouse.models import Product, StockMovement, Warehouse
+from warehouse.services import move_stock
+from .stats import movement_series, movement_stats, parse_range, task_stats
+
+
+def at(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class StatsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.region = Region.objects.create(name="Bakı")
+        cls.group = Group.objects.create(region=cls.region, name="Texniki")
+        cls.customer = Customer.objects.create(full_name="Müştəri", region=cls.region)
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.main = Warehouse.objects.create(name="Mərkəzi", region=cls.region)
+        cls.branch = Warehouse.objects.create(name="Filial", region=cls.region)
+        cls.cable = Product.objects.create(name="Kabel")
+
+    def setUp(self):
+        # Async view-lar DRF autentifikasiyasından keçmir - JWT başlığı lazımdır
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}")
+
+    def movement(self, created_at, delta, movement_type=StockMovement.Type.IN, warehouse=None):
+        movement = move_stock((warehouse or self.main).id, self.cable.id, Decimal(delta), movement_type=movement_type)
+        StockMovement.objects.filter(pk=movement.pk).update(created_at=created_at)
+        return movement
+
+
+class TaskStatsParityTest(StatsTestCase):
+    """İki sorğulu task_stats əvvəlki ayrı-ayrı Count sorğuları ilə eyni nəticə verməlidir."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        types = [TaskType.objects.create(name="Quraşdırma", color="#FF0000"), TaskType.objects.create(name="Təmir"), None]
+        statuses = Task.Status.values
+        users = [User.objects.create_user(f"usta{i}", password="x", first_name=f"Usta {i}", group=cls.group) for i in range(6)]
+        number = 0
+        # Hər istifadəçinin fərqli sayda tapşırığı var - top 5 birmənalıdır
+        for index, user in enumerate(users + [None]):
+            for _ in range(index * 2 + 1):
+                Task.objects.create(
+                    customer=cls.customer, group=cls.group, title=f"Tapşırıq {number}",
+                    assigned_to=user, task_type=types[number % 3], status=statuses[number % len(statuses)],
+                    is_active=number % 5 != 0,
+                )
+                number += 1
+
+    def legacy(self, tasks):
+        return {
+            'total': tasks.count(),
+            'active': tasks.filter(is_active=True).count(),
+            'by_status': list(tasks.values('status').annotate(count=Count('id'))),
+            'by_type': list(tasks.values('task_type__name', 'task_type__color').annotate(count=Count('id'))),
+            'by_user': list(tasks.exclude(assigned_to=None).values(
+                'assigned_to__username', 'assigned_to__first_name', 'assigned_to__last_name',
+                'assigned_to__group__name', 'assigned_to__avatar',
+            ).annotate(
+                total_tasks=Count('id'),
+                active_tasks=Count('id', filter=Q(status__in=['todo', 'in_progress', 'arrived'])),
+                done_tasks=Count('id', filter=Q(status='done')),
+            ).order_by('-total_tasks')[:5]),
+        }
+
+    def assertParity(self, stats, tasks):
+        def rows(items, key):
+            return sorted(items, key=lambda item: str(item[key]))
+
+        expected = self.legacy(tasks)
+        self.assertEqual((stats['total'], stats['active']), (expected['total'], expected['active']))
+        self.assertEqual(rows(stats['by_status'], 'status'), rows(expected['by_status'], 'status'))
+        self.assertEqual(rows(stats['by_type'], 'task_type__name'), rows(expected['by_type'], 'task_type__name'))
+        self.assertEqual(stats['by_user'], expected['by_user'])
+
+    def test_matches_per_status_counts(self):
+        with self.assertNumQueries(1):
+            stats = task_stats()
+        self.assertParity(stats, Task.objects.order_by())
+        self.assertEqual([user['assigned_to__username'] for user in stats['by_user']], [f"usta{i}" for i in (5, 4, 3, 2, 1)])
+
+    def test_matches_within_date_range(self):
+        tasks = list(Task.objects.order_by('id').values_list('id', flat=True))
+        Task.objects.filter(id__in=tasks[::2]).update(created_at=at(2026, 3, 15, 12))
+
+        start, end = parse_range({'date_from': '2026-03-01', 'date_to': '2026-03-31'})
+        self.assertParity(task_stats(start, end), Task.objects.order_by().filter(id__in=tasks[::2]))
+
+
+class MovementStatsTest(StatsTestCase):
+    def test_matches_per_type_counts(self):
+        now = timezone.now()
+        self.movement(now - timedelta(days=1), "10")
+        self.movement(now - timedelta(days=2), "-3", StockMovement.Type.OUT)
+        self.movement(now - timedelta(days=3), "-1", StockMovement.Type.OUT)
+        self.movement(now - timedelta(days=40), "5")
+
+        recent = StockMovement.objects.filter(created_at__gte=now - timedelta(days=30))
+        legacy = list(recent.values('movement_type').annotate(count=Count('id')).order_by('movement_type'))
+
+        with self.assertNumQueries(1):
+            stats = movement_stats()
+        self.assertEqual(sorted(stats, key=lambda row: row['movement_type']), legacy)
+        self.assertEqual(stats, [{'movement_type': 'in', 'count': 1}, {'movement_type': 'out', 'count': 2}])
+
+
+class ParseRangeTest(StatsTestCase):
+    def test_bounds_are_half_open(self):
+        self.assertEqual(
+            parse_range({'date_from': '2026-03-01', 'date_to': '2026-03-31'}),
+            (at(2026, 3, 1), at(2026, 4, 1)),
+        )
+        self.assertEqual(parse_range({'date_to': '2026-03-31'}), (None, at(2026, 4, 1)))
+        self.assertEqual(parse_range({}), (None, None))
+
+    def test_last_day_is_included(self):
+        self.movement(at(2026, 2, 28, 23, 59, 59), "1")
+        self.movement(at(2026, 3, 1), "1")
+        self.movement(at(2026, 3, 31, 23, 59, 59, 999999), "1")
+        self.movement(at(2026, 4, 1), "1")
+
+        stats = movement_stats(*parse_range({'date_from': '2026-03-01', 'date_to': '2026-03-31'}))
+        self.assertEqual(stats, [{'movement_type': 'in', 'count': 2}])
+
+    def test_legacy_key_only_for_default_window(self):
+        response = self.client.get('/api/dashboard/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()['warehouse']), {'movements_in_range', 'movements_last_30_days'})
+
+        response = self.client.get('/api/dashboard/stats/', {'date_from': '2026-03-01'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()['warehouse']), {'movements_in_range'})
+
+    def test_invalid_dates_are_rejected(self):
+        for params in ({'date_from': '01.03.2026'}, {'date_to': 'dünən'}):
+            with self.subTest(params=params), self.assertRaises(ValueError):
+                parse_range(params)
+
+        response = self.client.get('/api/dashboard/stats/', {'date_from': '2026-02-30x'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Invalid date_from'})
+
+
+class MovementSeriesTest(StatsTestCase):
+    def series(self, interval, **kwargs):
+        rows = movement_series(interval, start=at(2026, 9, 1), end=at(2026, 11, 1), **kwargs)
+        return [(row['period'], row['movement_type'], row['warehouse'], row['count'], row['quantity']) for row in rows]
+
+    def test_daily_buckets(self):
+        self.movement(at(2026, 9, 7, 0, 0), "5")
+        self.movement(at(2026, 9, 7, 23, 59), "-2", StockMovement.Type.OUT)
+        self.movement(at(2026, 9, 7, 12), "4")
+        self.movement(at(2026, 9, 8, 0, 0), "3", warehouse=self.branch)
+
+        self.assertEqual(self.series('day'), [
+            (date(2026, 9, 7), 'in', self.main.id, 2, Decimal("9")),
+            (date(2026, 9, 7), 'out', self.main.id, 1, Decimal("-2")),
+            (date(2026, 9, 8), 'in', self.branch.id, 1, Decimal("3")),
+        ])
+
+    def test_weekly_buckets_start_on_monday(self):
+        self.movement(at(2026, 9, 6, 23), "1")   # bazar
+        self.movement(at(2026, 9, 7, 1), "2")    # bazar ertəsi
+        self.movement(at(2026, 9, 13, 23), "3")  # bazar
+        self.movement(at(2026, 9, 14), "4")
+
+        self.assertEqual(self.series('week'), [
+            (date(2026, 8, 31), 'in', self.main.id, 1, Decimal("1")),
+            (date(2026, 9, 7), 'in', self.main.id, 2, Decimal("5")),
+            (date(2026, 9, 14), 'in', self.main.id, 1, Decimal("4")),
+        ])
+
+    def test_monthly_buckets(self):
+        self.movement(at(2026, 9, 1), "1")
+        self.movement(at(2026, 9, 30, 23, 59), "2")
+        self.movement(at(2026, 10, 1), "3")
+        self.movement(at(2026, 11, 1), "4")  # son sərhəd daxil deyil
+
+        self.assertEqual(self.series('month'), [
+            (date(2026, 9, 1), 'in', self.main.id, 2, Decimal("3")),
+            (date(2026, 10, 1), 'in', self.main.id, 1, Decimal("3")),
+        ])
+
+    def test_filters(self):
+        self.movement(at(2026, 9, 7), "5")
+        self.movement(at(2026, 9, 7), "-1", StockMovement.Type.OUT)
+        self.movement(at(2026, 9, 7), "2", warehouse=self.branch)
+
+        self.assertEqual(self.series('day', warehouse=self.branch.id), [
+            (date(2026, 9, 7), 'in', self.branch.id, 1, Decimal("2")),
+        ])
+        self.assertEqual(self.series('day', movement_type='out'), [
+            (date(2026, 9, 7), 'out', self.main.id, 1, Decimal("-1")),
+        ])
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            movement_series('year')
+
+        response = self.client.get('/api/dashboard/stats/movements/', {'interval': 'year'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Invalid interval'})
+
+    def test_quantity_counts_rows_without_delta(self):
+        self.movement(at(2026, 9, 7), "5")
+        self.movement(at(2026, 9, 7), "3")
+        StockMovement.objects.filter(quantity_old=5).update(delta=None)
+
+        # backfill_movement_delta işləməyib - miqdar qalıq fərqindən götürülür
+        self.assertEqual(self.series('day'), [(date(2026, 9, 7), 'in', self.main.id, 2, Decimal("8"))])
+
+        call_command('backfill_movement_delta', stdout=StringIO())
+        self.assertEqual(self.series('day'), [(date(2026, 9, 7), 'in', self.main.id, 2, Decimal("8"))])
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import EventViewSet, DashboardStatsView
+from .views import EventViewSet, DashboardStatsView, MovementSeriesView
 
 router = DefaultRouter()
 router.register(r'events', EventViewSet)
@@ -8,4 +8,5 @@ router.register(r'events', EventViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
+    path('stats/movements/', MovementSeriesView.as_view(), name='dashboard-movement-series'),
 ]
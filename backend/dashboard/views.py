@@ -1,12 +1,12 @@
-from rest_framework import viewsets, views, response, permissions
+from rest_framework import viewsets, permissions
+from django.db import transaction
 from django.utils import timezone
 from .models import Event
 from .serializers import EventSerializer
-from tasks.models import Task, TaskType
-from notifications.models import Notification
-from warehouse.models import StockMovement
-from django.db.models import Count, Q
-from datetime import timedelta
+from .jobs import notify_event_created
+from .stats import parse_range, task_stats, movement_stats, movement_series
+from core.async_views import AsyncReadView, gather_queries
+from django.core.exceptions import BadRequest
 
 class EventViewSet(viewsets.ModelViewSet):
     queryset = Event.objects.all().order_by('-date')
@@ -24,58 +24,50 @@ class EventViewSet(viewsets.ModelViewSet):
         return qs
 
     def perform_create(self, serializer):
-        event = serializer.save()
-        Notification.objects.create(
-            title=f"Yeni Tədbir: {event.title}",
-            message=event.description or "",
-            notification_type=Notification.NotificationType.GENERAL
-        )
+        with transaction.atomic():
+            event = serializer.save()
+            notify_event_created.delay(event_id=event.id)
 
-class DashboardStatsView(views.APIView):
-    permission_classes = [permissions.IsAuthenticated]
+class DashboardStatsView(AsyncReadView):
+    """Dashboard statistikası - Task və StockMovement aqreqatları (dashboard.stats) paralel icra olunur.
+
+    ?date_from=&date_to= (YYYY-MM-DD) verilərsə hər iki statistika həmin aralıqla məhdudlaşır,
+    hərəkətlər üçün aralıq verilməyibsə son 30 gün götürülür. Hərəkətlər warehouse.movements_in_range
+    açarındadır; movements_last_30_days yalnız aralıq verilmədikdə (köhnə klientlər üçün) qaytarılır.
+    """
+
+    async def get_data(self, request):
+        try:
+            start, end = parse_range(request.GET)
+        except ValueError as exc:
+            raise BadRequest(str(exc))
+
+        tasks, movements = await gather_queries(
+            lambda: task_stats(start, end),
+            lambda: movement_stats(start, end),
+        )
+        warehouse = {'movements_in_range': movements}
+        if start is None and end is None:
+            # Köhnə klientlər üçün; yalnız standart 30 günlük pəncərədə doğrudur
+            warehouse['movements_last_30_days'] = movements
+        return {'tasks': tasks, 'warehouse': warehouse}
 
-    def get(self, request):
-        # 1. Task Stats
-        total_tasks = Task.objects.count()
-        active_tasks = Task.objects.filter(is_active=True).count()
-        
-        # By Status
-        status_stats = Task.objects.values('status').annotate(count=Count('id'))
-        
-        # By Type
-        type_stats = Task.objects.values('task_type__name', 'task_type__color').annotate(count=Count('id'))
 
-        # By User (Top 5) - All Time
-        user_stats = Task.objects.exclude(assigned_to=None).values(
-            'assigned_to__username', 
-            'assigned_to__first_name', 
-            'assigned_to__last_name',
-            'assigned_to__group__name',
-            'assigned_to__avatar'
-        ).annotate(
-            total_tasks=Count('id'),
-            active_tasks=Count('id', filter=Q(status__in=['todo', 'in_progress', 'arrived'])),
-            done_tasks=Count('id', filter=Q(status='done'))
-        ).order_by('-total_tasks')[:5]
+class MovementSeriesView(AsyncReadView):
+    """Anbar hərəkətlərinin zaman sırası qrafiki üçün.
 
-        # 2. Warehouse Stats (Last 30 days)
-        last_30_days = timezone.now() - timedelta(days=30)
-        movements = StockMovement.objects.filter(created_at__gte=last_30_days)
-        
-        # Group by date and type
-        # SQLite datetime truncation can be tricky in Django, keeping it simple for now or using strict day grouping if DB supports
-        # For simple chart: Input vs Output counts
-        movement_stats = movements.values('movement_type').annotate(count=Count('id'))
+    ?interval=day|week|month&date_from=&date_to=&warehouse=&movement_type=
+    Aralıq verilməyibsə: gün üçün son 30 gün, həftə üçün 12 həftə, ay üçün 1 il.
+    """
 
-        return response.Response({
-            'tasks': {
-                'total': total_tasks,
-                'active': active_tasks,
-                'by_status': status_stats,
-                'by_type': type_stats,
-                'by_user': user_stats
-            },
-            'warehouse': {
-                'movements_last_30_days': movement_stats
-            }
-        })
+    async def get_data(self, request):
+        params = request.GET
+        interval = params.get('interval', 'day')
+        try:
+            start, end = parse_range(params)
+            series = (await gather_queries(lambda: movement_series(
+                interval, start, end, params.get('warehouse'), params.get('movement_type'),
+            )))[0]
+        except ValueError as exc:
+            raise BadRequest(str(exc))
+        return {'interval': interval, 'series': series}
@@ -0,0 +1,25 @@
+from django.db.models import Q
+from core.conditional import mark_changed
+from jobs.registry import job
+from .models import TaskDocument
+
+
+@job()
+def fill_document_action(document_id):
+    """Açıqlama verilməyibsə, stok hərəkəti və ya tapşırıqdan yaradılır."""
+    document = TaskDocument.objects.select_related('stock_movement__warehouse', 'task').filter(pk=document_id).first()
+    if document is None or document.action:
+        return
+
+    if document.stock_movement:
+        movement = document.stock_movement
+        action_text = f"{movement.warehouse.name} - {movement.get_movement_type_display()}"
+    elif document.task:
+        action_text = f"Tapşırıq: {document.task.title}"
+    else:
+        return
+
+    # Bu arada istifadəçi açıqlama yazıbsa üzərinə yazılmır
+    updated = TaskDocument.objects.filter(Q(action='') | Q(action__isnull=True), pk=document_id).update(action=action_text)
+    if updated:
+        mark_changed(TaskDocument)
@@ -4,9 +4,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
+from django.db import transaction
 from django.utils import timezone
 from ..models import TaskDocument
 from ..serializers import TaskDocumentSerializer
+from ..jobs import fill_document_action
 
 
 class DocumentPagination(PageNumberPagination):
@@ -81,17 +83,8 @@ class TaskDocumentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     def perform_create(self, serializer):
-        stock_movement = serializer.validated_data.get('stock_movement')
-        action_text = serializer.validated_data.get('action')
-        task = serializer.validated_data.get('task')
-        
-        # If stock_movement is provided and no action, generate action text
-        if stock_movement and not action_text:
-            action_text = f"{stock_movement.warehouse.name} - {stock_movement.get_movement_type_display()}"
-            serializer.save(action=action_text)
-        # If task is provided and no action, generate action text
-        elif task and not action_text:
-            action_text = f"Tapşırıq: {task.title}"
-            serializer.save(action=action_text)
-        else:
-            serializer.save()
+        # Açıqlama verilməyibsə stok hərəkəti/tapşırıqdan fon işində yaradılır
+        with transaction.atomic():
+            document = serializer.save()
+            if not document.action and (document.stock_movement_id or document.task_id):
+                fill_document_action.delay(document_id=document.id)
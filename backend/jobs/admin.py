@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'run_at', 'finished_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('created_at', 'finished_at', 'locked_by', 'locked_at', 'last_error')
@@ -0,0 +1,40 @@
+import signal
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from jobs.worker import purge_finished, requeue_stale, run_batch, worker_id
+
+
+class Command(BaseCommand):
+    help = 'Runs background jobs from the DB queue until stopped (SIGTERM/SIGINT finish the current batch).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=20, help='Jobs claimed per round.')
+        parser.add_argument('--sleep', type=float, default=0.5, help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit.')
+
+    def handle(self, *args, **options):
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        name = worker_id()
+        self.stdout.write(f'Job worker {name} started.')
+        last_maintenance = 0
+        while self.running:
+            # Kəsilmiş/köhnə bağlantı (CONN_MAX_AGE, DB restart) növbəti partiyadan əvvəl bağlanır
+            close_old_connections()
+            if time.monotonic() - last_maintenance > 60:
+                requeue_stale()
+                purge_finished()
+                last_maintenance = time.monotonic()
+
+            processed = run_batch(options['batch'], name)
+            if not processed:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f'Job worker {name} stopped.'))
+
+    def stop(self, signum, frame):
+        self.running = False
@@ -0,0 +1,37 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """Fon işi: jobs.registry-də qeydiyyatdan keçmiş funksiyanın adı və JSON arqumentləri."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Növbədə"
+        RUNNING = "running", "İcra olunur"
+        DONE = "done", "Tamamlandı"
+        FAILED = "failed", "Uğursuz"
+
+    name = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_at", "id"]
+        indexes = [
+            models.Index(fields=["status", "run_at"]),
+            models.Index(fields=["status", "locked_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,63 @@
+"""
+Fon işlərinin qeydiyyatı və növbəyə yazılması.
+
+    @job(max_attempts=3)
+    def deduct_task_products(task_id, user_id): ...
+
+    deduct_task_products.delay(task_id=task.id, user_id=user.id)
+
+delay() Job sətrini çağıranın tranzaksiyasının içində yazır: iş biznes dəyişikliyi ilə birlikdə
+commit olunur və ya birlikdə geri qaytarılır, COMMIT ilə növbəyə yazılış arasında itə bilməz.
+Worker hələ commit olunmamış sətri görmür. Arqumentlər JSON-a çevrilə bilən olmalıdır.
+JOBS_ALWAYS_EAGER=True olduqda iş commit-dən sonra (on_commit) elə həmin prosesdə icra olunur
+(worker-siz mühit).
+"""
+import logging
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+class JobFunction:
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.__doc__ = func.__doc__
+
+    def __call__(self, **kwargs):
+        return self.func(**kwargs)
+
+    def delay(self, run_at=None, **kwargs):
+        return enqueue(self.name, kwargs, run_at=run_at, max_attempts=self.max_attempts)
+
+
+def job(name=None, max_attempts=5):
+    def decorator(func):
+        job_name = name or f'{func.__module__}.{func.__name__}'
+        registry[job_name] = JobFunction(func, job_name, max_attempts)
+        return registry[job_name]
+    return decorator
+
+
+def enqueue(name, payload, run_at=None, max_attempts=5):
+    if name not in registry:
+        raise KeyError(f'Unknown job: {name}')
+
+    if getattr(settings, 'JOBS_ALWAYS_EAGER', False):
+        def run():
+            try:
+                registry[name](**payload)
+            except Exception:
+                logger.exception('Eager job %s failed', name)
+        transaction.on_commit(run)
+        return
+
+    from .models import Job
+    fields = {'name': name, 'payload': payload, 'max_attempts': max_attempts}
+    if run_at is not None:
+        fields['run_at'] = run_at
+    return Job.objects.create(**fields)
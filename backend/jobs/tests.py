@@ -0,0 +1,175 @@
+from datetime import timedelta
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from .models import Job
+from .registry import job
+from .worker import LOCK_TIMEOUT, RETRY_DELAY, claim, renew_lock, requeue_stale, run_batch
+
+calls = []
+
+
+@job(name='jobs.tests.record')
+def record(value):
+    calls.append(value)
+
+
+@job(name='jobs.tests.fail', max_attempts=3)
+def fail():
+    raise RuntimeError('boom')
+
+
+@job(name='jobs.tests.age_others')
+def age_others(stale_at):
+    """Uzun işi təqlid edir: partiyadakı digər işlərin kilidi köhnəlmiş kimi görünür."""
+    Job.objects.exclude(name='jobs.tests.age_others').filter(status=Job.Status.RUNNING).update(locked_at=stale_at)
+    calls.append(requeue_stale())
+
+
+@job(name='jobs.tests.steal_others')
+def steal_others():
+    """requeue_stale + başqa worker-in götürməsini təqlid edir."""
+    Job.objects.exclude(name='jobs.tests.steal_others').update(locked_by='other-worker')
+
+
+class JobTestCase(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def stale(self):
+        return timezone.now() - timedelta(seconds=LOCK_TIMEOUT + 60)
+
+
+class EnqueueTest(JobTestCase):
+    def test_job_is_written_inside_callers_transaction(self):
+        with transaction.atomic():
+            record.delay(value=1)
+            # on_commit gözlənilmir: iş biznes dəyişikliyi ilə eyni tranzaksiyadadır
+            self.assertEqual(Job.objects.filter(name='jobs.tests.record').count(), 1)
+
+    def test_rollback_discards_job(self):
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                record.delay(value=1)
+                raise ValueError
+        self.assertFalse(Job.objects.exists())
+
+    def test_unknown_job_is_rejected(self):
+        from .registry import enqueue
+        with self.assertRaises(KeyError):
+            enqueue('jobs.tests.missing', {})
+
+    @override_settings(JOBS_ALWAYS_EAGER=True)
+    def test_eager_mode_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record.delay(value=7)
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [7])
+        self.assertFalse(Job.objects.exists())
+
+
+class WorkerTest(JobTestCase):
+    def test_successful_job_is_done(self):
+        record.delay(value=1)
+
+        self.assertEqual(run_batch(locked_by='w1'), 1)
+
+        job_row = Job.objects.get()
+        self.assertEqual(calls, [1])
+        self.assertEqual((job_row.status, job_row.attempts), (Job.Status.DONE, 1))
+        self.assertIsNotNone(job_row.finished_at)
+
+    def test_failure_is_retried_with_exponential_backoff(self):
+        fail.delay()
+
+        for attempt in (1, 2):
+            started = timezone.now()
+            run_batch(locked_by='w1')
+            job_row = Job.objects.get()
+            self.assertEqual((job_row.status, job_row.attempts), (Job.Status.QUEUED, attempt))
+            self.assertIn('RuntimeError: boom', job_row.last_error)
+            delay = job_row.run_at - started
+            expected = timedelta(seconds=RETRY_DELAY * 2 ** (attempt - 1))
+            self.assertGreaterEqual(delay, expected)
+            self.assertLess(delay, expected + timedelta(seconds=5))
+
+            # Gecikmə bitməyib - worker götürmür
+            self.assertEqual(run_batch(locked_by='w1'), 0)
+            Job.objects.update(run_at=timezone.now())
+
+    def test_job_fails_after_max_attempts(self):
+        fail.delay()
+
+        for _ in range(3):
+            run_batch(locked_by='w1')
+            Job.objects.filter(status=Job.Status.QUEUED).update(run_at=timezone.now())
+
+        job_row = Job.objects.get()
+        self.assertEqual((job_row.status, job_row.attempts), (Job.Status.FAILED, 3))
+        self.assertIsNotNone(job_row.finished_at)
+        self.assertEqual(run_batch(locked_by='w1'), 0)
+
+    def test_requeue_stale_returns_abandoned_jobs(self):
+        record.delay(value=1)
+        record.delay(value=2)
+        claim(10, 'dead-worker')
+        Job.objects.filter(payload__value=1).update(locked_at=self.stale())
+
+        self.assertEqual(requeue_stale(), 1)
+        self.assertEqual(
+            dict(Job.objects.values_list('payload__value', 'status')),
+            {1: Job.Status.QUEUED, 2: Job.Status.RUNNING},
+        )
+        run_batch(locked_by='w2')
+        self.assertEqual(calls, [1])
+
+    def test_job_that_keeps_killing_its_worker_fails(self):
+        fail.delay()
+
+        # Hər dəfə worker iş zamanı ölür: kilid köhnəlir, iş yenidən götürülür
+        for attempt in (1, 2):
+            claim(1, f'w{attempt}')
+            Job.objects.update(locked_at=self.stale())
+            self.assertEqual(requeue_stale(), 1)
+            self.assertEqual(Job.objects.get().attempts, attempt)
+
+        claim(1, 'w3')
+        Job.objects.update(locked_at=self.stale())
+        self.assertEqual(requeue_stale(), 0)
+
+        job_row = Job.objects.get()
+        self.assertEqual((job_row.status, job_row.attempts), (Job.Status.FAILED, 3))
+        self.assertIn('Worker lost', job_row.last_error)
+        self.assertIsNotNone(job_row.finished_at)
+        self.assertEqual(claim(1, 'w4'), [])
+
+    def test_job_requeued_during_batch_runs_once(self):
+        age_others.delay(stale_at=self.stale().isoformat())
+        record.delay(value='x')
+
+        run_batch(locked_by='w1')
+
+        # Birinci iş uzun çəkdi, ikinci iş vaxtı keçmiş sayılıb növbəyə qaytarıldı - w1 onu icra etmir
+        self.assertEqual(calls, [1])
+        self.assertEqual(Job.objects.get(name='jobs.tests.record').status, Job.Status.QUEUED)
+
+        run_batch(locked_by='w2')
+        self.assertEqual(calls, [1, 'x'])
+
+    def test_job_taken_over_by_another_worker_is_skipped(self):
+        steal_others.delay()
+        record.delay(value=1)
+
+        self.assertEqual(run_batch(locked_by='w1'), 2)
+
+        self.assertEqual(calls, [])
+        self.assertEqual(Job.objects.get(name='jobs.tests.record').locked_by, 'other-worker')
+
+    def test_renew_lock_refreshes_locked_at(self):
+        record.delay(value=1)
+        claim(1, 'w1')
+        Job.objects.update(locked_at=self.stale())
+
+        self.assertTrue(renew_lock(Job.objects.get(), 'w1'))
+        self.assertEqual(requeue_stale(), 0)
+        self.assertFalse(renew_lock(Job.objects.get(), 'w2'))
@@ -0,0 +1,114 @@
+"""
+Növbədən iş götürüb icra edən worker (manage.py run_jobs).
+
+- İşlər partiya ilə SELECT ... FOR UPDATE SKIP LOCKED altında götürülür: bir neçə worker prosesi
+  eyni işi iki dəfə götürmür (SQLite-da FOR UPDATE yoxdur, orada bir worker işlədilir).
+- Uğursuz iş eksponensial gecikmə ilə (JOBS_RETRY_DELAY * 2^(cəhd-1)) yenidən növbəyə düşür,
+  max_attempts bitəndə FAILED olur.
+- JOBS_LOCK_TIMEOUT saniyədən çox RUNNING qalan işlər (worker düşüb) yenidən növbəyə qaytarılır,
+  cəhdləri bitmiş olanlar isə FAILED olur.
+  Partiyadakı hər işin locked_at-ı icradan dərhal əvvəl yenilənir, ona görə partiyanın sonunda
+  gözləyən iş vaxtı keçmiş sayılıb ikinci dəfə icra olunmur; iş artıq başqa worker-ə keçibsə
+  buraxılır.
+- Tamamlanmış işlər JOBS_RETENTION saniyədən sonra silinir.
+"""
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Job
+from .registry import registry
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = getattr(settings, 'JOBS_RETRY_DELAY', 5)
+LOCK_TIMEOUT = getattr(settings, 'JOBS_LOCK_TIMEOUT', 300)
+RETENTION = getattr(settings, 'JOBS_RETENTION', 24 * 3600)
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim(batch_size, locked_by):
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Job.objects.filter(status=Job.Status.QUEUED, run_at__lte=now)
+            .order_by('run_at', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if ids:
+            Job.objects.filter(id__in=ids).update(
+                status=Job.Status.RUNNING, locked_by=locked_by, locked_at=now, attempts=F('attempts') + 1,
+            )
+    return list(Job.objects.filter(id__in=ids).order_by('run_at', 'id'))
+
+
+def execute(job):
+    handler = registry.get(job.name)
+    try:
+        if handler is None:
+            raise LookupError(f'Unknown job: {job.name}')
+        handler(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('Job %s #%s failed (attempt %s/%s)', job.name, job.pk, job.attempts, job.max_attempts)
+        if job.attempts < job.max_attempts:
+            delay = timedelta(seconds=RETRY_DELAY * 2 ** (job.attempts - 1))
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.QUEUED, run_at=timezone.now() + delay, last_error=error, locked_at=None,
+            )
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.FAILED, finished_at=timezone.now(), last_error=error,
+            )
+        return False
+
+    Job.objects.filter(pk=job.pk).update(status=Job.Status.DONE, finished_at=timezone.now())
+    return True
+
+
+def requeue_stale():
+    """
+    Worker-i düşmüş (OOM, SIGKILL) işləri növbəyə qaytarır. Cəhd claim zamanı artıq sayılıb:
+    max_attempts-ə çatmış iş yenidən götürülmür, FAILED olur - worker-i öldürən iş sonsuz təkrarlanmır.
+    Növbəyə qaytarılan işlərin sayını qaytarır.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=now - timedelta(seconds=LOCK_TIMEOUT))
+    with transaction.atomic():
+        stale.filter(attempts__gte=F('max_attempts')).update(
+            status=Job.Status.FAILED, finished_at=now, locked_at=None,
+            last_error='Worker lost: lock expired after the last attempt',
+        )
+        return stale.update(status=Job.Status.QUEUED, locked_at=None)
+
+
+def purge_finished():
+    cutoff = timezone.now() - timedelta(seconds=RETENTION)
+    deleted, _ = Job.objects.filter(status=Job.Status.DONE, finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def renew_lock(job, locked_by):
+    """İşin kilidini yeniləyir; iş bu worker-də deyilsə (requeue_stale qaytarıb) False qaytarır."""
+    return bool(Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING, locked_by=locked_by).update(
+        locked_at=timezone.now(),
+    ))
+
+
+def run_batch(batch_size=20, locked_by=None):
+    """Bir partiyanı icra edir, götürülmüş işlərin sayını qaytarır."""
+    locked_by = locked_by or worker_id()
+    jobs = claim(batch_size, locked_by)
+    for job in jobs:
+        if renew_lock(job, locked_by):
+            execute(job)
+    return len(jobs)
@@ -1,7 +1,8 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
+from core.instrumentation import InstrumentedConsumerMixin
 
-class NotificationConsumer(AsyncWebsocketConsumer):
+class NotificationConsumer(InstrumentedConsumerMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.user = self.scope['user']
         if self.user.is_anonymous:
@@ -9,6 +9,7 @@ class Notification(models.Model):
         TASK_CREATED = 'task_created', 'Yeni Task'
         TASK_ASSIGNED = 'task_assigned', 'Task Təyin Edildi'
         TASK_COMPLETED = 'task_completed', 'Task Tamamlandı'
+        LOW_STOCK = 'low_stock', 'Az Qalıq'
         GENERAL = 'general', 'Ümumi'
     
     title = models.CharField(max_length=255)
@@ -36,6 +37,7 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['created_at', 'id'])]
     
     def __str__(self):
         return f"{self.title} ({self.notification_type})"
@@ -1,42 +1,35 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from outbox.services import publish_many
 from .models import Notification
 
 @receiver(post_save, sender=Notification)
 def notification_post_save(sender, instance, created, **kwargs):
     """
-    Signal to send websocket notification when a Notification object is created.
+    Yeni bildiriş outbox-a eyni tranzaksiyada yazılır, websocket-ə relay_outbox göndərir.
     """
-    if created:
-        channel_layer = get_channel_layer()
-        data = {
+    if not created:
+        return
+
+    event = {
+        'type': 'notification_message',
+        'notification': {
             'id': instance.id,
             'title': instance.title,
             'message': instance.message,
             'notification_type': instance.notification_type,
             'created_at': instance.created_at.isoformat(),
-            'related_task': instance.related_task.id if instance.related_task else None
-        }
+            'related_task': instance.related_task_id,
+        },
+    }
+
+    groups = []
+    if instance.notification_type in (Notification.NotificationType.GENERAL, Notification.NotificationType.LOW_STOCK):
+        groups.append('general_notifications')
 
-        # Structure the event message
-        event = {
-            'type': 'notification_message',
-            'notification': data
-        }
+    # Tapşırıq bildirişi icraçıya da gedir
+    if instance.related_task_id and instance.related_task.assigned_to_id:
+        groups.append(f'user_notifications_{instance.related_task.assigned_to_id}')
 
-        # Send to general group if applicable
-        if instance.notification_type == Notification.NotificationType.GENERAL:
-            async_to_sync(channel_layer.group_send)(
-                'general_notifications',
-                event
-            )
-        
-        # If it's a task related notification, send to the assignee
-        if instance.related_task and instance.related_task.assigned_to:
-            user_id = instance.related_task.assigned_to.id
-            async_to_sync(channel_layer.group_send)(
-                f'user_notifications_{user_id}',
-                event
-            )
+    if groups:
+        publish_many(groups, event)
@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import NotificationViewSet
+from .views import NotificationViewSet, UnreadCountView
 
 router = DefaultRouter()
 router.register(r'', NotificationViewSet, basename='notification')
 
 urlpatterns = [
+    path('unread_count/', UnreadCountView.as_view(), name='notification-unread-count-async'),
     path('', include(router.urls)),
 ]
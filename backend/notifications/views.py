@@ -4,11 +4,16 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Notification
 from .serializers import NotificationSerializer
+from core.async_views import AsyncReadView
+from core.conditional import ConditionalGetMixin
 
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for notifications - read only with mark-read action."""
     
+    # read_by ara cədvəli oxunmuş bildirişləri siyahıdan çıxarır
+    conditional_models = ('notifications.Notification', 'notifications.Notification_read_by')
+    conditional_actions = ('list', 'retrieve', 'unread_count')
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
     
@@ -41,3 +46,12 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         """Get count of unread notifications."""
         count = Notification.objects.exclude(read_by=request.user).count()
         return Response({'unread_count': count})
+
+
+class UnreadCountView(AsyncReadView):
+    """unread_count-un async variantı - mobil klient bunu tez-tez sorğulayır."""
+    conditional_models = NotificationViewSet.conditional_models
+
+    async def get_data(self, request):
+        count = await Notification.objects.exclude(read_by=request.user).acount()
+        return {'unread_count': count}
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import OutboxEvent
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'group', 'created_at')
+    list_filter = ('group',)
@@ -0,0 +1,31 @@
+import signal
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from outbox.services import relay_batch
+
+
+class Command(BaseCommand):
+    help = 'Publishes OutboxEvent rows to the channel layer in id order until stopped.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=100, help='Events published per round.')
+        parser.add_argument('--sleep', type=float, default=0.2, help='Seconds to wait when the outbox is empty.')
+        parser.add_argument('--once', action='store_true', help='Drain the outbox once and exit.')
+
+    def handle(self, *args, **options):
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.stdout.write('Outbox relay started.')
+        while self.running:
+            close_old_connections()
+            if not relay_batch(options['batch']):
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS('Outbox relay stopped.'))
+
+    def stop(self, signum, frame):
+        self.running = False
@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """
+    Channel layer-ə göndəriləcək hadisə. Dəyişikliklə eyni tranzaksiyada yazılır,
+    relay_outbox id sırası ilə göndərib silir.
+    """
+    group = models.CharField(max_length=150)
+    message = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.group} #{self.pk}"
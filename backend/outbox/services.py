@@ -0,0 +1,40 @@
+"""
+Transactional outbox: real-time hadisələr channel layer-ə birbaşa yox, OutboxEvent cədvəli
+vasitəsilə göndərilir.
+
+- publish() sətri cari tranzaksiyada yazır: rollback olsa hadisə də yoxdur, commit olunmamış
+  sətrə aid hadisə klientə çatmır, Redis yavaşlığı isə sorğunun tranzaksiyasını saxlamır.
+- relay_batch() bir partiyanı id sırası ilə kilidləyir, hamısını bir event loop keçidində
+  göndərir və silir. Göndərmə yarıda qırılsa tranzaksiya geri qayıdır və partiya yenidən
+  göndərilir (at-least-once) - klientlər id ilə təkrarı ayırd edir.
+- Sıra saxlanması üçün relay bir prosesdə işləyir; ikinci relay kilid açılana qədər gözləyir.
+"""
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from .models import OutboxEvent
+
+
+def publish(group, message):
+    OutboxEvent.objects.create(group=group, message=message)
+
+
+def publish_many(groups, message):
+    """Eyni hadisəni bir neçə qrupa bir INSERT ilə yazır."""
+    OutboxEvent.objects.bulk_create(OutboxEvent(group=group, message=message) for group in groups)
+
+
+async def send_events(channel_layer, events):
+    for event in events:
+        await channel_layer.group_send(event.group, event.message)
+
+
+def relay_batch(batch_size=100):
+    """Bir partiyanı göndərir, göndərilən hadisələrin sayını qaytarır."""
+    with transaction.atomic():
+        events = list(OutboxEvent.objects.select_for_update().order_by('id')[:batch_size])
+        if not events:
+            return 0
+        async_to_sync(send_events)(get_channel_layer(), events)
+        OutboxEvent.objects.filter(id__in=[event.id for event in events]).delete()
+    return len(events)
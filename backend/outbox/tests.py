@@ -0,0 +1,73 @@
+import asyncio
+from unittest import mock
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.test import TestCase
+from .models import OutboxEvent
+from .services import publish, publish_many, relay_batch
+
+
+class RelayBatchTest(TestCase):
+    def setUp(self):
+        self.layer = get_channel_layer()
+        async_to_sync(self.layer.flush)()
+        self.channel = async_to_sync(self.layer.new_channel)()
+        for group in ('tasks', 'chat_1'):
+            async_to_sync(self.layer.group_add)(group, self.channel)
+
+    def received(self):
+        async def drain():
+            messages = []
+            while True:
+                try:
+                    messages.append(await asyncio.wait_for(self.layer.receive(self.channel), 0.05))
+                except asyncio.TimeoutError:
+                    return messages
+        return async_to_sync(drain)()
+
+    def test_events_are_sent_in_order_and_deleted(self):
+        publish('tasks', {'type': 'task.created', 'id': 1})
+        publish_many(['tasks', 'chat_1'], {'type': 'task.updated', 'id': 1})
+
+        self.assertEqual(relay_batch(), 3)
+
+        self.assertFalse(OutboxEvent.objects.exists())
+        self.assertEqual(self.received(), [
+            {'type': 'task.created', 'id': 1},
+            {'type': 'task.updated', 'id': 1},
+            {'type': 'task.updated', 'id': 1},
+        ])
+        self.assertEqual(relay_batch(), 0)
+
+    def test_batch_size_limits_each_pass(self):
+        for i in range(3):
+            publish('tasks', {'type': 'task.created', 'id': i})
+
+        self.assertEqual(relay_batch(batch_size=2), 2)
+        self.assertEqual(list(OutboxEvent.objects.values_list('message__id', flat=True)), [2])
+        self.assertEqual(relay_batch(batch_size=2), 1)
+        self.assertEqual([message['id'] for message in self.received()], [0, 1, 2])
+
+    def test_failed_send_keeps_rows(self):
+        publish('tasks', {'type': 'task.created', 'id': 1})
+        publish('tasks', {'type': 'task.created', 'id': 2})
+        ids = list(OutboxEvent.objects.values_list('id', flat=True))
+
+        send = mock.AsyncMock(side_effect=[None, OSError('redis down')])
+        with mock.patch.object(self.layer, 'group_send', send), self.assertRaises(OSError):
+            relay_batch()
+
+        # Partiya bütövlükdə qalır və növbəti keçiddə yenidən göndərilir (at-least-once)
+        self.assertEqual(list(OutboxEvent.objects.values_list('id', flat=True)), ids)
+        self.assertEqual(relay_batch(), 2)
+        self.assertEqual([message['id'] for message in self.received()], [1, 2])
+
+    def test_rolled_back_transaction_publishes_nothing(self):
+        with self.assertRaises(ValueError), transaction.atomic():
+            publish('tasks', {'type': 'task.created', 'id': 1})
+            publish_many(['tasks', 'chat_1'], {'type': 'task.updated', 'id': 1})
+            raise ValueError
+
+        self.assertEqual(relay_batch(), 0)
+        self.assertEqual(self.received(), [])
@@ -0,0 +1,52 @@
+from rest_framework import serializers
+from tasks.models import Task, Customer
+from warehouse.models import Product
+from notifications.models import Notification
+from chat.models import Message
+
+
+class TaskSyncSerializer(serializers.ModelSerializer):
+    """Mobil sinxronizasiya üçün yığcam tapşırıq - əlaqələr yalnız id ilə."""
+
+    class Meta:
+        model = Task
+        fields = [
+            'id', 'title', 'note', 'status', 'customer', 'task_type', 'assigned_to',
+            'group', 'services', 'is_active', 'created_at', 'updated_at'
+        ]
+
+
+class CustomerSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Customer
+        fields = [
+            'id', 'full_name', 'register_number', 'phone_number', 'passport_image',
+            'region', 'address', 'address_coordinates', 'created_at', 'updated_at'
+        ]
+
+
+class ProductSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = [
+            'id', 'name', 'description', 'unit', 'image', 'brand', 'model', 'serial_number',
+            'price', 'min_quantity', 'max_quantity', 'total_stock', 'updated_at'
+        ]
+
+
+class NotificationSyncSerializer(serializers.ModelSerializer):
+    is_read = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Notification
+        fields = ['id', 'title', 'message', 'notification_type', 'related_task', 'created_at', 'is_read']
+
+    def get_is_read(self, obj):
+        # Oxunmuş bildirişlərin id-ləri view tərəfindən bir sorğu ilə hesablanır
+        return obj.pk in self.context['read_notification_ids']
+
+
+class MessageSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Message
+        fields = ['id', 'group', 'sender', 'content', 'created_at', 'updated_at']
@@ -0,0 +1,66 @@
+"""
+Delta sinxronizasiya: hər entity üçün (cursor_sahəsi, id) keyset-i üzrə dəyişən sətirlər.
+
+Token - sonuncu göndərilmiş (vaxt, id) cütüdür. Son səhifədə token server vaxtından
+SYNC_OVERLAP qədər geriyə çəkilir: auto_now dəyəri commit-dən əvvəl yazıldığı üçün gec commit
+olunan sətirlər itməsin. Bu pəncərədəki sətirlər təkrar gələ bilər - klient id ilə upsert edir.
+"""
+import base64
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+SYNC_OVERLAP = timedelta(seconds=getattr(settings, 'SYNC_OVERLAP_SECONDS', 10))
+
+
+def encode_token(moment, pk):
+    raw = f'{moment.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_token(token):
+    """(vaxt, id) qaytarır; token yanlışdırsa ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        moment, pk = raw.rsplit('|', 1)
+        moment = parse_datetime(moment)
+        pk = int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('invalid token')
+    if moment is None:
+        raise ValueError('invalid token')
+    return moment, pk
+
+
+def sync_changes(queryset, cursor_field, token=None, limit=200, soft_delete=True):
+    """
+    Tokendən sonrakı sətirlər (cursor_field, id) sırası ilə, ən çox limit qədər.
+    soft_delete=True olduqda is_active=False sətirlər yalnız id kimi 'deleted'-də qaytarılır;
+    ilk sinxronizasiyada (token yoxdur) onlar ümumiyyətlə göndərilmir.
+    """
+    now = timezone.now()
+    if token:
+        moment, pk = decode_token(token)
+        queryset = queryset.filter(Q(**{f'{cursor_field}__gt': moment}) | Q(**{cursor_field: moment, 'pk__gt': pk}))
+    elif soft_delete:
+        queryset = queryset.filter(is_active=True)
+
+    rows = list(queryset.order_by(cursor_field, 'pk')[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if has_more:
+        last = rows[-1]
+        next_token = encode_token(getattr(last, cursor_field), last.pk)
+    else:
+        next_token = encode_token(now - SYNC_OVERLAP, 0)
+
+    if soft_delete:
+        updated = [row for row in rows if row.is_active]
+        deleted = [row.pk for row in rows if not row.is_active]
+    else:
+        updated, deleted = rows, []
+
+    return {'updated': updated, 'deleted': deleted, 'token': next_token, 'has_more': has_more}
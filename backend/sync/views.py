@@ -0,0 +1,95 @@
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from tasks.models import Task, Customer
+from warehouse.models import Product
+from notifications.models import Notification
+from chat.models import Message
+from .serializers import (
+    TaskSyncSerializer,
+    CustomerSyncSerializer,
+    ProductSyncSerializer,
+    NotificationSyncSerializer,
+    MessageSyncSerializer,
+)
+from .services import sync_changes
+
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 1000
+
+
+def task_queryset(user):
+    return Task.objects.prefetch_related('services')
+
+
+def customer_queryset(user):
+    return Customer.objects.all()
+
+
+def product_queryset(user):
+    return Product.objects.all()
+
+
+def notification_queryset(user):
+    return Notification.objects.all()
+
+
+def message_queryset(user):
+    return Message.objects.filter(group__memberships__user=user)
+
+
+# entity -> (queryset, serializer, cursor sahəsi, soft delete)
+ENTITIES = {
+    'tasks': (task_queryset, TaskSyncSerializer, 'updated_at', True),
+    'customers': (customer_queryset, CustomerSyncSerializer, 'updated_at', True),
+    'products': (product_queryset, ProductSyncSerializer, 'updated_at', True),
+    'notifications': (notification_queryset, NotificationSyncSerializer, 'created_at', False),
+    'messages': (message_queryset, MessageSyncSerializer, 'updated_at', False),
+}
+
+
+class SyncView(APIView):
+    """
+    Mobil klient üçün delta sinxronizasiya.
+
+    GET /api/sync/?entities=tasks,customers&tasks=<token>&customers=<token>&limit=200
+    Hər entity üçün: updated (dəyişən/yeni sətirlər), deleted (soft delete olunmuş id-lər),
+    token (növbəti sorğu üçün), has_more (limitə çatıldısa dərhal təkrar sorğu göndərilməlidir).
+    Token verilməyibsə, entity tam yüklənir.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        names = [name for name in params.get('entities', ','.join(ENTITIES)).split(',') if name]
+        unknown = [name for name in names if name not in ENTITIES]
+        if unknown:
+            raise ValidationError({'entities': f"Unknown entities: {', '.join(unknown)}"})
+
+        try:
+            limit = min(max(int(params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+
+        context = {'request': request}
+        if 'notifications' in names:
+            context['read_notification_ids'] = set(
+                Notification.read_by.through.objects.filter(user=request.user).values_list('notification_id', flat=True)
+            )
+
+        data = {'server_time': timezone.now()}
+        for name in names:
+            get_queryset, serializer_class, cursor_field, soft_delete = ENTITIES[name]
+            try:
+                changes = sync_changes(
+                    get_queryset(request.user), cursor_field,
+                    token=params.get(name), limit=limit, soft_delete=soft_delete,
+                )
+            except ValueError:
+                raise ValidationError({name: 'Invalid sync token.'})
+            changes['updated'] = serializer_class(changes['updated'], many=True, context=context).data
+            data[name] = changes
+
+        return Response(data)
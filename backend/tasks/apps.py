@@ -5,5 +5,8 @@ class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
 
+    def ready(self):
+        import tasks.signals
+
 
 
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from core.conditional import mark_changed
+from jobs.registry import job
+from warehouse.models import StockMovement
+from warehouse.services import move_stock
+from .models import Task, TaskProduct
+
+
+@job()
+def notify_task_created(task_id):
+    from notifications.services import send_notification
+
+    task = Task.objects.select_related('customer').filter(pk=task_id).first()
+    if task is None:
+        return
+    send_notification(
+        title=f"Yeni Task: {task.title}",
+        message=f"Müştəri: {task.customer.full_name if task.customer else 'N/A'}",
+        notification_type='task_created',
+        related_task=task
+    )
+
+
+@job()
+def deduct_task_products(task_id, user_id):
+    """
+    Tamamlanmış tapşırığın məhsullarını anbardan çıxarır.
+    Təkrar icra təhlükəsizdir: hər məhsul atomik is_deducted işarəsi ilə bir dəfə çıxılır.
+    """
+    user = get_user_model().objects.filter(pk=user_id).first()
+    task_products = TaskProduct.objects.filter(task_id=task_id, is_deducted=False)
+
+    with transaction.atomic():
+        for tp in task_products:
+            # Eyni məhsulun iki paralel icra ilə iki dəfə çıxılmaması üçün atomik işarələmə
+            if not TaskProduct.objects.filter(pk=tp.pk, is_deducted=False).update(is_deducted=True):
+                continue
+            mark_changed(TaskProduct)
+
+            # Stock movement yarat (qalıq atomik dəyişir)
+            move_stock(
+                tp.warehouse_id, tp.product_id, -tp.quantity,
+                movement_type=StockMovement.Type.OUT,
+                reason=f"Tapşırıq #{task_id} icrası zamanı istifadə olunmuşdur",
+                created_by=user,
+                reference_no=f"TASK-{task_id}"
+            )
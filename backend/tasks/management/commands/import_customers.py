@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.imports import ImportFileError, iter_table_rows
+from tasks.services import import_customers
+from tasks.services.customer_import import IMPORT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Imports customers from a CSV or XLSX file in validated batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file with full_name, register_number, phone_number, region, address, lat, lng columns.')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, do not write.')
+
+    def handle(self, *args, **options):
+        with open(options['path'], 'rb') as fileobj:
+            try:
+                report = import_customers(
+                    iter_table_rows(fileobj, options['path']),
+                    batch_size=options['batch_size'],
+                    dry_run=options['dry_run'],
+                )
+            except ImportFileError as exc:
+                raise CommandError(f'{exc}; nothing was imported.')
+
+        for error in report['errors']:
+            self.stdout.write(self.style.WARNING(f"Row {error['row']}: {error['errors']}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully imported {report['created']} customers "
+            f"({report['invalid']} invalid, {report['duplicates']} duplicates)."
+        ))
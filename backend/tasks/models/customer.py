@@ -15,9 +15,11 @@ class Customer(models.Model):
     
     is_active = models.BooleanField(default=True)  # Soft delete
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['updated_at', 'id'])]
     
     def __str__(self):
         return self.full_name
@@ -44,6 +44,7 @@ class Task(models.Model):
             models.Index(fields=['customer']),
             models.Index(fields=['assigned_to']),
             models.Index(fields=['group']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -70,12 +71,28 @@ class TaskService(models.Model):
 
 def task_service_upload_path(instance, filename):
     """Generate upload path for task service files."""
+    from ..schema import get_column
     ts = instance.task_service
-    return f"tasks/{ts.task_id}/services/{ts.service_id}/{instance.column.key}/{filename}"
+    column = get_column(instance.column_id)
+    key = column['key'] if column else instance.column.key
+    return f"tasks/{ts.task_id}/services/{ts.service_id}/{key}/{filename}"
 
 
 class TaskServiceValue(models.Model):
     """Dynamic column values for TaskService."""
+
+    # Column.field_type -> dəyərin saxlandığı sütun
+    VALUE_FIELDS = {
+        'string': 'charfield_value',
+        'text': 'text_value',
+        'image': 'image_value',
+        'file': 'file_value',
+        'date': 'date_value',
+        'datetime': 'datetime_value',
+        'integer': 'number_value',
+        'decimal': 'decimal_value',
+        'boolean': 'boolean_value',
+    }
     task_service = models.ForeignKey(TaskService, on_delete=models.CASCADE, related_name="values")
     column = models.ForeignKey(Column, on_delete=models.PROTECT, related_name="task_values")
     
@@ -95,22 +112,37 @@ class TaskServiceValue(models.Model):
         indexes = [
             models.Index(fields=["task_service"]),
             models.Index(fields=["column"]),
+            # "X sütunu A ilə B arasında" filtrləri üçün tip üzrə qismən indekslər
+            models.Index(fields=["column", "charfield_value"], condition=models.Q(charfield_value__isnull=False), name="tsv_col_char_idx"),
+            models.Index(fields=["column", "date_value"], condition=models.Q(date_value__isnull=False), name="tsv_col_date_idx"),
+            models.Index(fields=["column", "datetime_value"], condition=models.Q(datetime_value__isnull=False), name="tsv_col_datetime_idx"),
+            models.Index(fields=["column", "number_value"], condition=models.Q(number_value__isnull=False), name="tsv_col_number_idx"),
+            models.Index(fields=["column", "decimal_value"], condition=models.Q(decimal_value__isnull=False), name="tsv_col_decimal_idx"),
+            models.Index(fields=["column", "boolean_value"], condition=models.Q(boolean_value__isnull=False), name="tsv_col_bool_idx"),
         ]
     
+    @classmethod
+    def value_field(cls, field_type):
+        """Sütun tipinə uyğun dəyər sahəsinin adı."""
+        return cls.VALUE_FIELDS.get(field_type)
+
+    def get_field_type(self):
+        # Column artıq yüklənibsə ondan, əks halda keşdən - əlavə sorğu olmadan
+        if 'column' in self._state.fields_cache:
+            return self.column.field_type
+        from ..schema import column_field_type
+        return column_field_type(self.column_id)
+
     def get_value(self):
         """Return the appropriate value based on column type."""
-        field_map = {
-            'string': self.charfield_value,
-            'text': self.text_value,
-            'image': self.image_value.url if self.image_value else None,
-            'file': self.file_value.url if self.file_value else None,
-            'date': self.date_value,
-            'datetime': self.datetime_value,
-            'integer': self.number_value,
-            'decimal': self.decimal_value,
-            'boolean': self.boolean_value,
-        }
-        return field_map.get(self.column.field_type)
+        field_type = self.get_field_type()
+        field = self.value_field(field_type)
+        if field is None:
+            return None
+        value = getattr(self, field)
+        if field_type in ('image', 'file'):
+            return value.url if value else None
+        return value
     
     def __str__(self):
         return f"{self.task_service} - {self.column.key}"
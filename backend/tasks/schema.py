@@ -0,0 +1,101 @@
+"""
+Servis -> sütun sxeminin versiyalı reyestri.
+
+Sxem paylaşılan keşdə (CACHES['default']) versiya açarı ilə saxlanılır, hər proses isə
+son oxuduğu nüsxəni yaddaşda tutur. Service/Column yazılışı tranzaksiya bitdikdən sonra
+yeni versiya yaradır (tasks/signals.py), köhnə nüsxələr avtomatik etibarsız olur.
+"""
+import time
+import uuid
+from django.core.cache import cache
+from .models import Service, Column
+
+SCHEMA_VERSION_KEY = 'tasks:schema:version'
+SCHEMA_KEY = 'tasks:schema:{version}'
+SCHEMA_TIMEOUT = 24 * 60 * 60
+
+# Proses daxili nüsxə paylaşılan versiyanı ən çox bu qədər saniyədən bir yoxlayır
+LOCAL_TTL = 2
+
+_local = {'version': None, 'schema': None, 'checked_at': 0.0}
+
+
+def _column_data(column, service_name):
+    return {
+        'id': column.id,
+        'service': column.service_id,
+        'service_name': service_name,
+        'name': column.name,
+        'key': column.key,
+        'field_type': column.field_type,
+        'field_type_display': column.get_field_type_display(),
+        'required': column.required,
+        'is_active': column.is_active,
+        'min_value': str(column.min_value) if column.min_value is not None else None,
+        'max_value': str(column.max_value) if column.max_value is not None else None,
+        'order': column.order,
+    }
+
+
+def build_schema(version):
+    """Sxemi iki sorğu ilə (servislər + sütunlar) qurur."""
+    services = []
+    columns = {}
+    for service in Service.objects.prefetch_related('columns').order_by('name'):
+        service_columns = [_column_data(column, service.name) for column in service.columns.all()]
+        columns.update((column['id'], column) for column in service_columns)
+        services.append({
+            'id': service.id,
+            'name': service.name,
+            'icon': service.icon,
+            'description': service.description,
+            'is_active': service.is_active,
+            'columns': service_columns,
+            'columns_count': sum(1 for column in service_columns if column['is_active']),
+        })
+    return {'version': version, 'services': services, 'columns': columns}
+
+
+def get_version():
+    version = cache.get(SCHEMA_VERSION_KEY)
+    if version is None:
+        cache.add(SCHEMA_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(SCHEMA_VERSION_KEY)
+    return version
+
+
+def get_schema(force_check=False):
+    now = time.monotonic()
+    if _local['schema'] is not None and not force_check and now - _local['checked_at'] < LOCAL_TTL:
+        return _local['schema']
+
+    version = get_version()
+    if _local['version'] != version:
+        key = SCHEMA_KEY.format(version=version)
+        schema = cache.get(key)
+        if schema is None:
+            schema = build_schema(version)
+            cache.set(key, schema, SCHEMA_TIMEOUT)
+        _local.update(version=version, schema=schema)
+
+    _local['checked_at'] = now
+    return _local['schema']
+
+
+def get_column(column_id):
+    """Sütunun metadatası; yeni yaradılmış sütun tapılmasa, versiya dərhal yoxlanılır."""
+    column = get_schema()['columns'].get(column_id)
+    if column is None:
+        column = get_schema(force_check=True)['columns'].get(column_id)
+    return column
+
+
+def column_field_type(column_id):
+    column = get_column(column_id)
+    return column['field_type'] if column else None
+
+
+def invalidate_schema():
+    """Yeni versiya yaradır; bütün proseslərin nüsxələri növbəti yoxlamada yenilənir."""
+    cache.set(SCHEMA_VERSION_KEY, uuid.uuid4().hex, None)
+    _local.update(version=None, schema=None, checked_at=0.0)
@@ -26,4 +26,5 @@ class ServiceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
     def get_columns_count(self, obj):
-        return obj.columns.filter(is_active=True).count()
+        # prefetch_related('columns') ilə əlavə sorğu olmadan sayılır
+        return sum(1 for column in obj.columns.all() if column.is_active)
@@ -4,12 +4,15 @@ from ..models import Task, TaskService, TaskServiceValue, Column, Service, TaskP
 from .product import TaskProductSerializer
 from documents.serializers import TaskDocumentSerializer
 from .task_type import TaskTypeSerializer
+from ..schema import get_column
+from core.conditional import mark_changed
 
 
 class TaskServiceValueSerializer(serializers.ModelSerializer):
-    column_name = serializers.CharField(source='column.name', read_only=True)
-    column_key = serializers.CharField(source='column.key', read_only=True)
-    column_type = serializers.CharField(source='column.field_type', read_only=True)
+    # Sütun metadatası sxem reyestrindən oxunur - hər dəyər üçün Column sorğusu olmur
+    column_name = serializers.SerializerMethodField()
+    column_key = serializers.SerializerMethodField()
+    column_type = serializers.SerializerMethodField()
     value = serializers.SerializerMethodField()
     
     class Meta:
@@ -22,6 +25,18 @@ class TaskServiceValueSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
     
+    def _column(self, obj):
+        return get_column(obj.column_id) or {}
+
+    def get_column_name(self, obj):
+        return self._column(obj).get('name')
+
+    def get_column_key(self, obj):
+        return self._column(obj).get('key')
+
+    def get_column_type(self, obj):
+        return self._column(obj).get('field_type')
+
     def get_value(self, obj):
         return obj.get_value()
 
@@ -39,50 +54,24 @@ class TaskServiceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def create(self, validated_data):
-        values_data = validated_data.pop('values_data', [])
-        values_json = validated_data.pop('values_json', None)
-        
-        # Merge values_json into values_data if present
-        if values_json:
-            if isinstance(values_json, str):
-                try:
-                    values_json = json.loads(values_json)
-                except json.JSONDecodeError:
-                    values_json = []
-
-            request = self.context.get('request')
-            for item in values_json:
-                if not isinstance(item, dict):
-                    continue
-                column_id = item.get('column')
-                if column_id:
-                    # Check for file in request.FILES using key 'file_{column_id}'
-                    file_key = f"file_{column_id}"
-                    if request and file_key in request.FILES:
-                        try:
-                            column = Column.objects.get(id=column_id)
-                            if column.field_type == 'image':
-                                item['image_value'] = request.FILES[file_key]
-                            elif column.field_type == 'file':
-                                item['file_value'] = request.FILES[file_key]
-                        except Column.DoesNotExist:
-                            pass
-                values_data.append(item)
-
+        values_data = self._collect_values(validated_data)
         task_service = TaskService.objects.create(**validated_data)
-        
-        for value_data in values_data:
-            column_id = value_data.pop('column', None)
-            if column_id:
-                TaskServiceValue.objects.create(
-                    task_service=task_service,
-                    column_id=column_id,
-                    **value_data
-                )
-        
+        self._save_values(task_service, values_data)
         return task_service
 
     def update(self, instance, validated_data):
+        values_data = self._collect_values(validated_data)
+        
+        # Update main instance fields
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save()
+        
+        self._save_values(instance, values_data)
+        return instance
+
+    def _collect_values(self, validated_data):
+        """values_data və values_json (multipart üçün JSON string) siyahılarını birləşdirir."""
         values_data = validated_data.pop('values_data', [])
         values_json = validated_data.pop('values_json', None)
         
@@ -93,41 +82,56 @@ class TaskServiceSerializer(serializers.ModelSerializer):
                     values_json = json.loads(values_json)
                 except json.JSONDecodeError:
                     values_json = []
-            
-            request = self.context.get('request')
-            for item in values_json:
-                if not isinstance(item, dict):
-                    continue
-                column_id = item.get('column')
-                if column_id:
-                    file_key = f"file_{column_id}"
-                    if request and file_key in request.FILES:
-                        try:
-                            column = Column.objects.get(id=column_id)
-                            if column.field_type == 'image':
-                                item['image_value'] = request.FILES[file_key]
-                            elif column.field_type == 'file':
-                                item['file_value'] = request.FILES[file_key]
-                        except Column.DoesNotExist:
-                            pass
-                values_data.append(item)
+            values_data = values_data + [item for item in values_json if isinstance(item, dict)]
         
-        # Update main instance fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-        
-        # Update or Create values
+        return values_data
+
+    def _save_values(self, task_service, values_data):
+        """
+        Bütün dəyərləri sabit sayda sorğu ilə yazır: sütunlar sxem reyestrindən oxunur,
+        dəyərlər (task_service, column) üzrə bulk_create(update_conflicts=True) ilə upsert olunur.
+        """
+        items = {}
         for value_data in values_data:
-            column_id = value_data.pop('column', None)
-            if column_id:
-                TaskServiceValue.objects.update_or_create(
-                    task_service=instance,
-                    column_id=column_id,
-                    defaults=value_data
-                )
+            try:
+                column_id = int(value_data.get('column'))
+            except (TypeError, ValueError):
+                continue
+            items[column_id] = {
+                field: value for field, value in value_data.items()
+                if field in TaskServiceValue.VALUE_FIELDS.values()
+            }
+        if not items:
+            return
+
+        request = self.context.get('request')
         
-        return instance
+        # Göndərilən sahələr dəsti üzrə qruplaşdırılır ki, göndərilməyən sahələr (məs. köhnə fayl) silinməsin
+        groups = {}
+        for column_id, fields in items.items():
+            column = get_column(column_id)
+            if column is None:
+                continue
+            
+            # Check for file in request.FILES using key 'file_{column_id}'
+            file_key = f"file_{column_id}"
+            if request and file_key in request.FILES and column['field_type'] in ('image', 'file'):
+                fields[TaskServiceValue.value_field(column['field_type'])] = request.FILES[file_key]
+            
+            value = TaskServiceValue(task_service=task_service, column_id=column_id, **fields)
+            groups.setdefault(tuple(sorted(fields)), []).append(value)
+        
+        for update_fields, values in groups.items():
+            if update_fields:
+                TaskServiceValue.objects.bulk_create(
+                    values,
+                    update_conflicts=True,
+                    unique_fields=['task_service', 'column'],
+                    update_fields=list(update_fields),
+                )
+            else:
+                TaskServiceValue.objects.bulk_create(values, ignore_conflicts=True)
+        mark_changed(TaskServiceValue)
 
 
 class TaskSerializer(serializers.ModelSerializer):
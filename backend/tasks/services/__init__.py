@@ -0,0 +1,2 @@
+from .export import export_columns, task_export_header, task_export_rows
+from .customer_import import import_customers
@@ -0,0 +1,120 @@
+from itertools import islice
+from django.db import transaction
+from django.db.models import Q
+from core.conditional import mark_changed
+from users.models import Region
+from ..models import Customer
+
+IMPORT_BATCH_SIZE = 500
+
+FIELD_MAX_LENGTHS = {
+    field: Customer._meta.get_field(field).max_length
+    for field in ('full_name', 'register_number', 'phone_number', 'address')
+}
+
+
+def _clean(value):
+    # XLSX rəqəm xanaları (telefon, qeydiyyat №) float kimi gəlir
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip() if value is not None else ''
+
+
+def _coordinate(value):
+    value = _clean(value).replace(',', '.')
+    return float(value) if value else None
+
+
+def _validate_row(row, regions):
+    """Bir sətri Customer obyektinə çevirir; (customer, errors) qaytarır."""
+    data = {field: _clean(row.get(field)) for field in FIELD_MAX_LENGTHS}
+    errors = {}
+
+    if not data['full_name']:
+        errors['full_name'] = 'Required'
+    for field, max_length in FIELD_MAX_LENGTHS.items():
+        if len(data[field]) > max_length:
+            errors[field] = f'Max {max_length} characters'
+
+    region_name = _clean(row.get('region'))
+    region_id = regions.get(region_name.lower())
+    if region_id is None:
+        errors['region'] = f'Unknown region "{region_name}"' if region_name else 'Required'
+
+    coordinates = {}
+    try:
+        lat, lng = _coordinate(row.get('lat')), _coordinate(row.get('lng'))
+    except ValueError:
+        errors['coordinates'] = 'Invalid lat/lng'
+    else:
+        if lat is not None and lng is not None:
+            coordinates = {'lat': lat, 'lng': lng}
+        elif lat is not None or lng is not None:
+            # Yarımçıq koordinat səssizcə atılmır
+            errors['coordinates'] = 'Both lat and lng required'
+
+    if errors:
+        return None, errors
+    return Customer(region_id=region_id, address_coordinates=coordinates, **data), None
+
+
+def import_customers(rows, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """
+    Müştəriləri hissə-hissə idxal edir. Hər hissə üçün: dublikat yoxlaması (bir sorğu) + bulk_create.
+    Səhvli sətirlər ötürülür və hesabata yazılır, fayl tam dayandırılmır.
+    İdxal bir tranzaksiyadadır: fayl yarıda oxunmasa (core.imports.ImportFileError) əvvəlki
+    hissələr də geri qaytarılır, yarımçıq idxal qalmır.
+    """
+    regions = {name.lower(): pk for pk, name in Region.objects.values_list('pk', 'name')}
+    seen_registers, seen_phones = set(), set()
+    report = {'created': 0, 'invalid': 0, 'duplicates': 0, 'errors': []}
+
+    # Sətir nömrəsi başlıqdan sonra 2-dən başlayır (cədvəldəki kimi)
+    numbered = enumerate(rows, start=2)
+    with transaction.atomic():
+        while True:
+            batch = list(islice(numbered, batch_size))
+            if not batch:
+                break
+
+            candidates = []
+            for line, row in batch:
+                customer, errors = _validate_row(row, regions)
+                if errors:
+                    report['errors'].append({'row': line, 'errors': errors})
+                    report['invalid'] += 1
+                else:
+                    candidates.append((line, customer))
+
+            registers = {c.register_number for _, c in candidates if c.register_number}
+            phones = {c.phone_number for _, c in candidates if c.phone_number}
+            existing = Customer.objects.filter(
+                Q(register_number__in=registers) | Q(phone_number__in=phones)
+            ).values_list('register_number', 'phone_number')
+            for register_number, phone_number in existing:
+                seen_registers.add(register_number)
+                seen_phones.add(phone_number)
+
+            to_create = []
+            for line, customer in candidates:
+                if customer.register_number and customer.register_number in seen_registers:
+                    report['errors'].append({'row': line, 'errors': {'register_number': 'Duplicate'}})
+                    report['duplicates'] += 1
+                    continue
+                if customer.phone_number and customer.phone_number in seen_phones:
+                    report['errors'].append({'row': line, 'errors': {'phone_number': 'Duplicate'}})
+                    report['duplicates'] += 1
+                    continue
+                if customer.register_number:
+                    seen_registers.add(customer.register_number)
+                if customer.phone_number:
+                    seen_phones.add(customer.phone_number)
+                to_create.append(customer)
+
+            if to_create and not dry_run:
+                Customer.objects.bulk_create(to_create, batch_size=batch_size)
+                mark_changed(Customer)
+            report['created'] += len(to_create)
+
+    report['errors'].sort(key=lambda error: error['row'])
+    return report
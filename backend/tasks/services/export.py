@@ -0,0 +1,74 @@
+from django.core.files.storage import default_storage
+from core.export import iter_keyset
+from ..models import Task, TaskServiceValue, Column
+
+TASK_EXPORT_CHUNK_SIZE = 500
+
+TASK_FIELDS = [
+    'pk', 'title', 'status', 'task_type__name',
+    'customer__full_name', 'customer__register_number', 'customer__phone_number', 'customer__address',
+    'group__region__name', 'group__name', 'assigned_to__first_name', 'assigned_to__last_name',
+    'note', 'created_at', 'updated_at',
+]
+TASK_HEADER = [
+    'ID', 'Başlıq', 'Status', 'Növ', 'Müştəri', 'Qeydiyyat №', 'Telefon', 'Ünvan',
+    'Region', 'Qrup', 'İcraçı', 'Qeyd', 'Yaradılıb', 'Yenilənib',
+]
+FILE_TYPES = (Column.FieldType.IMAGE, Column.FieldType.FILE)
+
+
+def export_columns():
+    """İxrac olunan dinamik sütunlar: aktiv servislərin aktiv sütunları, servis üzrə qruplaşdırılmış."""
+    return list(
+        Column.objects.filter(is_active=True, service__is_active=True)
+        .select_related('service')
+        .order_by('service__name', 'order', 'id')
+    )
+
+
+def task_export_header(columns):
+    return TASK_HEADER + [f"{column.service.name}: {column.key}" for column in columns]
+
+
+def _pivot_values(task_ids, columns):
+    """
+    Hissədəki tapşırıqların EAV dəyərlərini bir sorğu ilə oxuyub {task_id: {column_id: dəyər}} qaytarır.
+    Hər sütun üçün yalnız onun tipinə uyğun dəyər sahəsi götürülür.
+    """
+    field_types = {column.id: column.field_type for column in columns}
+    value_fields = list(TaskServiceValue.VALUE_FIELDS.values())
+    rows = TaskServiceValue.objects.filter(
+        task_service__task_id__in=task_ids,
+        column_id__in=field_types,
+    ).values_list('task_service__task_id', 'column_id', *value_fields)
+
+    field_index = {field: index for index, field in enumerate(value_fields, start=2)}
+    pivot = {}
+    for row in rows:
+        field_type = field_types[row[1]]
+        value = row[field_index[TaskServiceValue.VALUE_FIELDS[field_type]]]
+        if value and field_type in FILE_TYPES:
+            value = default_storage.url(value)
+        pivot.setdefault(row[0], {})[row[1]] = value
+    return pivot
+
+
+def task_export_rows(queryset, columns, chunk_size=TASK_EXPORT_CHUNK_SIZE):
+    """
+    Tapşırıqları keyset hissələri ilə axınla oxuyur; hər hissə üçün 2 sorğu (tapşırıqlar + dəyərlər).
+    Nested serializer qrafı yaddaşda qurulmur.
+    """
+    status_labels = dict(Task.Status.choices)
+    queryset = queryset.values_list(*TASK_FIELDS)
+
+    for chunk in iter_keyset(queryset, chunk_size=chunk_size):
+        pivot = _pivot_values([row[0] for row in chunk], columns)
+        for (pk, title, status, task_type, customer, register_number, phone, address, region, group,
+             first_name, last_name, note, created_at, updated_at) in chunk:
+            values = pivot.get(pk, {})
+            yield [
+                pk, title, status_labels.get(status, status), task_type, customer, register_number,
+                phone, address, region, group, f"{first_name or ''} {last_name or ''}".strip(),
+                note, created_at, updated_at,
+                *[values.get(column.id) for column in columns],
+            ]
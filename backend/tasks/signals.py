@@ -1 +1,13 @@
-# Signals moved to notifications/signals.py
+# Notification signals are in notifications/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Service, Column
+from .schema import invalidate_schema
+
+
+@receiver([post_save, post_delete], sender=Service)
+@receiver([post_save, post_delete], sender=Column)
+def schema_changed(sender, **kwargs):
+    """Sxem dəyişdi - yeni versiya commit-dən sonra yaradılır ki, köhnə data keşlənməsin."""
+    transaction.on_commit(invalidate_schema)
@@ -1,3 +1,235 @@
+import io
+import tempfile
+import zipfile
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
 from django.test import TestCase
+from rest_framework.test import APIClient
+from core.imports import iter_table_rows
+from users.models import Region, User
+from .models import Column, Customer, Service
+from .schema import invalidate_schema
+from .services import import_customers
 
-# Create your tests here.
+
+class CustomerImportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.baku = Region.objects.create(name="Bakı")
+        Customer.objects.create(full_name="Mövcud", register_number="R-1", phone_number="0501112233", region=cls.baku)
+
+    def row(self, **data):
+        return {"full_name": "Əli Məmmədov", "region": "Bakı", **data}
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        report = import_customers([
+            self.row(register_number="R-2"),
+            self.row(full_name=""),
+            self.row(region="Gəncə"),
+            self.row(region=""),
+            self.row(phone_number="9" * 31),
+            self.row(lat="40,4", lng="abc"),
+        ])
+
+        self.assertEqual((report["created"], report["invalid"], report["duplicates"]), (1, 5, 0))
+        self.assertEqual(report["errors"], [
+            {"row": 3, "errors": {"full_name": "Required"}},
+            {"row": 4, "errors": {"region": 'Unknown region "Gəncə"'}},
+            {"row": 5, "errors": {"region": "Required"}},
+            {"row": 6, "errors": {"phone_number": "Max 30 characters"}},
+            {"row": 7, "errors": {"coordinates": "Invalid lat/lng"}},
+        ])
+        self.assertTrue(Customer.objects.filter(register_number="R-2").exists())
+
+    def test_region_lookup_is_case_insensitive(self):
+        report = import_customers([self.row(region="  bakı ", register_number="R-2")])
+
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(Customer.objects.get(register_number="R-2").region, self.baku)
+
+    def test_coordinates(self):
+        report = import_customers([
+            self.row(register_number="R-2", lat="40,4093", lng=49.8671),
+            self.row(register_number="R-3", lat="40.4"),
+            self.row(register_number="R-4", lng="49.8"),
+            self.row(register_number="R-5"),
+        ])
+
+        self.assertEqual(report["errors"], [
+            {"row": 3, "errors": {"coordinates": "Both lat and lng required"}},
+            {"row": 4, "errors": {"coordinates": "Both lat and lng required"}},
+        ])
+        self.assertEqual(Customer.objects.get(register_number="R-2").address_coordinates, {"lat": 40.4093, "lng": 49.8671})
+        self.assertEqual(Customer.objects.get(register_number="R-5").address_coordinates, {})
+
+    def test_duplicates_in_file_and_database(self):
+        report = import_customers([
+            self.row(register_number="R-1"),
+            self.row(phone_number="0501112233"),
+            self.row(register_number="R-2", phone_number="0559998877"),
+            self.row(register_number="R-2"),
+            self.row(register_number="R-3", phone_number="0559998877"),
+            self.row(),
+            self.row(),
+        ], batch_size=2)
+
+        self.assertEqual((report["created"], report["invalid"], report["duplicates"]), (3, 0, 4))
+        self.assertEqual(report["errors"], [
+            {"row": 2, "errors": {"register_number": "Duplicate"}},
+            {"row": 3, "errors": {"phone_number": "Duplicate"}},
+            {"row": 5, "errors": {"register_number": "Duplicate"}},
+            {"row": 6, "errors": {"phone_number": "Duplicate"}},
+        ])
+        # Nömrəsi və telefonu olmayan sətirlər dublikat sayılmır
+        self.assertEqual(Customer.objects.filter(register_number="", phone_number="").count(), 2)
+
+    def test_dry_run_writes_nothing(self):
+        report = import_customers([
+            self.row(register_number="R-2"),
+            self.row(register_number="R-2"),
+            self.row(full_name=""),
+        ], dry_run=True)
+
+        self.assertEqual((report["created"], report["invalid"], report["duplicates"]), (1, 1, 1))
+        self.assertEqual(Customer.objects.count(), 1)
+
+    def test_xlsx_numeric_cells_are_normalised(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["full_name", "register_number", "phone_number", "region", "lat", "lng"])
+        sheet.append(["Əli Məmmədov", 1234567.0, 994501234567, "Bakı", 40.4, 49.8])
+        upload = io.BytesIO()
+        workbook.save(upload)
+        upload.seek(0)
+
+        report = import_customers(iter_table_rows(upload, "customers.xlsx"))
+
+        self.assertEqual(report["errors"], [])
+        customer = Customer.objects.get(full_name="Əli Məmmədov")
+        self.assertEqual((customer.register_number, customer.phone_number), ("1234567", "994501234567"))
+        self.assertEqual(customer.address_coordinates, {"lat": 40.4, "lng": 49.8})
+
+
+class CustomerImportFileTest(TestCase):
+    url = "/api/tasks/customers/import/"
+    header = "full_name,register_number,region\n"
+
+    @classmethod
+    def setUpTestData(cls):
+        Region.objects.create(name="Bakı")
+        cls.user = User.objects.create_user("operator", password="x")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, name, content):
+        return self.client.post(self.url, {"file": SimpleUploadedFile(name, content)}, format="multipart")
+
+    def test_valid_csv_is_imported(self):
+        response = self.upload("customers.csv", (self.header + "Əli,R-1,Bakı\n").encode())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 1)
+
+    def test_non_utf8_csv_is_rejected_without_partial_import(self):
+        # İlk hissə yazılandan sonra faylın ortasında kodlaşdırma səhvi
+        valid = "".join(f"Müştəri {i},R-{i},Bakı\n" for i in range(600))
+        content = (self.header + valid).encode() + "Şirin Ağayev,R-x,Bakı\n".encode("cp1254")
+
+        response = self.upload("customers.csv", content)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"error": "CSV file must be UTF-8 encoded"})
+        self.assertFalse(Customer.objects.exists())
+
+    def test_corrupt_xlsx_is_rejected(self):
+        for content in (b"not a spreadsheet", b"", b"PK\x03\x04broken"):
+            with self.subTest(content=content):
+                response = self.upload("customers.xlsx", content)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, {"error": "Invalid XLSX file"})
+
+    def test_zip_that_is_not_xlsx_is_rejected(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("readme.txt", "salam")
+
+        response = self.upload("customers.xlsx", archive.getvalue())
+        self.assertEqual(response.status_code, 400)
+
+    def test_command_reports_file_error(self):
+        with tempfile.NamedTemporaryFile(suffix=".xlsx") as upload:
+            upload.write(b"not a spreadsheet")
+            upload.flush()
+            with self.assertRaisesMessage(CommandError, "Invalid XLSX file"):
+                call_command("import_customers", upload.name, stdout=io.StringIO())
+
+
+class ServiceSchemaTest(TestCase):
+    url = "/api/tasks/services/schema/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("admin", password="x")
+        cls.service = Service.objects.create(name="İnternet")
+        cls.column = Column.objects.create(service=cls.service, name="Port", key="port", field_type=Column.FieldType.INTEGER)
+
+    def setUp(self):
+        cache.clear()
+        invalidate_schema()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def assertChangesEtag(self, write):
+        etag = self.etag()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertTrue(response["ETag"].startswith('"schema-'))
+        return response.data
+
+    def test_column_edit_changes_etag(self):
+        def rename():
+            self.column.name = "Port nömrəsi"
+            self.column.save()
+
+        data = self.assertChangesEtag(rename)
+        self.assertEqual(data["services"][0]["columns"][0]["name"], "Port nömrəsi")
+
+    def test_new_column_changes_etag(self):
+        data = self.assertChangesEtag(
+            lambda: Column.objects.create(service=self.service, name="Sürət", key="speed", field_type=Column.FieldType.DECIMAL)
+        )
+        self.assertEqual([column["key"] for column in data["services"][0]["columns"]], ["port", "speed"])
+
+    def test_service_edit_changes_etag(self):
+        def deactivate():
+            self.service.is_active = False
+            self.service.save()
+
+        data = self.assertChangesEtag(deactivate)
+        self.assertFalse(data["services"][0]["is_active"])
+
+    def test_column_delete_changes_etag(self):
+        data = self.assertChangesEtag(self.column.delete)
+        self.assertEqual(data["services"][0]["columns"], [])
+
+    def test_if_none_match_compares_whole_etags(self):
+        etag = self.etag()
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"other", W/{etag}').status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH="*").status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=f'{etag[:-1]}0"').status_code, 200)
@@ -1,14 +1,21 @@
+from django.db import models
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from ..models import Customer
 from ..serializers import CustomerSerializer
+from ..services import import_customers
+from core.imports import ImportFileError, iter_table_rows
+from core.conditional import ConditionalGetMixin
 
 from ..pagination import TaskPagination
 
 
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for Customer CRUD operations."""
+    conditional_models = ('tasks.Customer', 'users.Region')
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
     pagination_class = TaskPagination
@@ -44,3 +51,23 @@ class CustomerViewSet(viewsets.ModelViewSet):
         instance.is_active = False
         instance.save()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, FormParser])
+    def import_file(self, request):
+        """
+        CSV/XLSX faylından toplu müştəri idxalı (sahə: file, ?dry_run=true yalnız yoxlayır).
+        Sütunlar: full_name, register_number, phone_number, region, address, lat, lng.
+        """
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({'error': 'file required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            report = import_customers(
+                iter_table_rows(upload.file, upload.name),
+                dry_run=request.query_params.get('dry_run') == 'true'
+            )
+        except ImportFileError as exc:
+            # İdxal geri qaytarılıb - heç bir sətir yazılmayıb
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_200_OK)
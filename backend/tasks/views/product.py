@@ -5,10 +5,12 @@ from rest_framework.permissions import IsAuthenticated
 from ..models import TaskProduct
 from ..serializers import TaskProductSerializer, TaskProductCreateSerializer
 from warehouse.models import Product, Warehouse
+from core.conditional import ConditionalGetMixin
 
 
-class TaskProductViewSet(viewsets.ModelViewSet):
+class TaskProductViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for TaskProduct CRUD operations."""
+    conditional_models = ('tasks.TaskProduct', 'warehouse.Product', 'warehouse.Warehouse')
     queryset = TaskProduct.objects.all()
     serializer_class = TaskProductSerializer
     permission_classes = [IsAuthenticated]
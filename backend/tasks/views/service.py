@@ -1,8 +1,14 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from django.utils.http import parse_etags
 from django_filters.rest_framework import DjangoFilterBackend
 from ..models import Service, Column
 from ..serializers import ServiceSerializer, ColumnSerializer
+from ..schema import get_schema
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -11,9 +17,11 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(CachedResponseMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """CRUD for Services with soft delete support."""
-    queryset = Service.objects.all()
+    conditional_models = cache_models = ('tasks.Service', 'tasks.Column')
+    cache_scope = 'global'
+    queryset = Service.objects.prefetch_related('columns')
     serializer_class = ServiceSerializer
     pagination_class = StandardResultsSetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -21,9 +29,28 @@ class ServiceViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'id']
     ordering = ['name']
 
+    @action(detail=False, methods=['get'])
+    def schema(self, request):
+        """
+        Bütün servislər və sütunları bir cavabda.
+        Klient ETag-i If-None-Match ilə göndərirsə və sxem dəyişməyibsə 304 qaytarılır.
+        """
+        schema = get_schema(force_check=True)
+        version = schema['version']
+        etag = f'"schema-{version}"'
+        # ConditionalGetMixin kimi: zəif (W/) ETag-lər və `*` da uyğun gəlir
+        client_etags = {value.removeprefix('W/') for value in parse_etags(request.headers.get('If-None-Match', ''))}
+        if etag in client_etags or '*' in client_etags:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        
+        response = Response({'version': version, 'services': schema['services']})
+        response['ETag'] = etag
+        return response
 
-class ColumnViewSet(viewsets.ModelViewSet):
+
+class ColumnViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """CRUD for Columns with filtering by service."""
+    conditional_models = ('tasks.Column', 'tasks.Service')
     queryset = Column.objects.all()
     serializer_class = ColumnSerializer
     pagination_class = StandardResultsSetPagination
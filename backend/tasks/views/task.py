@@ -1,18 +1,119 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import models, transaction
+from rest_framework.exceptions import ValidationError
 from rest_framework import viewsets, status
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from decimal import Decimal
-from ..models import Task, TaskService, TaskProduct
+from ..models import Task, TaskService, TaskServiceValue
+from ..schema import column_field_type
 from ..serializers import TaskSerializer, TaskServiceSerializer, TaskStatusUpdateSerializer, TaskProductSerializer, TaskProductCreateSerializer
-from warehouse.models import WarehouseInventory, StockMovement
+from ..jobs import deduct_task_products, notify_task_created
 from ..pagination import TaskPagination
+from ..services import export_columns, task_export_header, task_export_rows
+from core.export import export_response
+from core.conditional import ConditionalGetMixin
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+def filter_by_column_value(queryset, column_id, params):
+    """
+    Sütunun tipinə uyğun dəyər sahəsi üzrə EXISTS filtri.
+    (column_id, typed_value) qismən indeksləri ilə işləyir.
+    """
+    try:
+        column_id = int(column_id)
+    except ValueError:
+        raise ValidationError({'column': 'Invalid column'})
+
+    field = TaskServiceValue.value_field(column_field_type(column_id))
+    if field is None or field in ('image_value', 'file_value', 'text_value'):
+        raise ValidationError({'column': 'Column is not filterable'})
+
+    model_field = TaskServiceValue._meta.get_field(field)
+    lookups = {}
+    for param, lookup in (('column_value', 'exact'), ('column_min', 'gte'), ('column_max', 'lte')):
+        raw = params.get(param)
+        if raw in (None, ''):
+            continue
+        try:
+            lookups[f'{field}__{lookup}'] = model_field.to_python(raw)
+        except DjangoValidationError:
+            raise ValidationError({param: 'Invalid value for column type'})
+
+    if not lookups:
+        lookups[f'{field}__isnull'] = False
+
+    values = TaskServiceValue.objects.filter(
+        task_service__task_id=models.OuterRef('pk'),
+        column_id=column_id,
+        **lookups
+    )
+    return queryset.filter(models.Exists(values))
+
+
+def filter_tasks(queryset, params):
+    """TaskViewSet siyahısı və ixrac üçün ortaq query param filtrləri."""
+    # Filter by status
+    task_status = params.get('status')
+    if task_status:
+        queryset = queryset.filter(status=task_status)
+    
+    # Filter by customer
+    customer = params.get('customer')
+    if customer:
+        queryset = queryset.filter(customer_id=customer)
+    
+    # Filter by group
+    group = params.get('group')
+    if group:
+        queryset = queryset.filter(group_id=group)
+    
+    # Filter by assigned_to
+    assigned_to = params.get('assigned_to')
+    if assigned_to:
+        queryset = queryset.filter(assigned_to_id=assigned_to)
+    
+    # Filter by is_active
+    is_active = params.get('is_active')
+    if is_active is not None:
+        queryset = queryset.filter(is_active=is_active.lower() == 'true')
+    
+    # Filter by date range
+    date_from = params.get('date_from')
+    if date_from:
+        queryset = queryset.filter(created_at__date__gte=date_from)
+    
+    date_to = params.get('date_to')
+    if date_to:
+        queryset = queryset.filter(created_at__date__lte=date_to)
+    
+    # Filter by dynamic service column value: ?column=<id>&column_value= | column_min=&column_max=
+    column = params.get('column')
+    if column:
+        queryset = filter_by_column_value(queryset, column, params)
+    
+    # Search - title, customer name, register_number, note
+    search = params.get('search')
+    if search:
+        queryset = queryset.filter(
+            models.Q(title__icontains=search) |
+            models.Q(customer__full_name__icontains=search) |
+            models.Q(customer__register_number__icontains=search) |
+            models.Q(note__icontains=search)
+        )
+    
+    return queryset
+
+
+class TaskViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for Task CRUD operations."""
+    conditional_models = (
+        'tasks.Task', 'tasks.TaskService', 'tasks.TaskServiceValue', 'tasks.TaskProduct', 'tasks.TaskType',
+        'tasks.Customer', 'tasks.Service', 'tasks.Column', 'users.User', 'users.Group', 'users.Region',
+        'warehouse.Product', 'warehouse.Warehouse', 'documents.TaskDocument', 'documents.Shelf',
+    )
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     pagination_class = TaskPagination
@@ -27,64 +128,30 @@ class TaskViewSet(viewsets.ModelViewSet):
             'task_documents'
         ).order_by('created_at')
         
-        # Filter by status
-        task_status = self.request.query_params.get('status')
-        if task_status:
-            queryset = queryset.filter(status=task_status)
-        
-        # Filter by customer
-        customer = self.request.query_params.get('customer')
-        if customer:
-            queryset = queryset.filter(customer_id=customer)
-        
-        # Filter by group
-        group = self.request.query_params.get('group')
-        if group:
-            queryset = queryset.filter(group_id=group)
-        
-        # Filter by assigned_to
-        assigned_to = self.request.query_params.get('assigned_to')
-        if assigned_to:
-            queryset = queryset.filter(assigned_to_id=assigned_to)
-        
-        # Filter by is_active
-        is_active = self.request.query_params.get('is_active')
-        if is_active is not None:
-            queryset = queryset.filter(is_active=is_active.lower() == 'true')
-        
-        # Filter by date range
-        date_from = self.request.query_params.get('date_from')
-        if date_from:
-            queryset = queryset.filter(created_at__date__gte=date_from)
-        
-        date_to = self.request.query_params.get('date_to')
-        if date_to:
-            queryset = queryset.filter(created_at__date__lte=date_to)
-        
-        # Search - title, customer name, register_number, note
-        search = self.request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(
-                models.Q(title__icontains=search) |
-                models.Q(customer__full_name__icontains=search) |
-                models.Q(customer__register_number__icontains=search) |
-                models.Q(note__icontains=search)
-            )
-        
-        return queryset
+        return filter_tasks(queryset, self.request.query_params)
     
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Tapşırıqların CSV/XLSX ixracı; hər servis sütunu ayrıca sütun kimi (?file_format=csv|xlsx).
+        Siyahı ilə eyni filtrləri qəbul edir.
+        """
+        queryset = filter_tasks(Task.objects.all(), request.query_params)
+        columns = export_columns()
+
+        return export_response(
+            task_export_header(columns),
+            task_export_rows(queryset, columns),
+            'tasks',
+            request.query_params.get('file_format', 'csv')
+        )
+
     def perform_create(self, serializer):
         """Create task and trigger notification."""
-        task = serializer.save()
-        
-        # Create notification
-        from notifications.services import send_notification
-        send_notification(
-            title=f"Yeni Task: {task.title}",
-            message=f"Müştəri: {task.customer.full_name if task.customer else 'N/A'}",
-            notification_type='task_created',
-            related_task=task
-        )
+        # İş tapşırıqla eyni tranzaksiyada yazılır
+        with transaction.atomic():
+            task = serializer.save()
+            notify_task_created.delay(task_id=task.id)
     
     def destroy(self, request, *args, **kwargs):
         """Soft delete - set is_active to False."""
@@ -107,60 +174,30 @@ class TaskViewSet(viewsets.ModelViewSet):
             if new_status == Task.Status.IN_PROGRESS and not task.assigned_to:
                 task.assigned_to = request.user
             
-            # DONE olduqda task_products-ları anbardan çıxar
-            if new_status == Task.Status.DONE:
-                self._deduct_task_products(task, request.user)
-                
-            task.save()
+            # DONE olduqda task_products-lar fon işində anbardan çıxılır; iş status dəyişikliyi
+            # ilə eyni tranzaksiyada yazılır, ona görə itmir
+            with transaction.atomic():
+                task.save()
+                if new_status == Task.Status.DONE:
+                    deduct_task_products.delay(task_id=task.id, user_id=request.user.id)
+
             return Response(TaskSerializer(task).data)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    def _deduct_task_products(self, task, user):
-        """Tapşırıq tamamlandıqda məhsulları anbardan çıxar."""
-        task_products = task.task_products.filter(is_deducted=False)
-        
-        with transaction.atomic():
-            for tp in task_products:
-                inventory, created = WarehouseInventory.objects.get_or_create(
-                    warehouse=tp.warehouse,
-                    product=tp.product
-                )
-                
-                qty_old = inventory.quantity
-                qty_new = qty_old - tp.quantity
-                
-                inventory.quantity = qty_new
-                inventory.save()
-                
-                # Stock movement yarat
-                StockMovement.objects.create(
-                    warehouse=tp.warehouse,
-                    product=tp.product,
-                    movement_type=StockMovement.Type.OUT,
-                    reason=f"Tapşırıq #{task.id} icrası zamanı istifadə olunmuşdur",
-                    quantity_old=qty_old,
-                    quantity_new=qty_new,
-                    created_by=user,
-                    reference_no=f"TASK-{task.id}"
-                )
-                
-                # İşarələ ki, artıq çıxarılıb
-                tp.is_deducted = True
-                tp.save()
 
 
-class TaskServiceViewSet(viewsets.ModelViewSet):
+class TaskServiceViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for TaskService operations."""
     queryset = TaskService.objects.all()
     serializer_class = TaskServiceSerializer
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
+    conditional_models = ('tasks.TaskService', 'tasks.TaskServiceValue', 'tasks.Service', 'tasks.Column')
     
     def get_queryset(self):
         queryset = TaskService.objects.select_related(
             'task', 'service'
-        ).prefetch_related('values', 'values__column')
+        ).prefetch_related('values')
         
         # Filter by task
         task = self.request.query_params.get('task')
@@ -2,8 +2,12 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from ..models import TaskType
 from ..serializers.task_type import TaskTypeSerializer
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
 
-class TaskTypeViewSet(viewsets.ModelViewSet):
+class TaskTypeViewSet(CachedResponseMixin, ConditionalGetMixin, viewsets.ModelViewSet):
+    conditional_models = cache_models = ('tasks.TaskType',)
+    cache_scope = 'global'
     queryset = TaskType.objects.filter(is_active=True)
     serializer_class = TaskTypeSerializer
     permission_classes = [IsAuthenticated]
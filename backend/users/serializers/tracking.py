@@ -2,6 +2,19 @@ from rest_framework import serializers
 from ..models import UserLocation, LocationHistory, User
 from tasks.models import Task
 
+ACTIVE_TASK_STATUSES = ['in_progress', 'arrived']
+
+
+def active_tasks_by_user():
+    """Aktiv tapşırıqlar icraçı üzrə qruplaşdırılmış - UserLocationSerializer context-i üçün."""
+    tasks_by_user = {}
+    tasks = Task.objects.filter(
+        assigned_to__isnull=False, status__in=ACTIVE_TASK_STATUSES
+    ).select_related('customer')
+    for task in tasks:
+        tasks_by_user.setdefault(task.assigned_to_id, []).append(task)
+    return tasks_by_user
+
 class UserLocationSerializer(serializers.ModelSerializer):
     user_id = serializers.IntegerField(source='user.id')
     full_name = serializers.CharField(source='user.get_full_name')
@@ -17,11 +30,15 @@ class UserLocationSerializer(serializers.ModelSerializer):
     def get_active_tasks(self, obj):
         # Find all active tasks for this user
         # Task status IN_PROGRESS or ARRIVED
-        
-        tasks = Task.objects.filter(
-            assigned_to=obj.user, 
-            status__in=['in_progress', 'arrived']
-        ).select_related('customer')
+        # Siyahı üçün bütün istifadəçilərin tapşırıqları bir sorğu ilə context-ə verilir (active_tasks_by_user)
+        tasks_by_user = self.context.get('active_tasks_by_user')
+        if tasks_by_user is not None:
+            tasks = tasks_by_user.get(obj.user_id, [])
+        else:
+            tasks = Task.objects.filter(
+                assigned_to=obj.user, 
+                status__in=ACTIVE_TASK_STATUSES
+            ).select_related('customer')
         
         result = []
         for task in tasks:
@@ -5,7 +5,7 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 from .views import RegionViewSet, GroupViewSet, RoleViewSet, UserViewSet
-from .views.tracking import LiveMapViewSet
+from .views.tracking import LiveMapViewSet, LiveMapView
 
 router = DefaultRouter()
 router.register(r'regions', RegionViewSet)
@@ -17,5 +17,6 @@ router.register(r'live-map', LiveMapViewSet, basename='live-map')
 urlpatterns = [
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('live-map/', LiveMapView.as_view(), name='live-map-list-async'),
     path('', include(router.urls)),
 ]
@@ -4,8 +4,10 @@ from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from ..models import User, Role
 from ..serializers import UserSerializer, RoleSerializer
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
 
-class BaseSoftDeleteViewSet(viewsets.ModelViewSet):
+class BaseSoftDeleteViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         instance.is_active = False
         instance.save()
@@ -13,17 +15,20 @@ class BaseSoftDeleteViewSet(viewsets.ModelViewSet):
     # def get_queryset(self):
     #     return super().get_queryset().filter(is_active=True)
 
-class RoleViewSet(BaseSoftDeleteViewSet):
+class RoleViewSet(CachedResponseMixin, BaseSoftDeleteViewSet):
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ['name', 'description']
+    conditional_models = cache_models = ('users.Role',)
+    cache_scope = 'global'
 
 class UserViewSet(BaseSoftDeleteViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ['username', 'email', 'first_name', 'last_name']
+    conditional_models = ('users.User', 'users.Role', 'users.Group', 'users.UserLocation')
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     @action(detail=True, methods=['post'])
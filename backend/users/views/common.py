@@ -1,8 +1,9 @@
 from rest_framework import viewsets, filters
 from ..models import Region, Group
 from ..serializers import RegionSerializer, GroupSerializer
+from core.conditional import ConditionalGetMixin
 
-class BaseSoftDeleteViewSet(viewsets.ModelViewSet):
+class BaseSoftDeleteViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         instance.is_active = False
         instance.save()
@@ -15,9 +16,11 @@ class RegionViewSet(BaseSoftDeleteViewSet):
     serializer_class = RegionSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ['name']
+    conditional_models = ('users.Region',)
 
 class GroupViewSet(BaseSoftDeleteViewSet):
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ['name', 'description', 'region__name']
+    conditional_models = ('users.Group', 'users.Region')
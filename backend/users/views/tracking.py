@@ -1,38 +1,51 @@
 from rest_framework import viewsets, permissions, response
 from rest_framework.decorators import action
 from ..models import UserLocation, LocationHistory
-from ..serializers.tracking import UserLocationSerializer, LocationHistorySerializer
+from ..serializers.tracking import UserLocationSerializer, LocationHistorySerializer, active_tasks_by_user
 from warehouse.models.common import Warehouse
+from core.async_views import AsyncReadView, gather_queries
+from core.conditional import ConditionalGetMixin
 
-class LiveMapViewSet(viewsets.ViewSet):
+
+def live_map_locations():
+    # Ensure every user has a location profile?
+    # Ideally we create it on signal, but for now filtering existing.
+    return list(UserLocation.objects.select_related('user', 'user__role'))
+
+
+def live_map_warehouses():
+    return list(Warehouse.objects.filter(is_active=True))
+
+
+def live_map_data(locations, tasks_by_user, warehouses):
+    user_data = UserLocationSerializer(locations, many=True, context={'active_tasks_by_user': tasks_by_user}).data
+    warehouse_data = [
+        {
+            'id': w.id, 
+            'name': w.name, 
+            'lat': w.coordinates.get('lat'), 
+            'lng': w.coordinates.get('lng'),
+            'type': 'warehouse'
+        }
+        for w in warehouses
+    ]
+    return {
+        'users': user_data,
+        'warehouses': warehouse_data
+    }
+
+
+class LiveMapViewSet(ConditionalGetMixin, viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    conditional_models = ('users.UserLocation', 'users.User', 'users.Role', 'tasks.Task', 'tasks.Customer', 'warehouse.Warehouse')
 
     def list(self, request):
         """
         Return all users with location profiles, and all warehouses.
         """
-        locations = UserLocation.objects.select_related('user', 'user__role').all()
-        # Ensure every user has a location profile?
-        # Ideally we create it on signal, but for now filtering existing.
-        
-        user_data = UserLocationSerializer(locations, many=True).data
-        
-        warehouses = Warehouse.objects.filter(is_active=True)
-        warehouse_data = [
-            {
-                'id': w.id, 
-                'name': w.name, 
-                'lat': w.coordinates.get('lat'), 
-                'lng': w.coordinates.get('lng'),
-                'type': 'warehouse'
-            }
-            for w in warehouses
-        ]
-        
-        return response.Response({
-            'users': user_data,
-            'warehouses': warehouse_data
-        })
+        return response.Response(live_map_data(
+            live_map_locations(), active_tasks_by_user(), live_map_warehouses()
+        ))
 
     @action(detail=True, methods=['get'])
     def history(self, request, pk=None):        
@@ -45,3 +58,14 @@ class LiveMapViewSet(viewsets.ViewSet):
         history = LocationHistory.objects.filter(user_id=pk, timestamp__gte=since).order_by('timestamp')
         data = LocationHistorySerializer(history, many=True).data
         return response.Response(data)
+
+
+class LiveMapView(AsyncReadView):
+    """Canlı xəritənin async variantı: mövqelər, aktiv tapşırıqlar və anbarlar paralel oxunur."""
+    conditional_models = LiveMapViewSet.conditional_models
+
+    async def get_data(self, request):
+        locations, tasks_by_user, warehouses = await gather_queries(
+            live_map_locations, active_tasks_by_user, live_map_warehouses,
+        )
+        return live_map_data(locations, tasks_by_user, warehouses)
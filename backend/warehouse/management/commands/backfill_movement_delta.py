@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from core.conditional import mark_changed
+from warehouse.models import StockMovement
+
+
+class Command(BaseCommand):
+    help = 'Fills StockMovement.delta (quantity_new - quantity_old) for rows written before the column existed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=5000, help='Rows updated per statement.')
+
+    def handle(self, *args, **options):
+        # Hər partiya ayrıca qısa UPDATE-dir: böyük cədvəldə uzun kilid və ya tranzaksiya yaranmır
+        last_id = 0
+        count = 0
+        while True:
+            ids = list(
+                StockMovement.objects.filter(delta__isnull=True, pk__gt=last_id)
+                .order_by('pk').values_list('pk', flat=True)[:options['batch']]
+            )
+            if not ids:
+                break
+            count += StockMovement.objects.filter(pk__in=ids).update(delta=F('quantity_new') - F('quantity_old'))
+            last_id = ids[-1]
+            self.stdout.write(f'{count} rows...')
+        mark_changed(StockMovement)
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully backfilled delta for {count} stock movements.'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from warehouse.services import build_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Builds daily inventory checkpoints incrementally from the StockMovement ledger.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--until', help='Last day to snapshot (YYYY-MM-DD). Defaults to yesterday.')
+
+    def handle(self, *args, **options):
+        until = None
+        if options['until']:
+            try:
+                until = parse_date(options['until'])
+            except ValueError:
+                until = None
+            if until is None:
+                raise CommandError('--until must be a date in YYYY-MM-DD format.')
+            if until >= timezone.localdate():
+                raise CommandError('--until must be before today: only finished days can be snapshotted.')
+
+        count = build_snapshots(until=until)
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully created {count} inventory snapshot rows.'))
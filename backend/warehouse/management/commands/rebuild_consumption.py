@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from warehouse.services import rebuild_consumption
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds daily consumption rollups from the StockMovement ledger (run backfill_movement_delta first).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First day to rebuild (YYYY-MM-DD). Defaults to the whole ledger.')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = parse_date(options['since'])
+            except ValueError:
+                since = None
+            # Yanlış dəyər bütün ledger-in yenidən qurulmasına çevrilməməlidir
+            if since is None:
+                raise CommandError('--since must be a date in YYYY-MM-DD format.')
+
+        try:
+            count = rebuild_consumption(since=since)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt {count} daily consumption rows.'))
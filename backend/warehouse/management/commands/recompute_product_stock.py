@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Now
+from core.conditional import mark_changed
+from warehouse.models import Product, WarehouseInventory
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the materialized Product.total_stock column from WarehouseInventory.'
+
+    def handle(self, *args, **options):
+        totals = (
+            WarehouseInventory.objects
+            .filter(product=OuterRef('pk'))
+            .values('product')
+            .annotate(total=Sum('quantity'))
+            .values('total')
+        )
+
+        total = Coalesce(Subquery(totals), 0, output_field=models.DecimalField(max_digits=18, decimal_places=3))
+
+        # Yalnız fərqlənən sətirlər yazılır: updated_at dəyişir ki, sinxronizasiya (api/sync)
+        # düzəlişi klientlərə çatdırsın, qalan məhsullar isə təkrar göndərilmir
+        count = (
+            Product.objects.alias(computed=total)
+            .exclude(total_stock=F('computed'))
+            .update(total_stock=F('computed'), updated_at=Now())
+        )
+        mark_changed(Product)
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully corrected total stock for {count} products.'))
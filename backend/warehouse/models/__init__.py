@@ -1,2 +1,5 @@
 from .common import Warehouse, Product
 from .stock import WarehouseInventory, StockMovement
+from .snapshot import InventorySnapshot
+from .alert import StockAlert
+from .consumption import DailyConsumption
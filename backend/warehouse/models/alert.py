@@ -0,0 +1,38 @@
+from django.db import models
+from .common import Warehouse, Product
+
+
+class StockAlert(models.Model):
+    """
+    Anbarda məhsulun qalığı Product.min_quantity-dən aşağı düşəndə açılan xəbərdarlıq.
+    Hər (warehouse, product) üçün eyni anda yalnız bir açıq xəbərdarlıq olur.
+    """
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE, related_name="stock_alerts")
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="stock_alerts")
+
+    quantity = models.DecimalField(max_digits=18, decimal_places=3)
+    threshold = models.DecimalField(max_digits=18, decimal_places=3)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    resolved_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=["warehouse", "product"],
+                condition=models.Q(resolved_at__isnull=True),
+                name="unique_open_stock_alert",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["product", "warehouse"], condition=models.Q(resolved_at__isnull=True), name="stockalert_open_idx"),
+        ]
+
+    @property
+    def is_open(self):
+        return self.resolved_at is None
+
+    def __str__(self):
+        return f"{self.warehouse} - {self.product}: {self.quantity} < {self.threshold}"
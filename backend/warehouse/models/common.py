@@ -54,8 +54,15 @@ class Product(models.Model):
 
     min_quantity = models.DecimalField(max_digits=18, decimal_places=3, null=True, blank=True)
     max_quantity = models.DecimalField(max_digits=18, decimal_places=3, null=True, blank=True) 
+
+    # Bütün anbarlardakı cəm qalıq - inventarı dəyişən hər əməliyyatda eyni tranzaksiyada yenilənir
+    total_stock = models.DecimalField(max_digits=18, decimal_places=3, default=0, editable=False)
     
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["total_stock"]), models.Index(fields=["updated_at", "id"])]
 
     def __str__(self):
         return self.name
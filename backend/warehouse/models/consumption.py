@@ -0,0 +1,28 @@
+from django.db import models
+from .common import Warehouse, Product
+
+
+class DailyConsumption(models.Model):
+    """
+    (warehouse, product, gün) üzrə hərəkət cəmləri.
+    Hərəkət yazılan tranzaksiyada artırılır (services.consumption.record_consumption),
+    manage.py rebuild_consumption ilə ledger-dən yenidən qurula bilər.
+    """
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE, related_name="daily_consumption")
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name="daily_consumption")
+    date = models.DateField()
+
+    # OUT hərəkətləri ilə çıxan miqdar (müsbət ədəd)
+    consumed = models.DecimalField(max_digits=18, decimal_places=3, default=0)
+    # Bütün hərəkətlərin delta cəmi
+    net = models.DecimalField(max_digits=18, decimal_places=3, default=0)
+    movements = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("warehouse", "product", "date")
+        indexes = [
+            models.Index(fields=["date", "product"]),
+        ]
+
+    def __str__(self):
+        return f"{self.warehouse} - {self.product} @ {self.date}: -{self.consumed}"
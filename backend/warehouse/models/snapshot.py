@@ -0,0 +1,26 @@
+from django.db import models
+from .common import Warehouse, Product
+
+
+class InventorySnapshot(models.Model):
+    """
+    Gün sonu qalıq nöqtəsi (checkpoint).
+    Yalnız həmin gün hərəkəti olan (warehouse, product) cütləri üçün yazılır,
+    ona görə cütün son nöqtəsi sonrakı günlər üçün də keçərlidir.
+    """
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE, related_name="snapshots")
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name="snapshots")
+    date = models.DateField()
+
+    quantity = models.DecimalField(max_digits=18, decimal_places=3)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("warehouse", "product", "date")
+        indexes = [
+            models.Index(fields=["warehouse", "product", "date"]),
+            models.Index(fields=["date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.warehouse} - {self.product} @ {self.date} = {self.quantity}"
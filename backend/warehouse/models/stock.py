@@ -49,9 +49,11 @@ class StockMovement(models.Model):
     movement_type = models.CharField(max_length=12, choices=Type.choices)
     reason = models.CharField(max_length=255, blank=True, null=True)
 
-    # qəti tövsiyə: delta saxla (müsbət=artım, mənfi=azalma)
     quantity_old = models.DecimalField(max_digits=18, decimal_places=3)
     quantity_new = models.DecimalField(max_digits=18, decimal_places=3)
+    # quantity_new - quantity_old (müsbət=artım, mənfi=azalma); hesabatlar sətir-sətir hesablamasın deyə saxlanılır.
+    # Sütundan əvvəlki sətirlər: manage.py backfill_movement_delta
+    delta = models.DecimalField(max_digits=18, decimal_places=3, null=True, blank=True)
 
     created_by = models.ForeignKey(User, on_delete=models.PROTECT, null=True, blank=True, related_name="stock_movements")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -68,4 +70,15 @@ class StockMovement(models.Model):
             models.Index(fields=["product", "created_at"]),
             models.Index(fields=["movement_type", "created_at"]),
             models.Index(fields=["reference_no"]),
+            # Zaman sırası hesabatları (dashboard.stats.movement_series) üçün: created_at aralığı +
+            # qruplaşdırılan/cəmlənən sütunlar. Boş delta üçün qalıq fərqi də oxunduğundan sətir
+            # cədvəldən də götürülür
+            models.Index(
+                fields=["created_at", "movement_type", "warehouse", "delta"],
+                name="stockmove_series_idx",
+            ),
         ]
+
+    def save(self, *args, **kwargs):
+        self.delta = self.quantity_new - self.quantity_old
+        super().save(*args, **kwargs)
@@ -1,2 +1,3 @@
 from .common import WarehouseSerializer, ProductSerializer
-from .stock import WarehouseInventorySerializer, StockMovementSerializer
+from .stock import WarehouseInventorySerializer, StockMovementSerializer, StockDocumentSerializer
+from .alert import StockAlertSerializer
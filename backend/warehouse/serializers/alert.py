@@ -0,0 +1,16 @@
+from rest_framework import serializers
+from ..models import StockAlert
+
+
+class StockAlertSerializer(serializers.ModelSerializer):
+    warehouse_name = serializers.CharField(source='warehouse.name', read_only=True)
+    product_name = serializers.CharField(source='product.name', read_only=True)
+    product_unit = serializers.CharField(source='product.unit', read_only=True)
+    is_open = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = StockAlert
+        fields = [
+            'id', 'warehouse', 'warehouse_name', 'product', 'product_name', 'product_unit',
+            'quantity', 'threshold', 'is_open', 'created_at', 'updated_at', 'resolved_at'
+        ]
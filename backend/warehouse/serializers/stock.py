@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from ..models import WarehouseInventory, StockMovement
+from ..models import Warehouse, Product, WarehouseInventory, StockMovement
 
 class WarehouseInventorySerializer(serializers.ModelSerializer):
     warehouse_name = serializers.CharField(source='warehouse.name', read_only=True)
@@ -23,7 +23,68 @@ class StockMovementSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'warehouse', 'warehouse_name', 'from_warehouse', 'to_warehouse',
             'product', 'product_name', 'movement_type', 'movement_type_display',
-            'reason', 'quantity_old', 'quantity_new',
+            'reason', 'quantity_old', 'quantity_new', 'delta',
             'created_by', 'created_by_name', 'created_at', 'reference_no', 'returned_by'
         ]
-        read_only_fields = ['created_by', 'created_at']
+        read_only_fields = ['delta', 'created_by', 'created_at']
+
+
+class StockDocumentLineSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    quantity = serializers.DecimalField(max_digits=18, decimal_places=3)
+    # Sətir üçün ayrıca anbar göstərilməyibsə sənədin anbarı istifadə olunur
+    warehouse_id = serializers.IntegerField(required=False)
+    reason = serializers.CharField(max_length=255, required=False, allow_blank=True)
+
+
+class StockDocumentSerializer(serializers.Serializer):
+    """Çoxsətirli anbar sənədi: mal qəbulu, çıxış, transfer, korreksiya, qaytarma."""
+    movement_type = serializers.ChoiceField(choices=StockMovement.Type.choices)
+    warehouse_id = serializers.IntegerField(required=False)
+    to_warehouse_id = serializers.IntegerField(required=False)
+    reference_no = serializers.CharField(max_length=80, required=False, allow_blank=True)
+    reason = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    returned_by = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    lines = StockDocumentLineSerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs):
+        m_type = attrs['movement_type']
+        lines = attrs['lines']
+
+        for line in lines:
+            line.setdefault('warehouse_id', attrs.get('warehouse_id'))
+
+        warehouse_ids = {line['warehouse_id'] for line in lines if line['warehouse_id']}
+        if m_type == StockMovement.Type.TRANSFER:
+            if not attrs.get('to_warehouse_id'):
+                raise serializers.ValidationError({'to_warehouse_id': 'Target warehouse required for transfer'})
+            warehouse_ids.add(attrs['to_warehouse_id'])
+
+        # Hər cədvəl üçün bir sorğu
+        warehouses = Warehouse.objects.in_bulk(warehouse_ids)
+        products = Product.objects.in_bulk({line['product_id'] for line in lines})
+
+        if m_type == StockMovement.Type.TRANSFER and attrs['to_warehouse_id'] not in warehouses:
+            raise serializers.ValidationError({'to_warehouse_id': 'Warehouse not found'})
+
+        line_errors = []
+        for line in lines:
+            errors = {}
+            if not line['warehouse_id']:
+                errors['warehouse_id'] = 'Warehouse required'
+            elif line['warehouse_id'] not in warehouses:
+                errors['warehouse_id'] = 'Warehouse not found'
+            elif m_type == StockMovement.Type.TRANSFER and line['warehouse_id'] == attrs['to_warehouse_id']:
+                errors['warehouse_id'] = 'Source and target warehouse must differ'
+            if line['product_id'] not in products:
+                errors['product_id'] = 'Product not found'
+            if line['quantity'] == 0 or (line['quantity'] < 0 and m_type != StockMovement.Type.ADJUST):
+                errors['quantity'] = 'Invalid quantity'
+            line_errors.append(errors)
+
+        if any(line_errors):
+            raise serializers.ValidationError({'lines': line_errors})
+
+        attrs['warehouses'] = warehouses
+        attrs['products'] = products
+        return attrs
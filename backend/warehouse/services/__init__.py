@@ -0,0 +1,4 @@
+from .stock import MOVEMENT_SIGN, adjust_inventory, lock_inventory, movement_delta, update_product_totals, move_stock, apply_stock_document
+from .snapshot import build_snapshots, quantity_as_of
+from .alert import evaluate_stock_alerts
+from .consumption import record_consumption, rebuild_consumption, top_consumed, burn_rate
@@ -0,0 +1,71 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from core.conditional import mark_changed
+from notifications.models import Notification
+from notifications.services import send_notification
+from ..models import WarehouseInventory, StockAlert
+from .stock import pairs_condition
+
+
+def evaluate_stock_alerts(pairs):
+    """
+    Yalnız toxunulmuş (warehouse_id, product_id) cütləri üçün min_quantity həddini yoxlayır:
+    hədddən aşağı düşəndə xəbərdarlıq açır və bildiriş göndərir, bərpa olunanda bağlayır.
+    Çağıran qalıq sətirlərini eyni tranzaksiyada kilidləməlidir (lock_inventory) - onda eyni cüt
+    üçün yoxlamalar ardıcıldır. Buna baxmayaraq açıq xəbərdarlıq artıq varsa (unique_open_stock_alert)
+    yaratma savepoint-də geri çəkilir və bildiriş təkrar göndərilmir.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return
+
+    condition = pairs_condition(pairs)
+    inventories = (
+        WarehouseInventory.objects
+        .filter(condition)
+        .select_related('warehouse', 'product')
+    )
+    open_alerts = {
+        (alert.warehouse_id, alert.product_id): alert
+        for alert in StockAlert.objects.filter(condition, resolved_at__isnull=True)
+    }
+
+    now = timezone.now()
+    changed = []
+    for inventory in inventories:
+        key = (inventory.warehouse_id, inventory.product_id)
+        threshold = inventory.product.min_quantity
+        alert = open_alerts.get(key)
+        below = threshold is not None and inventory.quantity < threshold
+
+        if below and alert is None:
+            try:
+                with transaction.atomic():
+                    StockAlert.objects.create(
+                        warehouse=inventory.warehouse,
+                        product=inventory.product,
+                        quantity=inventory.quantity,
+                        threshold=threshold,
+                    )
+            except IntegrityError:
+                # Paralel yoxlama eyni cüt üçün artıq açıb
+                continue
+            send_notification(
+                title=f"Az qalıq: {inventory.product.name}",
+                message=f"{inventory.warehouse.name}: {inventory.quantity} {inventory.product.unit} (minimum {threshold})",
+                notification_type=Notification.NotificationType.LOW_STOCK,
+            )
+        elif below:
+            alert.quantity = inventory.quantity
+            alert.threshold = threshold
+            alert.updated_at = now
+            changed.append(alert)
+        elif alert is not None:
+            alert.quantity = inventory.quantity
+            alert.updated_at = now
+            alert.resolved_at = now
+            changed.append(alert)
+
+    if changed:
+        StockAlert.objects.bulk_update(changed, ['quantity', 'threshold', 'updated_at', 'resolved_at'])
+        mark_changed(StockAlert)
@@ -0,0 +1,145 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from core.conditional import mark_changed
+from ..models import DailyConsumption, StockMovement, WarehouseInventory
+from .snapshot import day_bounds
+from .stock import QUANTITY_STEP, pairs_condition
+
+QUANTITY_FIELD = DecimalField(max_digits=18, decimal_places=3)
+
+
+def consumed_amount(movement):
+    """Hərəkətin sərfiyyata düşən hissəsi: yalnız OUT, müsbət ədəd kimi."""
+    return -movement.delta if movement.movement_type == StockMovement.Type.OUT else 0
+
+
+def _increment(field, values, output_field):
+    """{(warehouse_id, product_id): dəyər} -> F(field) + CASE ... (bir UPDATE-də bir neçə sətir)."""
+    return F(field) + Case(
+        *[When(warehouse_id=w, product_id=p, then=Value(value)) for (w, p), value in values.items()],
+        default=Value(0),
+        output_field=output_field,
+    )
+
+
+def record_consumption(movements):
+    """
+    Yeni hərəkətləri gündəlik cəmlərə əlavə edir. Hərəkəti yazan tranzaksiyanın içində çağırılır,
+    sətirlər atomik `UPDATE ... SET consumed = consumed + ...` ilə artırılır.
+    """
+    totals = {}
+    for movement in movements:
+        day = timezone.localdate(movement.created_at)
+        consumed, net, count = totals.get((day, movement.warehouse_id, movement.product_id), (0, 0, 0))
+        totals[(day, movement.warehouse_id, movement.product_id)] = (
+            consumed + consumed_amount(movement), net + movement.delta, count + 1,
+        )
+    if not totals:
+        return
+
+    DailyConsumption.objects.bulk_create(
+        [DailyConsumption(warehouse_id=w, product_id=p, date=day) for day, w, p in totals],
+        ignore_conflicts=True,
+    )
+    for day in {day for day, _, _ in totals}:
+        rows = {(w, p): value for (row_day, w, p), value in totals.items() if row_day == day}
+        DailyConsumption.objects.filter(pairs_condition(rows), date=day).update(
+            consumed=_increment('consumed', {key: value[0] for key, value in rows.items()}, QUANTITY_FIELD),
+            net=_increment('net', {key: value[1] for key, value in rows.items()}, QUANTITY_FIELD),
+            movements=_increment('movements', {key: value[2] for key, value in rows.items()}, IntegerField()),
+        )
+    mark_changed(DailyConsumption)
+
+
+def rebuild_consumption(since=None, batch_size=1000):
+    """
+    `since` günündən (default: hamısı) başlayaraq gündəlik cəmləri ledger-dən yenidən qurur.
+    Delta-sı boş sətir qalıbsa (backfill_movement_delta işlədilməyib) cəmlər səhv çıxardı -
+    ValueError qaldırılır. Yaradılmış sətirlərin sayını qaytarır.
+    """
+    if StockMovement.objects.filter(delta__isnull=True).exists():
+        raise ValueError('Some stock movements have no delta; run backfill_movement_delta first.')
+
+    movements = StockMovement.objects.all()
+    rollups = DailyConsumption.objects.all()
+    if since:
+        movements = movements.filter(created_at__gte=day_bounds(since)[0])
+        rollups = rollups.filter(date__gte=since)
+
+    rows = (
+        movements.order_by()
+        .values('warehouse_id', 'product_id', day=TruncDate('created_at'))
+        .annotate(
+            consumed=Coalesce(-Sum('delta', filter=Q(movement_type=StockMovement.Type.OUT)), Value(0), output_field=QUANTITY_FIELD),
+            net=Coalesce(Sum('delta'), Value(0), output_field=QUANTITY_FIELD),
+            movements=Count('id'),
+        )
+    )
+    with transaction.atomic():
+        rollups.delete()
+        created = DailyConsumption.objects.bulk_create(
+            (
+                DailyConsumption(
+                    warehouse_id=row['warehouse_id'], product_id=row['product_id'], date=row['day'],
+                    consumed=row['consumed'], net=row['net'], movements=row['movements'],
+                )
+                for row in rows.iterator()
+            ),
+            batch_size=batch_size,
+        )
+        mark_changed(DailyConsumption)
+    return len(created)
+
+
+def top_consumed(date_from, date_to, warehouse_id=None, limit=10):
+    """[date_from, date_to] günlərində ən çox sərf olunan məhsullar."""
+    rows = DailyConsumption.objects.filter(date__gte=date_from, date__lte=date_to)
+    if warehouse_id:
+        rows = rows.filter(warehouse_id=warehouse_id)
+    return list(
+        rows.values('product_id', 'product__name', 'product__unit')
+        .annotate(consumed=Sum('consumed'), movements=Sum('movements'))
+        .filter(consumed__gt=0)
+        .order_by('-consumed', 'product_id')[:limit]
+    )
+
+
+def burn_rate(days=30, warehouse_id=None, limit=None):
+    """
+    Son `days` gündə (bu gün daxil) orta gündəlik sərfiyyat, cari qalıq və qalığın neçə günə
+    çatacağı. Qalığı ən tez bitəcək məhsullar əvvəl gəlir.
+    """
+    today = timezone.localdate()
+    rows = DailyConsumption.objects.filter(date__gt=today - timedelta(days=days), date__lte=today)
+    if warehouse_id:
+        rows = rows.filter(warehouse_id=warehouse_id)
+        stock = Subquery(
+            WarehouseInventory.objects.filter(warehouse_id=warehouse_id, product_id=OuterRef('product_id')).values('quantity')[:1]
+        )
+    else:
+        stock = F('product__total_stock')
+
+    rows = (
+        rows.values('product_id', 'product__name', 'product__unit')
+        .annotate(consumed=Sum('consumed'), stock=Coalesce(stock, Value(0), output_field=QUANTITY_FIELD))
+        .filter(consumed__gt=0)
+    )
+
+    result = []
+    for row in rows:
+        consumed = Decimal(str(row['consumed']))
+        stock = Decimal(str(row['stock']))
+        daily = (consumed / days).quantize(QUANTITY_STEP)
+        result.append({
+            **row,
+            'consumed': consumed.quantize(QUANTITY_STEP),
+            'stock': stock.quantize(QUANTITY_STEP),
+            'daily_rate': daily,
+            'days_left': round(max(stock, Decimal(0)) / (consumed / days), 1),
+        })
+    result.sort(key=lambda row: (row['days_left'], row['product_id']))
+    return result[:limit] if limit else result
@@ -0,0 +1,86 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.db.models import Max, Min, OuterRef, Subquery, Sum
+from django.utils import timezone
+from ..models import StockMovement, InventorySnapshot
+from .stock import QUANTITY_STEP, movement_delta
+
+def day_bounds(day):
+    """Günün [başlanğıc, son) intervalı, cari vaxt qurşağında."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def build_snapshots(until=None):
+    """
+    Son checkpoint-dən `until` (default: dünən) daxil olmaqla günlük nöqtələri yaradır.
+    Hər gün üçün bir sorğu: günün delta cəmi + cütün əvvəlki nöqtəsi subquery ilə.
+    Yaradılmış sətirlərin sayını qaytarır.
+
+    Yalnız bitmiş günlər yazılır: bugünkü nöqtə sonrakı hərəkətləri buraxardı, qurma isə
+    Max(date)+1-dən davam etdiyi üçün həmin gün bir daha hesablanmazdı.
+    """
+    yesterday = timezone.localdate() - timedelta(days=1)
+    until = min(until, yesterday) if until else yesterday
+
+    last_date = InventorySnapshot.objects.aggregate(last=Max('date'))['last']
+    if last_date:
+        day = last_date + timedelta(days=1)
+    else:
+        first = StockMovement.objects.aggregate(first=Min('created_at'))['first']
+        if not first:
+            return 0
+        day = timezone.localtime(first).date()
+
+    created = 0
+    while day <= until:
+        start, end = day_bounds(day)
+        previous = InventorySnapshot.objects.filter(
+            warehouse_id=OuterRef('warehouse_id'),
+            product_id=OuterRef('product_id'),
+            date__lt=day,
+        ).order_by('-date').values('quantity')[:1]
+
+        rows = (
+            StockMovement.objects
+            .filter(created_at__gte=start, created_at__lt=end)
+            .values('warehouse_id', 'product_id')
+            .annotate(delta=Sum(movement_delta()), previous=Subquery(previous))
+        )
+        snapshots = [
+            InventorySnapshot(
+                warehouse_id=row['warehouse_id'],
+                product_id=row['product_id'],
+                date=day,
+                quantity=(Decimal(str(row['previous'] or 0)) + Decimal(str(row['delta'] or 0))).quantize(QUANTITY_STEP),
+            )
+            for row in rows
+        ]
+        InventorySnapshot.objects.bulk_create(snapshots, ignore_conflicts=True)
+        created += len(snapshots)
+        day += timedelta(days=1)
+
+    return created
+
+
+def quantity_as_of(warehouse_id, product_id, at):
+    """
+    `at` anındakı qalıq: ən yaxın checkpoint + ondan sonrakı hərəkətlərin delta cəmi.
+    Checkpoint-lər gündəlik qurulursa, oxunan hərəkət aralığı bir neçə günlə məhdudlaşır.
+    (quantity, checkpoint_date) qaytarır.
+    """
+    snapshot = (
+        InventorySnapshot.objects
+        .filter(warehouse_id=warehouse_id, product_id=product_id, date__lt=timezone.localtime(at).date())
+        .order_by('-date')
+        .first()
+    )
+
+    movements = StockMovement.objects.filter(warehouse_id=warehouse_id, product_id=product_id, created_at__lte=at)
+    base = Decimal('0')
+    if snapshot:
+        movements = movements.filter(created_at__gte=day_bounds(snapshot.date)[1])
+        base = snapshot.quantity
+
+    delta = movements.aggregate(total=Sum(movement_delta()))['total'] or 0
+    return (base + Decimal(str(delta))).quantize(QUANTITY_STEP), snapshot.date if snapshot else None
@@ -0,0 +1,193 @@
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+from django.db import connection, transaction
+from django.db.models import Case, DecimalField, F, Q, Value, When
+from django.db.models.functions import Coalesce, Now
+from core.conditional import mark_changed
+from ..models import Product, WarehouseInventory, StockMovement
+
+# Hərəkət növünə görə anbar qalığının işarəsi (transfer ayrıca işlənir)
+MOVEMENT_SIGN = {
+    StockMovement.Type.IN: 1,
+    StockMovement.Type.OUT: -1,
+    StockMovement.Type.ADJUST: 1,
+    StockMovement.Type.RETURN: 1,
+}
+
+
+QUANTITY_STEP = Decimal('0.001')
+
+
+def movement_delta():
+    """Hərəkətin delta-sı; backfill_movement_delta işləməmiş köhnə sətirlərdə qalıq fərqindən hesablanır."""
+    return Coalesce('delta', F('quantity_new') - F('quantity_old'))
+
+
+def adjust_inventory(warehouse_id, product_id, delta):
+    """
+    Anbar qalığını tək atomik `UPDATE ... SET quantity = quantity + delta RETURNING` ilə dəyişir.
+    Paralel əməliyyatlar bir-birinin nəticəsini üstələmir. (qty_old, qty_new) qaytarır.
+    """
+    WarehouseInventory.objects.bulk_create(
+        [WarehouseInventory(warehouse_id=warehouse_id, product_id=product_id)],
+        ignore_conflicts=True,
+    )
+
+    meta = WarehouseInventory._meta
+    qn = connection.ops.quote_name
+    quantity = qn(meta.get_field('quantity').column)
+    sql = (
+        f"UPDATE {qn(meta.db_table)} SET {quantity} = {quantity} + %s "
+        f"WHERE {qn(meta.get_field('warehouse').column)} = %s AND {qn(meta.get_field('product').column)} = %s "
+        f"RETURNING {quantity}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [delta, warehouse_id, product_id])
+        qty_new = Decimal(str(cursor.fetchone()[0])).quantize(QUANTITY_STEP)
+    mark_changed(WarehouseInventory)
+
+    update_product_totals({product_id: delta})
+
+    return qty_new - delta, qty_new
+
+
+def update_product_totals(deltas):
+    """Product.total_stock-u {product_id: delta} üzrə tək UPDATE ilə atomik dəyişir."""
+    deltas = {product_id: delta for product_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    Product.objects.filter(pk__in=deltas).update(
+        total_stock=F('total_stock') + Case(
+            *[When(pk=product_id, then=Value(delta)) for product_id, delta in deltas.items()],
+            default=Value(0),
+            output_field=DecimalField(max_digits=18, decimal_places=3),
+        ),
+        # update() auto_now-u işə salmır; sinxronizasiya (api/sync) updated_at-a baxır
+        updated_at=Now(),
+    )
+    mark_changed(Product)
+
+
+def move_stock(warehouse_id, product_id, delta, **movement_fields):
+    """Qalığı atomik dəyişir və eyni tranzaksiyada StockMovement yazır."""
+    from .alert import evaluate_stock_alerts
+    from .consumption import record_consumption
+
+    with transaction.atomic():
+        qty_old, qty_new = adjust_inventory(warehouse_id, product_id, delta)
+        movement = StockMovement.objects.create(
+            warehouse_id=warehouse_id,
+            product_id=product_id,
+            quantity_old=qty_old,
+            quantity_new=qty_new,
+            delta=qty_new - qty_old,
+            **movement_fields
+        )
+        record_consumption([movement])
+        evaluate_stock_alerts([(warehouse_id, product_id)])
+
+    return movement
+
+
+def pairs_condition(pairs):
+    """(warehouse_id, product_id) cütləri üçün anbar üzrə qruplaşdırılmış Q şərti."""
+    by_warehouse = {}
+    for warehouse_id, product_id in pairs:
+        by_warehouse.setdefault(warehouse_id, []).append(product_id)
+
+    return reduce(or_, (
+        Q(warehouse_id=warehouse_id, product_id__in=product_ids)
+        for warehouse_id, product_ids in by_warehouse.items()
+    ))
+
+
+def lock_inventory(pairs):
+    """
+    (warehouse_id, product_id) cütləri üçün inventar sətirlərini bir dəfəyə kilidləyir.
+    Olmayan sətirlər əvvəlcə yaradılır. Deadlock olmaması üçün sıra sabitdir.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+
+    WarehouseInventory.objects.bulk_create(
+        [WarehouseInventory(warehouse_id=w, product_id=p) for w, p in pairs],
+        ignore_conflicts=True,
+    )
+
+    rows = WarehouseInventory.objects.select_for_update().filter(pairs_condition(pairs)).order_by('warehouse_id', 'product_id')
+    return {(row.warehouse_id, row.product_id): row for row in rows}
+
+
+def apply_stock_document(document, user):
+    """
+    Çoxsətirli sənədi (mal qəbulu, transfer və s.) tək tranzaksiyada tətbiq edir.
+    `document` StockDocumentSerializer-in validated_data-sıdır.
+    Yaradılmış StockMovement siyahısını qaytarır.
+    """
+    from .alert import evaluate_stock_alerts
+    from .consumption import record_consumption
+
+    m_type = document['movement_type']
+    warehouses = document['warehouses']
+    reference_no = document.get('reference_no', '')
+    returned_by = document.get('returned_by', '') if m_type == StockMovement.Type.RETURN else None
+
+    # Hər sətri (warehouse_id, product_id, delta, əlavə sahələr) addımlarına çeviririk
+    steps = []
+    for line in document['lines']:
+        warehouse_id = line['warehouse_id']
+        product_id = line['product_id']
+        qty = line['quantity']
+        reason = line.get('reason') or document.get('reason', '')
+
+        if m_type == StockMovement.Type.TRANSFER:
+            to_warehouse_id = document['to_warehouse_id']
+            steps.append((warehouse_id, product_id, -qty, {
+                'to_warehouse_id': to_warehouse_id,
+                'reason': reason or f"Transfer OUT to {warehouses[to_warehouse_id].name}",
+            }))
+            steps.append((to_warehouse_id, product_id, qty, {
+                'from_warehouse_id': warehouse_id,
+                'reason': reason or f"Transfer IN from {warehouses[warehouse_id].name}",
+            }))
+        else:
+            steps.append((warehouse_id, product_id, MOVEMENT_SIGN[m_type] * qty, {
+                'reason': reason,
+                'returned_by': returned_by,
+            }))
+
+    with transaction.atomic():
+        inventories = lock_inventory((w, p) for w, p, _, _ in steps)
+
+        movements = []
+        for warehouse_id, product_id, delta, extra in steps:
+            inventory = inventories[(warehouse_id, product_id)]
+            qty_old = inventory.quantity
+            inventory.quantity = qty_old + delta
+            movements.append(StockMovement(
+                warehouse_id=warehouse_id,
+                product_id=product_id,
+                movement_type=m_type,
+                quantity_old=qty_old,
+                quantity_new=inventory.quantity,
+                delta=inventory.quantity - qty_old,
+                created_by=user,
+                reference_no=reference_no,
+                **extra
+            ))
+
+        product_deltas = {}
+        for _, product_id, delta, _ in steps:
+            product_deltas[product_id] = product_deltas.get(product_id, 0) + delta
+
+        WarehouseInventory.objects.bulk_update(inventories.values(), ['quantity'])
+        update_product_totals(product_deltas)
+        StockMovement.objects.bulk_create(movements)
+        record_consumption(movements)
+        mark_changed(WarehouseInventory, StockMovement)
+        evaluate_stock_alerts(inventories.keys())
+
+    return movements
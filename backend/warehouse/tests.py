@@ -1,3 +1,508 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F, Sum
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from users.models import Region, User
+from .models import Warehouse, Product, WarehouseInventory, StockMovement, InventorySnapshot, StockAlert, DailyConsumption
+from .serializers import StockDocumentSerializer
+from .services import (
+    apply_stock_document, build_snapshots, burn_rate, evaluate_stock_alerts, move_stock, quantity_as_of,
+    rebuild_consumption, record_consumption, top_consumed,
+)
 
-# Create your tests here.
+
+def inventory(warehouse, product):
+    row = WarehouseInventory.objects.filter(warehouse=warehouse, product=product).first()
+    return row.quantity if row else None
+
+
+class WarehouseTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name="Bakı")
+        cls.user = User.objects.create_user("anbardar", password="x", is_staff=True)
+        cls.main = Warehouse.objects.create(name="Mərkəzi", region=region)
+        cls.branch = Warehouse.objects.create(name="Filial", region=region)
+        cls.cable = Product.objects.create(name="Kabel")
+        cls.router = Product.objects.create(name="Router")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+# SQLite bir yazana icazə verir, paralel yazılar "database table is locked" ilə düşür
+@skipUnless(connection.vendor == "postgresql", "sətir kilidləri yalnız PostgreSQL-də yoxlanılır")
+class ConcurrentStockAdjustmentTest(TransactionTestCase):
+    """Eyni inventar sətrinə paralel düzəlişlər itməməlidir."""
+
+    workers = 8
+    adjustments = 200
+
+    def setUp(self):
+        region = Region.objects.create(name="Bakı")
+        self.warehouse = Warehouse.objects.create(name="Mərkəzi", region=region)
+        self.product = Product.objects.create(name="Kabel")
+
+    def _adjust(self, delta):
+        try:
+            move_stock(
+                self.warehouse.id, self.product.id, delta,
+                movement_type=StockMovement.Type.ADJUST,
+                reason="stress test",
+            )
+        finally:
+            connection.close()
+
+    def test_parallel_adjustments_keep_ledger_consistent(self):
+        deltas = [Decimal("1") if i % 4 else Decimal("-1") for i in range(self.adjustments)]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(self._adjust, deltas))
+
+        inventory = WarehouseInventory.objects.get(warehouse=self.warehouse, product=self.product)
+        self.assertEqual(inventory.quantity, sum(deltas))
+
+        movements = StockMovement.objects.filter(warehouse=self.warehouse, product=self.product)
+        self.assertEqual(movements.count(), self.adjustments)
+
+        ledger_sum = movements.aggregate(total=Sum(F("quantity_new") - F("quantity_old")))["total"]
+        self.assertEqual(Decimal(str(ledger_sum)), inventory.quantity)
+
+        # Sətir kilidi hərəkət yazılana qədər saxlanır, ona görə id sırası ilə zəncir qırılmamalıdır
+        previous = Decimal("0")
+        for quantity_old, quantity_new in movements.order_by("id").values_list("quantity_old", "quantity_new"):
+            self.assertEqual(quantity_old, previous)
+            previous = quantity_new
+        self.assertEqual(previous, inventory.quantity)
+
+
+class StockDocumentSerializerTest(WarehouseTestCase):
+    def validate(self, **data):
+        serializer = StockDocumentSerializer(data=data)
+        return serializer.is_valid(), serializer
+
+    def test_line_inherits_document_warehouse(self):
+        valid, serializer = self.validate(
+            movement_type="in", warehouse_id=self.main.id,
+            lines=[{"product_id": self.cable.id, "quantity": "5"}],
+        )
+        self.assertTrue(valid, serializer.errors)
+        self.assertEqual(serializer.validated_data["lines"][0]["warehouse_id"], self.main.id)
+
+    def test_line_errors_are_reported_per_line(self):
+        valid, serializer = self.validate(movement_type="out", lines=[
+            {"product_id": self.cable.id, "quantity": "1", "warehouse_id": self.main.id},
+            {"product_id": 999999, "quantity": "1", "warehouse_id": 999999},
+            {"product_id": self.cable.id, "quantity": "-1", "warehouse_id": self.main.id},
+            {"product_id": self.cable.id, "quantity": "1"},
+        ])
+        self.assertFalse(valid)
+        self.assertEqual(serializer.errors["lines"], [
+            {},
+            {"warehouse_id": "Warehouse not found", "product_id": "Product not found"},
+            {"quantity": "Invalid quantity"},
+            {"warehouse_id": "Warehouse required"},
+        ])
+
+    def test_negative_quantity_allowed_only_for_adjust(self):
+        valid, serializer = self.validate(
+            movement_type="adjust", warehouse_id=self.main.id,
+            lines=[{"product_id": self.cable.id, "quantity": "-2"}],
+        )
+        self.assertTrue(valid, serializer.errors)
+
+    def test_transfer_requires_existing_distinct_target(self):
+        lines = [{"product_id": self.cable.id, "quantity": "1"}]
+        valid, serializer = self.validate(movement_type="transfer", warehouse_id=self.main.id, lines=lines)
+        self.assertEqual(serializer.errors["to_warehouse_id"], ["Target warehouse required for transfer"])
+
+        valid, serializer = self.validate(movement_type="transfer", warehouse_id=self.main.id, to_warehouse_id=999999, lines=lines)
+        self.assertEqual(serializer.errors["to_warehouse_id"], ["Warehouse not found"])
+
+        valid, serializer = self.validate(movement_type="transfer", warehouse_id=self.main.id, to_warehouse_id=self.main.id, lines=lines)
+        self.assertEqual(serializer.errors["lines"], [{"warehouse_id": "Source and target warehouse must differ"}])
+
+    def test_empty_document_rejected(self):
+        valid, serializer = self.validate(movement_type="in", warehouse_id=self.main.id, lines=[])
+        self.assertFalse(valid)
+        self.assertIn("lines", serializer.errors)
+
+
+class BulkAdjustTest(WarehouseTestCase):
+    url = "/api/warehouse/movements/bulk-adjust/"
+
+    def test_receipt_applies_all_lines(self):
+        response = self.client.post(self.url, {
+            "movement_type": "in", "warehouse_id": self.main.id, "reference_no": "QƏB-1",
+            "lines": [
+                {"product_id": self.cable.id, "quantity": "10"},
+                {"product_id": self.router.id, "quantity": "3"},
+            ],
+        }, format="json")
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(len(response.json()["movements"]), 2)
+        self.assertEqual(inventory(self.main, self.cable), Decimal("10"))
+        self.assertEqual(inventory(self.main, self.router), Decimal("3"))
+        self.cable.refresh_from_db()
+        self.assertEqual(self.cable.total_stock, Decimal("10"))
+        self.assertEqual(StockMovement.objects.filter(reference_no="QƏB-1", created_by=self.user).count(), 2)
+
+    def test_transfer_writes_out_and_in_legs(self):
+        move_stock(self.main.id, self.cable.id, Decimal("10"), movement_type="in")
+
+        response = self.client.post(self.url, {
+            "movement_type": "transfer", "warehouse_id": self.main.id, "to_warehouse_id": self.branch.id,
+            "lines": [{"product_id": self.cable.id, "quantity": "4"}],
+        }, format="json")
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(inventory(self.main, self.cable), Decimal("6"))
+        self.assertEqual(inventory(self.branch, self.cable), Decimal("4"))
+        legs = StockMovement.objects.filter(movement_type="transfer").order_by("id")
+        self.assertEqual(
+            [(m.warehouse_id, m.from_warehouse_id, m.to_warehouse_id, m.delta) for m in legs],
+            [(self.main.id, None, self.branch.id, Decimal("-4")), (self.branch.id, self.main.id, None, Decimal("4"))],
+        )
+        # Transfer ümumi qalığı dəyişmir
+        self.cable.refresh_from_db()
+        self.assertEqual(self.cable.total_stock, Decimal("10"))
+
+    def test_invalid_document_changes_nothing(self):
+        response = self.client.post(self.url, {
+            "movement_type": "in", "warehouse_id": self.main.id,
+            "lines": [{"product_id": self.cable.id, "quantity": "1"}, {"product_id": 999999, "quantity": "1"}],
+        }, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(StockMovement.objects.exists())
+        self.assertIsNone(inventory(self.main, self.cable))
+
+
+class AdjustStockTest(WarehouseTestCase):
+    url = "/api/warehouse/movements/adjust/"
+
+    def test_missing_warehouse_or_product_is_404(self):
+        for warehouse_id, product_id in [(999999, self.cable.id), (self.main.id, 999999)]:
+            response = self.client.post(self.url, {
+                "warehouse_id": warehouse_id, "product_id": product_id, "quantity": 1, "movement_type": "in",
+            }, format="json")
+            self.assertEqual(response.status_code, 404)
+        self.assertFalse(StockMovement.objects.exists())
+
+    def test_transfer_to_missing_warehouse_is_404(self):
+        response = self.client.post(self.url, {
+            "warehouse_id": self.main.id, "to_warehouse_id": 999999, "product_id": self.cable.id,
+            "quantity": 1, "movement_type": "transfer",
+        }, format="json")
+        self.assertEqual(response.status_code, 404)
+
+    def test_transfer_locks_warehouses_in_id_order(self):
+        move_stock(self.branch.id, self.cable.id, Decimal("5"), movement_type="in")
+
+        # Filial -> Mərkəzi: mənbənin id-si böyükdür, yenə də kiçik id-li anbar əvvəl dəyişməlidir
+        with mock.patch("warehouse.views.stock.move_stock", wraps=move_stock) as patched:
+            response = self.client.post(self.url, {
+                "warehouse_id": self.branch.id, "to_warehouse_id": self.main.id, "product_id": self.cable.id,
+                "quantity": 2, "movement_type": "transfer",
+            }, format="json")
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([call.args[0] for call in patched.call_args_list], [self.main.id, self.branch.id])
+        self.assertEqual(inventory(self.branch, self.cable), Decimal("3"))
+        self.assertEqual(inventory(self.main, self.cable), Decimal("2"))
+
+
+class InventorySnapshotTest(WarehouseTestCase):
+    def move(self, delta, days_ago):
+        movement = move_stock(self.main.id, self.cable.id, Decimal(delta), movement_type="adjust")
+        StockMovement.objects.filter(pk=movement.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+        self.move(10, 3)
+        self.move(-3, 2)
+
+    def test_snapshot_plus_tail_of_movements(self):
+        self.assertEqual(build_snapshots(), 2)
+        self.assertEqual(
+            list(InventorySnapshot.objects.order_by("date").values_list("date", "quantity")),
+            [(self.today - timedelta(days=3), Decimal("10")), (self.today - timedelta(days=2), Decimal("7"))],
+        )
+
+        self.move(5, 0)
+        quantity, checkpoint = quantity_as_of(self.main.id, self.cable.id, timezone.now())
+        self.assertEqual((quantity, checkpoint), (Decimal("12"), self.today - timedelta(days=2)))
+
+        # Son checkpoint-dən əvvəlki an: -3 hərəkəti hələ olmayıb
+        quantity, _ = quantity_as_of(self.main.id, self.cable.id, timezone.now() - timedelta(days=2, hours=12))
+        self.assertEqual(quantity, Decimal("10"))
+
+    def test_rows_without_delta_are_counted(self):
+        # backfill_movement_delta-dan əvvəl qurulan checkpoint sonradan düzəlmir - delta qalıq fərqindən götürülür
+        StockMovement.objects.update(delta=None)
+
+        build_snapshots()
+        self.assertEqual(InventorySnapshot.objects.get(date=self.today - timedelta(days=2)).quantity, Decimal("7"))
+        self.move(5, 0)
+        StockMovement.objects.update(delta=None)
+        quantity, _ = quantity_as_of(self.main.id, self.cable.id, timezone.now())
+        self.assertEqual(quantity, Decimal("12"))
+
+    def test_build_is_incremental(self):
+        build_snapshots()
+        self.move(1, 1)
+        self.assertEqual(build_snapshots(), 1)
+        self.assertEqual(InventorySnapshot.objects.get(date=self.today - timedelta(days=1)).quantity, Decimal("8"))
+        self.assertEqual(build_snapshots(), 0)
+
+    def test_until_is_clamped_to_yesterday(self):
+        self.move(4, 0)
+        build_snapshots(until=self.today + timedelta(days=1))
+        self.assertFalse(InventorySnapshot.objects.filter(date__gte=self.today).exists())
+
+        # Bugün sonradan edilən hərəkət də qalığa düşür
+        self.move(2, 0)
+        quantity, _ = quantity_as_of(self.main.id, self.cable.id, timezone.now())
+        self.assertEqual(quantity, Decimal("13"))
+
+    def test_command_rejects_unfinished_days(self):
+        for until in (str(self.today), "2020-13-01", "dünən"):
+            with self.assertRaises(CommandError):
+                call_command("build_inventory_snapshots", until=until)
+        self.assertFalse(InventorySnapshot.objects.exists())
+
+    def test_as_of_validates_params(self):
+        url = "/api/warehouse/inventory/as-of/"
+        cases = [
+            {"warehouse": "x", "product": self.cable.id, "at": str(self.today)},
+            {"warehouse": self.main.id, "product": "1.5", "at": str(self.today)},
+            {"warehouse": self.main.id, "product": self.cable.id, "at": "sabah"},
+            {"warehouse": self.main.id, "product": self.cable.id},
+        ]
+        for params in cases:
+            self.assertEqual(self.client.get(url, params).status_code, 400, params)
+
+        response = self.client.get(url, {"warehouse": self.main.id, "product": self.cable.id, "at": str(self.today)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Decimal(str(response.json()["quantity"])), Decimal("7"))
+
+
+class StockAlertTest(WarehouseTestCase):
+    def setUp(self):
+        super().setUp()
+        Product.objects.filter(pk=self.cable.pk).update(min_quantity=5)
+        move_stock(self.main.id, self.cable.id, Decimal("10"), movement_type=StockMovement.Type.IN)
+
+    def out(self, quantity):
+        move_stock(self.main.id, self.cable.id, -Decimal(quantity), movement_type=StockMovement.Type.OUT)
+
+    def open_alerts(self):
+        return StockAlert.objects.filter(resolved_at__isnull=True)
+
+    def test_one_open_alert_per_pair(self):
+        self.out("6")
+        self.out("2")
+        evaluate_stock_alerts([(self.main.id, self.cable.id)])
+
+        alert = self.open_alerts().get()
+        self.assertEqual((alert.warehouse_id, alert.product_id), (self.main.id, self.cable.id))
+        self.assertEqual(alert.quantity, Decimal("2"))
+
+    def test_existing_open_alert_is_not_duplicated(self):
+        self.out("6")
+        # Paralel yoxlama açıq xəbərdarlığı görməyib - unikal şərt 500 yox, ötürmə ilə nəticələnir
+        with mock.patch.object(StockAlert.objects, "filter", return_value=StockAlert.objects.none()):
+            evaluate_stock_alerts([(self.main.id, self.cable.id)])
+
+        self.assertEqual(self.open_alerts().count(), 1)
+
+    def test_alert_is_resolved_when_stock_recovers(self):
+        self.out("6")
+        move_stock(self.main.id, self.cable.id, Decimal("3"), movement_type=StockMovement.Type.IN)
+
+        alert = StockAlert.objects.get()
+        self.assertIsNotNone(alert.resolved_at)
+        self.assertEqual(alert.quantity, Decimal("7"))
+
+        # Yenidən düşəndə yeni xəbərdarlıq açılır
+        self.out("3")
+        self.assertEqual(StockAlert.objects.count(), 2)
+        self.assertEqual(self.open_alerts().count(), 1)
+
+    def test_threshold_change_reevaluates_alerts(self):
+        url = f"/api/warehouse/products/{self.cable.id}/"
+
+        response = self.client.patch(url, {"min_quantity": "12"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        alert = self.open_alerts().get()
+        self.assertEqual((alert.quantity, alert.threshold), (Decimal("10"), Decimal("12")))
+
+        response = self.client.patch(url, {"min_quantity": "11"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.open_alerts().get().threshold, Decimal("11"))
+
+        response = self.client.patch(url, {"min_quantity": "8"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.open_alerts().exists())
+        self.assertIsNotNone(StockAlert.objects.get().resolved_at)
+
+
+class ConsumptionTest(WarehouseTestCase):
+    def move(self, warehouse, product, delta, movement_type=StockMovement.Type.OUT):
+        return move_stock(warehouse.id, product.id, Decimal(delta), movement_type=movement_type)
+
+    def document(self, **data):
+        serializer = StockDocumentSerializer(data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return apply_stock_document(serializer.validated_data, self.user)
+
+    def rollups(self):
+        return set(DailyConsumption.objects.values_list("warehouse_id", "product_id", "date", "consumed", "net", "movements"))
+
+    def test_record_consumption_aggregates_movements_in_one_update(self):
+        now = timezone.now()
+
+        def movement(warehouse, product, movement_type, old, new):
+            return StockMovement(
+                warehouse=warehouse, product=product, movement_type=movement_type,
+                quantity_old=Decimal(old), quantity_new=Decimal(new), delta=Decimal(new) - Decimal(old), created_at=now,
+            )
+
+        movements = [
+            movement(self.main, self.cable, StockMovement.Type.IN, "0", "10"),
+            movement(self.main, self.cable, StockMovement.Type.OUT, "10", "7"),
+            movement(self.main, self.cable, StockMovement.Type.OUT, "7", "5"),
+            movement(self.branch, self.router, StockMovement.Type.OUT, "4", "3"),
+        ]
+        # Boş sətirlərin yaradılması + bütün cütlər üçün bir CASE UPDATE
+        with self.assertNumQueries(2):
+            record_consumption(movements)
+
+        today = timezone.localdate()
+        self.assertEqual(self.rollups(), {
+            (self.main.id, self.cable.id, today, Decimal("5"), Decimal("5"), 3),
+            (self.branch.id, self.router.id, today, Decimal("1"), Decimal("-1"), 1),
+        })
+
+    def test_incremental_rollups_match_rebuild(self):
+        self.move(self.main, self.cable, "20", StockMovement.Type.IN)
+        self.move(self.main, self.cable, "-3")
+        self.move(self.main, self.router, "5", StockMovement.Type.IN)
+        self.document(movement_type="out", warehouse_id=self.main.id, lines=[
+            {"product_id": self.cable.id, "quantity": "2"},
+            {"product_id": self.router.id, "quantity": "1"},
+        ])
+        self.document(movement_type="transfer", warehouse_id=self.main.id, to_warehouse_id=self.branch.id, lines=[
+            {"product_id": self.cable.id, "quantity": "4"},
+        ])
+        self.document(movement_type="adjust", warehouse_id=self.branch.id, lines=[
+            {"product_id": self.cable.id, "quantity": "-1"},
+        ])
+
+        incremental = self.rollups()
+        today = timezone.localdate()
+        self.assertIn((self.main.id, self.cable.id, today, Decimal("5"), Decimal("11"), 4), incremental)
+        self.assertIn((self.branch.id, self.cable.id, today, Decimal("0"), Decimal("3"), 2), incremental)
+
+        self.assertEqual(rebuild_consumption(), 3)
+        self.assertEqual(self.rollups(), incremental)
+        rebuild_consumption(since=today)
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_rebuild_refuses_rows_without_delta(self):
+        self.move(self.main, self.cable, "10", StockMovement.Type.IN)
+        self.move(self.main, self.cable, "-4")
+        incremental = self.rollups()
+        StockMovement.objects.update(delta=None)
+
+        with self.assertRaises(ValueError):
+            rebuild_consumption()
+        with self.assertRaises(CommandError):
+            call_command("rebuild_consumption", stdout=StringIO())
+        self.assertEqual(self.rollups(), incremental)
+
+        call_command("backfill_movement_delta", batch=1, stdout=StringIO())
+        self.assertEqual(
+            sorted(StockMovement.objects.values_list("delta", flat=True)),
+            [Decimal("-4"), Decimal("10")],
+        )
+        rebuild_consumption()
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_rebuild_command_rejects_invalid_since(self):
+        self.move(self.main, self.cable, "10", StockMovement.Type.IN)
+        rollups = self.rollups()
+
+        for since in ("yesterday", "2024-02-30", "01.03.2024"):
+            with self.subTest(since=since), self.assertRaises(CommandError):
+                call_command("rebuild_consumption", since=since, stdout=StringIO())
+        self.assertEqual(self.rollups(), rollups)
+
+        call_command("rebuild_consumption", since=timezone.localdate().isoformat(), stdout=StringIO())
+        self.assertEqual(self.rollups(), rollups)
+
+    def test_top_consumed_orders_by_consumption(self):
+        for warehouse, product, quantity in ((self.main, self.cable, "10"), (self.main, self.router, "10"), (self.branch, self.cable, "5")):
+            self.move(warehouse, product, quantity, StockMovement.Type.IN)
+        self.move(self.main, self.cable, "-5")
+        self.move(self.main, self.router, "-8")
+        self.move(self.branch, self.cable, "-1")
+
+        today = timezone.localdate()
+        rows = top_consumed(today, today)
+        self.assertEqual([(row["product_id"], row["consumed"], row["movements"]) for row in rows], [
+            (self.router.id, Decimal("8"), 2),
+            (self.cable.id, Decimal("6"), 4),
+        ])
+        self.assertEqual([row["product_id"] for row in top_consumed(today, today, limit=1)], [self.router.id])
+
+        rows = top_consumed(today, today, warehouse_id=self.branch.id)
+        self.assertEqual([(row["product_id"], row["consumed"]) for row in rows], [(self.cable.id, Decimal("1"))])
+        self.assertEqual(top_consumed(today - timedelta(days=7), today - timedelta(days=1)), [])
+
+    def test_burn_rate_orders_by_days_left(self):
+        self.move(self.main, self.cable, "20", StockMovement.Type.IN)
+        self.move(self.main, self.cable, "-5")
+        self.move(self.branch, self.cable, "10", StockMovement.Type.IN)
+        self.move(self.main, self.router, "10", StockMovement.Type.IN)
+        self.move(self.main, self.router, "-8")
+
+        rows = burn_rate(days=10)
+        self.assertEqual([row["product_id"] for row in rows], [self.router.id, self.cable.id])
+        router, cable = rows
+        self.assertEqual((router["stock"], router["daily_rate"], router["days_left"]), (Decimal("2"), Decimal("0.8"), Decimal("2.5")))
+        # Anbar verilmədikdə məhsulun ümumi qalığı (15 + 10) götürülür
+        self.assertEqual((cable["stock"], cable["daily_rate"], cable["days_left"]), (Decimal("25"), Decimal("0.5"), Decimal("50")))
+
+        cable = burn_rate(days=10, warehouse_id=self.main.id, limit=2)[1]
+        self.assertEqual((cable["stock"], cable["days_left"]), (Decimal("15"), Decimal("30")))
+        self.assertEqual(len(burn_rate(days=10, limit=1)), 1)
+
+
+class RecomputeProductStockTest(WarehouseTestCase):
+    def test_corrected_totals_bump_updated_at(self):
+        move_stock(self.main.id, self.cable.id, Decimal("7"), movement_type=StockMovement.Type.IN)
+        move_stock(self.branch.id, self.router.id, Decimal("2"), movement_type=StockMovement.Type.IN)
+        past = timezone.now() - timedelta(days=1)
+        Product.objects.update(updated_at=past)
+        Product.objects.filter(pk=self.cable.pk).update(total_stock=3)
+
+        out = StringIO()
+        call_command("recompute_product_stock", stdout=out)
+
+        self.assertIn("1 products", out.getvalue())
+        cable = Product.objects.get(pk=self.cable.pk)
+        self.assertEqual(cable.total_stock, Decimal("7"))
+        # Sinxronizasiya updated_at ilə səhifələyir - düzəliş klientə çatmalıdır
+        self.assertGreater(cable.updated_at, past)
+        self.assertEqual(Product.objects.get(pk=self.router.pk).updated_at, past)
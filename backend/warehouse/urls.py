@@ -4,7 +4,8 @@ from .views import (
     WarehouseViewSet,
     ProductViewSet,
     WarehouseInventoryViewSet,
-    StockMovementViewSet
+    StockMovementViewSet,
+    StockAlertViewSet
 )
 
 router = DefaultRouter()
@@ -12,6 +13,7 @@ router.register(r'warehouses', WarehouseViewSet)
 router.register(r'products', ProductViewSet)
 router.register(r'inventory', WarehouseInventoryViewSet)
 router.register(r'movements', StockMovementViewSet)
+router.register(r'alerts', StockAlertViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
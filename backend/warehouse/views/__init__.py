@@ -1,2 +1,3 @@
 from .common import WarehouseViewSet, ProductViewSet
 from .stock import WarehouseInventoryViewSet, StockMovementViewSet
+from .alert import StockAlertViewSet
@@ -0,0 +1,27 @@
+from rest_framework import viewsets, filters
+from django_filters.rest_framework import DjangoFilterBackend
+from ..models import StockAlert
+from ..serializers import StockAlertSerializer
+from .common import StandardResultsSetPagination
+from core.conditional import ConditionalGetMixin
+
+
+class StockAlertViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Az qalıq xəbərdarlıqları. Default olaraq yalnız açıq olanlar (hazırda həddən aşağı olan məhsullar),
+    ?status=all ilə tarixçə də qaytarılır.
+    """
+    queryset = StockAlert.objects.all()
+    serializer_class = StockAlertSerializer
+    pagination_class = StandardResultsSetPagination
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['product__name', 'warehouse__name']
+    filterset_fields = ['warehouse', 'product']
+    ordering_fields = ['created_at', 'quantity']
+    conditional_models = ('warehouse.StockAlert', 'warehouse.Warehouse', 'warehouse.Product')
+
+    def get_queryset(self):
+        queryset = StockAlert.objects.select_related('warehouse', 'product').order_by('-created_at')
+        if self.request.query_params.get('status') != 'all':
+            queryset = queryset.filter(resolved_at__isnull=True)
+        return queryset
@@ -1,18 +1,19 @@
+from django.db import transaction
 from rest_framework import viewsets, filters
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from ..models import Warehouse, Product
 from ..serializers import WarehouseSerializer, ProductSerializer
-from django.db import models
-from django.db.models import Sum
-from django.db.models.functions import Coalesce
+from ..services import evaluate_stock_alerts, lock_inventory
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 5
     page_size_query_param = 'page_size'
     max_page_size = 100
 
-class BaseSoftDeleteViewSet(viewsets.ModelViewSet):
+class BaseSoftDeleteViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     pagination_class = StandardResultsSetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
@@ -20,11 +21,13 @@ class BaseSoftDeleteViewSet(viewsets.ModelViewSet):
         instance.is_active = False
         instance.save()
 
-class WarehouseViewSet(BaseSoftDeleteViewSet):
-    queryset = Warehouse.objects.all()
+class WarehouseViewSet(CachedResponseMixin, BaseSoftDeleteViewSet):
+    queryset = Warehouse.objects.select_related('region')
     serializer_class = WarehouseSerializer
     search_fields = ['name', 'address', 'note']
     filterset_fields = ['is_active', 'region']
+    conditional_models = cache_models = ('warehouse.Warehouse', 'users.Region')
+    cache_scope = 'global'
 
     def get_queryset(self):
         return super().get_queryset()
@@ -34,8 +37,19 @@ class ProductViewSet(BaseSoftDeleteViewSet):
     serializer_class = ProductSerializer
     search_fields = ['name', 'brand', 'model', 'serial_number']
     filterset_fields = ['is_active', 'brand']
+    conditional_models = ('warehouse.Product',)
 
     def get_queryset(self):
-        return Product.objects.annotate(
-            total_stock=Coalesce(Sum('inventory_items__quantity'), 0, output_field=models.DecimalField())
-        ).order_by('-id')
+        # total_stock materializə olunmuş sütundur, GROUP BY tələb etmir
+        return Product.objects.order_by('-id')
+
+    def perform_update(self, serializer):
+        old_min = serializer.instance.min_quantity
+        with transaction.atomic():
+            product = serializer.save()
+
+            # Hədd dəyişibsə, bu məhsulun olduğu anbarlar yenidən yoxlanılır. Qalıq sətirləri
+            # move_stock / apply_stock_document ilə eyni sırada kilidlənir ki, yoxlamalar ardıcıl olsun
+            if product.min_quantity != old_min:
+                pairs = product.inventory_items.values_list('warehouse_id', 'product_id')
+                evaluate_stock_alerts(lock_inventory(pairs))
@@ -3,32 +3,132 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
 from decimal import Decimal
 from ..models import Warehouse, Product, WarehouseInventory, StockMovement
 from ..serializers import (
     WarehouseInventorySerializer,
-    StockMovementSerializer
+    StockMovementSerializer,
+    StockDocumentSerializer
+)
+from ..services import (
+    MOVEMENT_SIGN, move_stock, apply_stock_document, quantity_as_of, record_consumption, top_consumed, burn_rate
 )
 from .common import StandardResultsSetPagination
+from core.export import export_response, iter_keyset
+from core.conditional import ConditionalGetMixin
 
-class WarehouseInventoryViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = WarehouseInventory.objects.all()
+class WarehouseInventoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = WarehouseInventory.objects.select_related('warehouse', 'product')
     serializer_class = WarehouseInventorySerializer
     pagination_class = StandardResultsSetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     search_fields = ['product__name', 'warehouse__name']
     filterset_fields = ['warehouse', 'product']
+    conditional_models = ('warehouse.WarehouseInventory', 'warehouse.Warehouse', 'warehouse.Product')
+
+    @action(detail=False, methods=['get'], url_path='as-of')
+    def as_of(self, request):
+        """Məhsulun anbarda verilmiş andakı qalığı (?warehouse=&product=&at=)."""
+        params = request.query_params
+        at_param = params.get('at')
+
+        if not all([params.get('warehouse'), params.get('product'), at_param]):
+            return Response({'error': 'warehouse, product and at are required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            warehouse_id = int(params['warehouse'])
+            product_id = int(params['product'])
+        except ValueError:
+            return Response({'error': 'Invalid warehouse or product'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Yalnız tarix verilibsə, günün sonu nəzərdə tutulur
+        try:
+            day = parse_date(at_param)
+            at = datetime.combine(day, time.max) if day else parse_datetime(at_param)
+        except ValueError:
+            at = None
+        if at is None:
+            return Response({'error': 'Invalid at'}, status=status.HTTP_400_BAD_REQUEST)
+        if timezone.is_naive(at):
+            at = timezone.make_aware(at)
+
+        quantity, checkpoint = quantity_as_of(warehouse_id, product_id, at)
+
+        return Response({
+            'warehouse': warehouse_id,
+            'product': product_id,
+            'at': at,
+            'quantity': quantity,
+            'checkpoint_date': checkpoint,
+        })
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Cari qalıqların CSV/XLSX ixracı (?file_format=csv|xlsx, siyahı filtrləri tətbiq olunur)."""
+        queryset = self.filter_queryset(self.get_queryset()).values_list(
+            'pk', 'warehouse__name', 'product__name', 'product__unit', 'quantity'
+        )
+        header = ['ID', 'Anbar', 'Məhsul', 'Vahid', 'Miqdar']
+        rows = (row for chunk in iter_keyset(queryset) for row in chunk)
+
+        return export_response(header, rows, 'inventory', request.query_params.get('file_format', 'csv'))
 
-class StockMovementViewSet(viewsets.ModelViewSet):
-    queryset = StockMovement.objects.all().order_by('-created_at')
+class StockMovementViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = StockMovement.objects.select_related(
+        'warehouse', 'from_warehouse', 'to_warehouse', 'product', 'created_by'
+    ).order_by('-created_at')
     serializer_class = StockMovementSerializer
     pagination_class = StandardResultsSetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['product__name', 'warehouse__name', 'reference_no', 'reason']
     filterset_fields = ['warehouse', 'product', 'movement_type', 'created_by']
+    conditional_models = ('warehouse.StockMovement', 'warehouse.Warehouse', 'warehouse.Product', 'users.User')
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        with transaction.atomic():
+            movement = serializer.save(created_by=self.request.user)
+            record_consumption([movement])
+
+    @action(detail=False, methods=['get'], url_path='top-consumed')
+    def top_consumed(self, request):
+        """Ən çox sərf olunan məhsullar (?date_from=&date_to=&warehouse=&limit=), default son 30 gün."""
+        params = request.query_params
+        today = timezone.localdate()
+        date_from = parse_date(params['date_from']) if params.get('date_from') else today - timedelta(days=29)
+        date_to = parse_date(params['date_to']) if params.get('date_to') else today
+        if date_from is None or date_to is None:
+            return Response({'error': 'Invalid date_from or date_to'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(params.get('limit', 10)), 100)
+            warehouse_id = int(params['warehouse']) if params.get('warehouse') else None
+        except ValueError:
+            return Response({'error': 'Invalid limit or warehouse'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'date_from': date_from,
+            'date_to': date_to,
+            'results': top_consumed(date_from, date_to, warehouse_id, limit),
+        })
+
+    @action(detail=False, methods=['get'], url_path='burn-rate')
+    def burn_rate(self, request):
+        """Orta gündəlik sərfiyyat və qalığın neçə günə çatacağı (?days=30&warehouse=&limit=)."""
+        params = request.query_params
+        try:
+            days = int(params.get('days', 30))
+            warehouse_id = int(params['warehouse']) if params.get('warehouse') else None
+            limit = int(params['limit']) if params.get('limit') else None
+        except ValueError:
+            return Response({'error': 'Invalid days, warehouse or limit'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= days <= 365:
+            return Response({'error': 'days must be between 1 and 365'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'days': days,
+            'results': burn_rate(days, warehouse_id, limit),
+        })
 
     @action(detail=False, methods=['post'], url_path='adjust')
     def adjust_stock(self, request):
@@ -41,136 +141,104 @@ class StockMovementViewSet(viewsets.ModelViewSet):
         if not all([warehouse_id, product_id, qty, m_type]):
             return Response({'error': 'Missing required fields'}, status=status.HTTP_400_BAD_REQUEST)
 
-        with transaction.atomic():
-            warehouse = Warehouse.objects.get(pk=warehouse_id)
-            product = Product.objects.get(pk=product_id)
-            
-            inventory, created = WarehouseInventory.objects.get_or_create(
-                warehouse=warehouse, product=product
-            )
-            
-            qty_old = inventory.quantity
-            qty_new = qty_old
-
-            if m_type == StockMovement.Type.IN:
-                qty_new += qty
-            elif m_type == StockMovement.Type.OUT:
-                qty_new -= qty
-            elif m_type == StockMovement.Type.ADJUST:
-                qty_new += qty
-            elif m_type == StockMovement.Type.RETURN:
-                 qty_new += qty
-            
-            inventory.quantity = qty_new
-            inventory.save()
-
-            StockMovement.objects.create(
-                warehouse=warehouse,
-                product=product,
-                movement_type=m_type,
-                reason=data.get('reason', ''),
-                quantity_old=qty_old,
-                quantity_new=qty_new,
-                created_by=request.user,
-                reference_no=data.get('reference_no', ''),
-                returned_by=data.get('returned_by', '') if m_type == StockMovement.Type.RETURN else None
-            )
-            
-            if m_type == StockMovement.Type.TRANSFER:
-                to_wh_id = data.get('to_warehouse_id')
-                if not to_wh_id:
-                     # This check should probably return a response or raise a DRF ValidationError properly
-                     return Response({'error': "Target warehouse required for transfer"}, status=status.HTTP_400_BAD_REQUEST)
-                
-                to_warehouse = Warehouse.objects.get(pk=to_wh_id)
-                to_inventory, _ = WarehouseInventory.objects.get_or_create(
-                    warehouse=to_warehouse, product=product
-                )
-                
-                # Correct Transfer Logic:
-                # 1. Source (Warehouse) -> Already decreased by base logic (treated as OUT essentially or delta applied)
-                # wait, in my original code:
-                # if m_type == TRANSFER:
-                #   inventory.quantity = qty_old - qty 
-                #   I overwrote the adjustment.
-                
-                # Let's fix logical consistency from previous file.
-                # In previous file, I did generic mix, then overwrote for Transfer.
-                # Here I should just do it cleanly.
-
-                # Let's clean up logic:
-                # Revert the generic change for Transfer to avoid double accounting or confusion, 
-                # OR handle it specifically.
-                
-                # Actually, let's keep it simple. Only apply generic logic if NOT transfer, or handle transfer completely separately.
-                # But to preserve existing behavior:
-                
-                # Reset source inventory change from generic block if it was wrong?
-                # Generic block: 
-                # elif m_type == StockMovement.Type.ADJUST: ...
-                # Wait, TRANSFER wasn't in the generic block in previous code?
-                # Ah, I missed 'TRANSFER' case in logic block above in previous file?
-                # No, I didn't have TRANSFER in the if/elif chain for `qty_new` calculation in the view I just pasted.
-                # Wait, looking at `views.py` I read earlier:
-                # if m_type == IN ... elif OUT ... elif ADJUST ... elif RETURN
-                # It didn't handle TRANSFER in the generic `qty_new` calculation!
-                # So `qty_new` remained `qty_old` for transfer in that block.
-                # Then `inventory.quantity = qty_new` saved it as unchanged.
-                # THEN in `if m_type == TRANSFER`: it did `inventory.quantity = qty_old - qty` and saved.
-                
-                # So, I should explicitly handle TRANSFER in the if/elif chain or leave it as is.
-                # I will create a cleaner version here.
-                pass
-
-            # RETHINKING LOGIC FOR CLEANER IMPLEMENTATION IN REFACTOR
-            # If Transfer:
-            # Source: -qty
-            # Dest: +qty
-            
-            if m_type == StockMovement.Type.TRANSFER:
-                 # Source
-                 inventory.quantity = qty_old - qty
-                 inventory.save()
-
-                 to_wh_id = data.get('to_warehouse_id')
-                 if not to_wh_id:
-                      raise ValueError("Target warehouse required")
-
-                 to_warehouse = Warehouse.objects.get(pk=to_wh_id)
-                 to_inventory, _ = WarehouseInventory.objects.get_or_create(warehouse=to_warehouse, product=product)
-                 
-                 to_qty_old = to_inventory.quantity
-                 to_inventory.quantity = to_qty_old + qty
-                 to_inventory.save()
-                 
-                 # Create 2 records? One OUT from source, One IN to dest. Or 1 Record with from/to?
-                 # My model has from/to fields.
-                 # Usually 2 records are better for localized history in each warehouse tab.
-                 # Creating Record 1 (OUT equivalent)
-                 StockMovement.objects.create(
-                    warehouse=warehouse,
-                    to_warehouse=to_warehouse,
-                    product=product,
-                    movement_type=StockMovement.Type.TRANSFER,
-                    reason=f"Transfer OUT to {to_warehouse.name}",
-                    quantity_old=qty_old,
-                    quantity_new=inventory.quantity,
-                    created_by=request.user,
-                    reference_no=data.get('reference_no', '')
-                 )
-                 # Record 2 (IN equivalent)
-                 StockMovement.objects.create(
-                    warehouse=to_warehouse,
-                    from_warehouse=warehouse,
-                    product=product,
-                    movement_type=StockMovement.Type.TRANSFER,
-                    reason=f"Transfer IN from {warehouse.name}",
-                    quantity_old=to_qty_old,
-                    quantity_new=to_inventory.quantity,
-                    created_by=request.user,
-                    reference_no=data.get('reference_no', '')
-                 )
-                 
-                 return Response({'status': 'Transfer successful'})
-
-        return Response({'status': 'Stock adjusted', 'new_quantity': qty_new})
+        if m_type not in StockMovement.Type.values:
+            return Response({'error': 'Invalid movement type'}, status=status.HTTP_400_BAD_REQUEST)
+
+        to_wh_id = data.get('to_warehouse_id')
+        if m_type == StockMovement.Type.TRANSFER and not to_wh_id:
+            return Response({'error': "Target warehouse required for transfer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        warehouses = Warehouse.objects.in_bulk([warehouse_id, to_wh_id] if to_wh_id else [warehouse_id])
+        warehouse = warehouses.get(int(warehouse_id))
+        if not warehouse or not Product.objects.filter(pk=product_id).exists():
+            return Response({'error': 'Warehouse or product not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        reference_no = data.get('reference_no', '')
+
+        # Qalıq atomik UPDATE ... RETURNING ilə dəyişir, paralel sorğular bir-birini üstələmir
+        if m_type == StockMovement.Type.TRANSFER:
+            to_warehouse = warehouses.get(int(to_wh_id))
+            if not to_warehouse:
+                return Response({'error': 'Warehouse or product not found'}, status=status.HTTP_404_NOT_FOUND)
+
+            # Mənbədən çıxış və hədəfə giriş - hər anbarın öz tarixçəsi üçün 2 qeyd
+            legs = [
+                (warehouse.id, -qty, {'to_warehouse': to_warehouse, 'reason': f"Transfer OUT to {to_warehouse.name}"}),
+                (to_warehouse.id, qty, {'from_warehouse': warehouse, 'reason': f"Transfer IN from {warehouse.name}"}),
+            ]
+            # Qarşılıqlı transferlərdə deadlock olmasın deyə sətirlər sabit sıra ilə kilidlənir
+            legs.sort(key=lambda leg: leg[0])
+
+            with transaction.atomic():
+                for leg_warehouse_id, delta, extra in legs:
+                    move_stock(
+                        leg_warehouse_id, product_id, delta,
+                        movement_type=StockMovement.Type.TRANSFER,
+                        created_by=request.user,
+                        reference_no=reference_no,
+                        **extra
+                    )
+
+            return Response({'status': 'Transfer successful'})
+
+        movement = move_stock(
+            warehouse.id, product_id, MOVEMENT_SIGN[m_type] * qty,
+            movement_type=m_type,
+            reason=data.get('reason', ''),
+            created_by=request.user,
+            reference_no=reference_no,
+            returned_by=data.get('returned_by', '') if m_type == StockMovement.Type.RETURN else None
+        )
+
+        return Response({'status': 'Stock adjusted', 'new_quantity': movement.quantity_new})
+
+    @action(detail=False, methods=['post'], url_path='bulk-adjust')
+    def bulk_adjust(self, request):
+        """Çoxsətirli sənədi (mal qəbulu, transfer və s.) bir sorğu ilə tətbiq edir."""
+        serializer = StockDocumentSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        movements = apply_stock_document(serializer.validated_data, request.user)
+
+        return Response({
+            'status': 'Document applied',
+            'reference_no': serializer.validated_data.get('reference_no', ''),
+            'movements': [
+                {
+                    'warehouse': m.warehouse_id,
+                    'product': m.product_id,
+                    'quantity_old': m.quantity_old,
+                    'quantity_new': m.quantity_new,
+                }
+                for m in movements
+            ]
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Hərəkət tarixçəsinin axınla CSV/XLSX ixracı (?file_format=csv|xlsx, siyahı filtrləri tətbiq olunur).
+        Adlar JOIN ilə bir sorğuda gəlir, sətirlər keyset hissələri ilə oxunur.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).values_list(
+            'pk', 'created_at', 'movement_type', 'warehouse__name', 'from_warehouse__name', 'to_warehouse__name',
+            'product__name', 'product__unit', 'quantity_old', 'quantity_new', 'reason', 'reference_no',
+            'returned_by', 'created_by__first_name', 'created_by__last_name'
+        )
+        header = [
+            'ID', 'Tarix', 'Növ', 'Anbar', 'Haradan', 'Haraya', 'Məhsul', 'Vahid',
+            'Köhnə miqdar', 'Yeni miqdar', 'Səbəb', 'Sənəd №', 'Qaytaran', 'İcraçı'
+        ]
+        type_labels = dict(StockMovement.Type.choices)
+
+        def rows():
+            for chunk in iter_keyset(queryset):
+                for row in chunk:
+                    first_name, last_name = row[-2:]
+                    yield [
+                        *row[:2], type_labels.get(row[2], row[2]), *row[3:-2],
+                        f"{first_name or ''} {last_name or ''}".strip()
+                    ]
+
+        return export_response(header, rows(), 'stock_movements', request.query_params.get('file_format', 'csv'))